@@ -0,0 +1 @@
+# Benchmarks / stress tools (python -m bench.<name>)
@@ -0,0 +1,289 @@
+"""
+대시보드 폴링 부하 벤치마크
+src/hooks/useApi.js의 폴링 주기를 그대로 흉내 내는 N개 클라이언트로 Backend를 호출하고
+엔드포인트별 p50/p99 지연, 처리량, 서버 CPU 시간, RSS를 측정
+(SSH/ping은 bench.stubs, ROS는 stand-in 모드 사용 -> 실제 장비 없이 재현 가능)
+
+서버는 별도 프로세스로 띄워서 CPU/RSS에 클라이언트 부하가 섞이지 않게 함
+
+실행 (backend 디렉토리에서):
+    python -m bench.dashboard_load --clients 8 --duration 30 --save bench_baseline.json
+    python -m bench.dashboard_load --clients 8 --duration 30 --baseline bench_baseline.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import psutil
+
+# (경로, 주기 ms) - useApi.js의 useAllPCStatus / useSensorsStatus / useRosTopics / useRosSummary 기본값
+POLLS = [
+    ("/api/pc/all", 2000),
+    ("/api/sensors/status", 3000),
+    ("/api/ros/topics", 2000),
+    ("/api/ros/summary", 1000),
+]
+
+# 기준선 대비 이 값 이하 차이는 노이즈로 보고 무시
+_ABS_FLOOR = {"p50_ms": 2.0, "p99_ms": 5.0, "cpu_ms_per_request": 0.2, "rss_peak_mb": 10.0}
+
+
+# ============================================
+# 서버 프로세스 (--serve)
+# ============================================
+
+def serve(port: int, ssh_latency_ms: float, ping_latency_ms: float):
+    """stub을 설치하고 lifespan 포함 전체 앱 실행"""
+    import uvicorn
+    from bench import stubs
+
+    stubs.install(ssh_latency_ms=ssh_latency_ms, ping_latency_ms=ping_latency_ms)
+    from main import app
+
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _start_server(args) -> subprocess.Popen:
+    port = args.port
+    env = dict(os.environ, ROS_STANDIN="1", PYTHONUNBUFFERED="1")
+    cmd = [
+        sys.executable, "-m", "bench.dashboard_load", "--serve", "--port", str(port),
+        "--ssh-latency", str(args.ssh_latency), "--ping-latency", str(args.ping_latency),
+    ]
+    output = None if args.verbose else subprocess.DEVNULL
+    proc = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            env=env, stdout=output, stderr=output)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("server did not start within 30s")
+
+
+def _stop_server(proc: subprocess.Popen):
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+# ============================================
+# 클라이언트
+# ============================================
+
+def _poller(port: int, path: str, interval: float, measure_from: float, stop: threading.Event, result: dict):
+    """setInterval(fetch, interval) 하나 (응답이 주기보다 늦으면 late로 기록)"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    next_time = time.monotonic() + random.uniform(0, interval)
+    while not stop.wait(max(0.0, next_time - time.monotonic())):
+        start = time.monotonic()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            ok = resp.status == 200
+        except Exception:
+            ok = False
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        elapsed = time.monotonic() - start
+
+        if start >= measure_from:
+            if ok:
+                result["latencies"].append(elapsed)
+            else:
+                result["errors"] += 1
+
+        next_time += interval
+        if next_time < time.monotonic():
+            if start >= measure_from:
+                result["late"] += 1
+            next_time = time.monotonic()
+    conn.close()
+
+
+def _rss_sampler(proc: psutil.Process, stop: threading.Event, samples: list):
+    while not stop.wait(0.25):
+        try:
+            samples.append(proc.memory_info().rss)
+        except psutil.Error:
+            break
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(args) -> dict:
+    server = _start_server(args)
+    server_proc = psutil.Process(server.pid)
+    try:
+        stop = threading.Event()
+        measure_from = time.monotonic() + args.warmup
+        results = {path: {"latencies": [], "errors": 0, "late": 0} for path, _ in POLLS}
+        threads = [
+            threading.Thread(
+                target=_poller,
+                args=(args.port, path, interval_ms / 1000.0 / args.speedup, measure_from, stop, results[path]),
+                daemon=True,
+            )
+            for _ in range(args.clients)
+            for path, interval_ms in POLLS
+        ]
+        rss_samples = []
+        sampler = threading.Thread(target=_rss_sampler, args=(server_proc, stop, rss_samples), daemon=True)
+
+        for t in threads:
+            t.start()
+        sampler.start()
+
+        time.sleep(args.warmup)
+        cpu_start = server_proc.cpu_times()
+        rss_samples.clear()
+        time.sleep(args.duration)
+        cpu_end = server_proc.cpu_times()
+        rss_end = server_proc.memory_info().rss
+
+        stop.set()
+        for t in threads + [sampler]:
+            t.join(timeout=35)
+    finally:
+        _stop_server(server)
+
+    cpu_sec = (cpu_end.user - cpu_start.user) + (cpu_end.system - cpu_start.system)
+    total_requests = sum(len(r["latencies"]) for r in results.values())
+    return {
+        "config": {
+            "clients": args.clients, "duration": args.duration, "speedup": args.speedup,
+            "ssh_latency_ms": args.ssh_latency, "ping_latency_ms": args.ping_latency,
+        },
+        "endpoints": {
+            path: {
+                "requests": len(r["latencies"]),
+                "errors": r["errors"],
+                "late": r["late"],
+                "rps": round(len(r["latencies"]) / args.duration, 2),
+                "p50_ms": round(_percentile(r["latencies"], 50) * 1000, 2),
+                "p99_ms": round(_percentile(r["latencies"], 99) * 1000, 2),
+            }
+            for path, r in results.items()
+        },
+        "rps": round(total_requests / args.duration, 2),
+        "cpu_sec": round(cpu_sec, 3),
+        "cpu_ms_per_request": round(cpu_sec * 1000 / total_requests, 3) if total_requests else None,
+        "rss_peak_mb": round(max(rss_samples or [rss_end]) / 2**20, 1),
+        "rss_end_mb": round(rss_end / 2**20, 1),
+    }
+
+
+# ============================================
+# 보고 / 기준선 비교
+# ============================================
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """기준선보다 (1 + tolerance)배 넘게 나빠진 항목 목록"""
+    regressions = []
+
+    def check(name: str, key: str, value, base_value):
+        if value is None or not base_value:
+            return
+        if value > base_value * (1 + tolerance) and value - base_value > _ABS_FLOOR[key]:
+            regressions.append(f"{name} {key}: {base_value} -> {value} (+{(value / base_value - 1) * 100:.0f}%)")
+
+    for path, stats in report["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(path)
+        if base:
+            for key in ("p50_ms", "p99_ms"):
+                check(path, key, stats[key], base.get(key))
+    for key in ("cpu_ms_per_request", "rss_peak_mb"):
+        check("server", key, report.get(key), baseline.get(key))
+    return regressions
+
+
+def print_report(report: dict):
+    cfg = report["config"]
+    print(f"clients={cfg['clients']} duration={cfg['duration']:g}s speedup={cfg['speedup']:g}x "
+          f"ssh={cfg['ssh_latency_ms']:g}ms ping={cfg['ping_latency_ms']:g}ms")
+    print(f"{'endpoint':<24}{'req':>7}{'rps':>8}{'p50 ms':>10}{'p99 ms':>10}{'late':>6}{'err':>6}")
+    for path, s in report["endpoints"].items():
+        print(f"{path:<24}{s['requests']:>7}{s['rps']:>8.1f}{s['p50_ms']:>10.2f}{s['p99_ms']:>10.2f}"
+              f"{s['late']:>6}{s['errors']:>6}")
+    print(f"throughput: {report['rps']:.1f} req/s")
+    print(f"server cpu: {report['cpu_sec']:.2f}s ({report['cpu_ms_per_request']} ms/request)")
+    print(f"server rss: peak={report['rss_peak_mb']}MB end={report['rss_end_mb']}MB")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard polling load benchmark")
+    parser.add_argument("--clients", type=int, default=4, help="동시 대시보드 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=5.0, help="측정 전 워밍업 (초)")
+    parser.add_argument("--speedup", type=float, default=1.0, help="폴링 주기를 이 배수만큼 단축")
+    parser.add_argument("--ssh-latency", type=float, default=30.0, help="가짜 SSH 명령 지연 (ms)")
+    parser.add_argument("--ping-latency", type=float, default=1.0, help="가짜 ping 지연 (ms)")
+    parser.add_argument("--save", help="결과를 JSON으로 저장 (기준선)")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 악화 비율")
+    parser.add_argument("--verbose", action="store_true", help="서버 로그 출력")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.ssh_latency, args.ping_latency)
+        return
+
+    args.port = args.port or _free_port()
+    report = run(args)
+    print_report(report)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"saved: {args.save}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print(f"warning: baseline config differs: {baseline.get('config')}")
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if not regressions:
+            print(f"no regressions vs {args.baseline} (tolerance {args.tolerance * 100:.0f}%)")
+
+    errors = sum(s["errors"] for s in report["endpoints"].values())
+    sys.exit(1 if errors or regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
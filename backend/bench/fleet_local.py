@@ -0,0 +1,132 @@
+"""
+로컬 fleet 테스트
+stand-in 로봇 Backend N개 (bench.dashboard_load --serve와 같은 stub) + 게이트웨이 하나를 띄우고
+게이트웨이의 /api/fleet에서 로봇별 연결, 데이터 나이, 수신 대역폭이 예산 안인지 확인
+
+실행 (backend 디렉토리에서):
+    python -m bench.fleet_local --robots 3 --duration 20 --budget 64
+    python -m bench.fleet_local --robots 2 --budget 8 --kill-after 10   # 로봇 하나를 중간에 끄고 stale 확인
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench.dashboard_load import _free_port, _stop_server
+
+_BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _spawn(cmd, env, port: int, verbose: bool) -> subprocess.Popen:
+    output = None if verbose else subprocess.DEVNULL
+    proc = subprocess.Popen(cmd, cwd=_BACKEND_DIR, env=env, stdout=output, stderr=output)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server on :{port} exited with code {proc.returncode}")
+        try:
+            _get(port, "/api/health")
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"server on :{port} did not start within 30s")
+
+
+def _get(port: int, path: str) -> dict:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    try:
+        conn.request("GET", path)
+        return json.loads(conn.getresponse().read())
+    finally:
+        conn.close()
+
+
+def run(args) -> int:
+    robot_ports = [_free_port() for _ in range(args.robots)]
+    gateway_port = _free_port()
+    procs = []
+    try:
+        for port in robot_ports:
+            env = dict(os.environ, ROS_STANDIN="1", PYTHONUNBUFFERED="1")
+            procs.append(_spawn(
+                [sys.executable, "-m", "bench.dashboard_load", "--serve", "--port", str(port),
+                 "--ssh-latency", str(args.ssh_latency)],
+                env, port, args.verbose,
+            ))
+
+        robots = ",".join(f"r{i + 1}=http://127.0.0.1:{port}@{args.budget}" for i, port in enumerate(robot_ports))
+        env = dict(os.environ, GATEWAY_MODE="1", GATEWAY_ROBOTS=robots,
+                   FLEET_INTERVAL_MS=str(args.interval_ms), PYTHONUNBUFFERED="1")
+        gateway = _spawn(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(gateway_port),
+             "--log-level", "warning"],
+            env, gateway_port, args.verbose,
+        )
+        procs.append(gateway)
+
+        start = time.monotonic()
+        killed = None
+        while time.monotonic() - start < args.duration:
+            time.sleep(1.0)
+            if args.kill_after and killed is None and time.monotonic() - start >= args.kill_after:
+                killed = "r1"
+                _stop_server(procs[0])
+                print("-- r1 stopped --")
+            status = _get(gateway_port, "/api/fleet/status")
+            line = " ".join(
+                f"{r['id']}:{'up' if not r['stale'] else 'STALE'} age={r['age_sec']}s {r['rx']['kbps']}kbps"
+                for r in status["robots"]
+            )
+            print(f"[{time.monotonic() - start:5.1f}s] online={status['online']}/{status['total']} {line}")
+
+        fleet = _get(gateway_port, "/api/fleet")
+        failures = []
+        for robot_id, robot in fleet["robots"].items():
+            rx = robot["rx"]
+            sections = sorted(robot["sections"])
+            print(f"{robot_id}: sections={sections} messages={rx['total_messages']} bytes={rx['total_bytes']} "
+                  f"avg={rx['total_bytes'] * 8 / 1000 / args.duration:.2f}kbps budget={robot['budget_kbps']}kbps")
+            if robot_id == killed:
+                if not robot["stale"] and robot["connected"]:
+                    failures.append(f"{robot_id}: still connected after stop")
+                continue
+            if robot["stale"]:
+                failures.append(f"{robot_id}: stale")
+            if not sections:
+                failures.append(f"{robot_id}: no sections received")
+            # 첫 snapshot burst(예산 2초 분량)를 빼고 평균이 예산을 넘으면 실패
+            allowed = args.budget * 1000 / 8 * (args.duration + 2)
+            if rx["total_bytes"] > allowed:
+                failures.append(f"{robot_id}: {rx['total_bytes']} bytes > budget {allowed:.0f}")
+
+        for line in failures:
+            print(f"FAIL {line}")
+        if not failures:
+            print("ok")
+        return 1 if failures else 0
+    finally:
+        for proc in reversed(procs):
+            if proc.poll() is None:
+                _stop_server(proc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local multi-robot gateway test")
+    parser.add_argument("--robots", type=int, default=3, help="stand-in 로봇 Backend 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="측정 시간 (초)")
+    parser.add_argument("--budget", type=float, default=64.0, help="로봇별 feed 예산 (kbps)")
+    parser.add_argument("--interval-ms", type=int, default=1000, help="feed 갱신 주기")
+    parser.add_argument("--ssh-latency", type=float, default=30.0, help="가짜 SSH 명령 지연 (ms)")
+    parser.add_argument("--kill-after", type=float, default=0.0, help="이 시간 뒤 r1 종료 (0이면 안 함)")
+    parser.add_argument("--verbose", action="store_true", help="서버 로그 출력")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+ROS 토픽 읽기 경로 스트레스 테스트
+고주기 가상 publisher가 TopicStore에 계속 발행하는 동안
+여러 HTTP 클라이언트가 /api/ros/topics, /api/ros/summary를 동시에 호출
+
+실행 (backend 디렉토리에서):
+    python -m bench.ros_read_stress --readers 32 --publish-hz 500 --duration 10
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn
+
+from main import app
+from config import config
+from services.ros_subscriber import ros_service
+
+
+def _synthetic_record(topic: str, msg_type: str, seq: int) -> dict:
+    """토픽별 실제 메시지와 비슷한 모양의 레코드"""
+    if topic == "/joint_states":
+        names = [f"joint_{i}" for i in range(30)]
+        data = {"name": names, "position": [seq * 0.001] * 30, "velocity": [0.0] * 30, "effort": [0.0] * 30}
+    elif topic == "/battery_state":
+        data = {"percentage": 0.8, "voltage": 24.1}
+    elif topic == "/diagnostics":
+        data = {"status": [{"name": f"comp_{i}", "level": i % 3, "message": "ok"} for i in range(50)]}
+    else:
+        data = {"values": list(range(20))}
+    data["_seq"] = seq
+    return {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "data": data, "msg_type": msg_type}
+
+
+def _publisher(topic: str, msg_type: str, hz: float, stop: threading.Event, counter: list):
+    interval = 1.0 / hz
+    seq = 0
+    next_time = time.perf_counter()
+    while not stop.is_set():
+        seq += 1
+        ros_service.store.publish(topic, _synthetic_record(topic, msg_type, seq))
+        counter[0] += 1
+        next_time += interval
+        delay = next_time - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+
+def _reader(port: int, paths: list, stop: threading.Event, result: dict):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    last_seq = {}
+    i = 0
+    while not stop.is_set():
+        path = paths[i % len(paths)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            body = resp.read()
+            elapsed = time.perf_counter() - start
+            if resp.status != 200:
+                result["errors"] += 1
+                continue
+            payload = json.loads(body)
+        except Exception:
+            result["errors"] += 1
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            continue
+
+        result["latencies"].append(elapsed)
+
+        # 같은 클라이언트가 보는 토픽 seq는 절대 뒤로 가면 안 됨
+        if path.endswith("/topics"):
+            for topic, item in payload.items():
+                seq = (item.get("data") or {}).get("_seq")
+                if seq is None:
+                    continue
+                if seq < last_seq.get(topic, 0):
+                    result["regressions"] += 1
+                last_seq[topic] = seq
+    conn.close()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ROS topic read path stress test")
+    parser.add_argument("--readers", type=int, default=32, help="동시 HTTP 클라이언트 수")
+    parser.add_argument("--publish-hz", type=float, default=500.0, help="토픽별 가상 발행 주기")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 (초)")
+    parser.add_argument("--paths", default="/api/ros/topics,/api/ros/summary")
+    args = parser.parse_args()
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    stop = threading.Event()
+    counters = [[0] for _ in config.ros_topics]
+    publishers = [
+        threading.Thread(target=_publisher, args=(t.topic, t.msg_type, args.publish_hz, stop, counters[i]), daemon=True)
+        for i, t in enumerate(config.ros_topics)
+    ]
+    paths = args.paths.split(",")
+    results = [{"latencies": [], "errors": 0, "regressions": 0} for _ in range(args.readers)]
+    readers = [
+        threading.Thread(target=_reader, args=(port, paths, stop, results[i]), daemon=True)
+        for i in range(args.readers)
+    ]
+
+    for t in publishers + readers:
+        t.start()
+    time.sleep(args.duration)
+    stop.set()
+    for t in publishers + readers:
+        t.join(timeout=5)
+    server.should_exit = True
+    server_thread.join(timeout=5)
+
+    published = sum(c[0] for c in counters)
+    latencies = [lat for r in results for lat in r["latencies"]]
+    errors = sum(r["errors"] for r in results)
+    regressions = sum(r["regressions"] for r in results)
+
+    print(f"readers={args.readers} publishers={len(publishers)}x{args.publish_hz:g}Hz duration={args.duration:g}s")
+    print(f"published: {published} ({published / args.duration:.0f}/s)")
+    print(f"requests:  {len(latencies)} ({len(latencies) / args.duration:.0f}/s), errors={errors}")
+    print(f"latency:   p50={_percentile(latencies, 50) * 1000:.2f}ms p99={_percentile(latencies, 99) * 1000:.2f}ms")
+    print(f"seq regressions: {regressions}")
+
+    sys.exit(1 if errors or regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
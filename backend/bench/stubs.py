@@ -0,0 +1,262 @@
+"""
+벤치마크용 외부 의존성 대체 (SSH, ping)
+실제 서비스 코드 경로는 그대로 두고 네트워크 호출 지점만 고정 지연 + 고정 출력으로 교체
+ROS는 stand-in 모드(services.ros_standin)를 사용
+"""
+import json
+import math
+import re
+import struct
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+# PC2에서 나올 법한 명령 출력
+_RS_ENUMERATE = """Device Name                   Serial Number       Firmware Version
+Intel RealSense D435          123456789012        05.13.00.50
+Intel RealSense D455          234567890123        05.13.00.50
+
+Device info:
+    Name                          : \tIntel RealSense D435
+    Serial Number                 : \t123456789012
+Device info:
+    Name                          : \tIntel RealSense D455
+    Serial Number                 : \t234567890123
+"""
+
+_APLAY = """**** List of PLAYBACK Hardware Devices ****
+card 0: PCH [HDA Intel PCH], device 0: ALC897 Analog [ALC897 Analog]
+  Subdevices: 1/1
+card 2: Device [USB Audio Device], device 0: USB Audio [USB Audio]
+  Subdevices: 1/1
+"""
+
+_ARECORD = """**** List of CAPTURE Hardware Devices ****
+card 2: Device [USB Audio Device], device 0: USB Audio [USB Audio]
+  Subdevices: 1/1
+"""
+
+
+# udevadm info --query=property 블록 (RealSense 2대, USB 카메라 1대, USB 오디오 재생/녹음)
+_UDEV_SNAPSHOT = """DEVPATH=/devices/pci0000:00/0000:00:14.0/usb2/2-1
+SUBSYSTEM=usb
+DEVTYPE=usb_device
+DEVNAME=/dev/bus/usb/002/002
+ID_VENDOR_ID=8086
+ID_MODEL_ID=0b07
+ID_MODEL=Intel_R__RealSense_TM__Depth_Camera_435
+ID_SERIAL_SHORT=123456789012
+
+DEVPATH=/devices/pci0000:00/0000:00:14.0/usb2/2-2
+SUBSYSTEM=usb
+DEVTYPE=usb_device
+DEVNAME=/dev/bus/usb/002/003
+ID_VENDOR_ID=8086
+ID_MODEL_ID=0b5c
+ID_SERIAL_SHORT=234567890123
+
+DEVPATH=/devices/pci0000:00/0000:00:14.0/usb1/1-3/1-3:1.0/video4linux/video4
+SUBSYSTEM=video4linux
+DEVNAME=/dev/video4
+ID_VENDOR_ID=046d
+
+DEVPATH=/devices/pci0000:00/0000:00:14.0/usb1/1-3/1-3:1.0/video4linux/video5
+SUBSYSTEM=video4linux
+DEVNAME=/dev/video5
+ID_VENDOR_ID=046d
+
+DEVPATH=/devices/pci0000:00/0000:00:14.0/usb1/1-4/1-4:1.0/sound/card2/pcmC2D0p
+SUBSYSTEM=sound
+DEVNAME=/dev/snd/pcmC2D0p
+
+DEVPATH=/devices/pci0000:00/0000:00:14.0/usb1/1-4/1-4:1.0/sound/card2/pcmC2D0c
+SUBSYSTEM=sound
+DEVNAME=/dev/snd/pcmC2D0c
+
+"""
+
+
+def _remote_output(command: str) -> str:
+    """명령 문자열 -> 가짜 stdout"""
+    if "pyrealsense2" in command:
+        serial, frames = command.split()[-2:]
+        result = {"serial": serial, "connected": serial in _RS_ENUMERATE}
+        if result["connected"]:
+            result.update(device_name="Intel RealSense D435", firmware="05.13.00.50", usb_type="3.2", port="/dev/video0")
+            if frames == "1":
+                time.sleep(0.5)
+                result.update(streams={"depth": True, "color": True}, frames=12)
+        return json.dumps(result)
+    if "python3 -c" in command:
+        return json.dumps({
+            "cpu_percent": 23.5,
+            "memory_percent": 41.2,
+            "memory_used_gb": 12.9,
+            "memory_total_gb": 31.3,
+            "gpu_percent": 12.0,
+            "power_watts": 18.1,
+            "power_avg_watts": 17.6,
+            "temperature": 48.5,
+            "pc_time": datetime.now().isoformat(),
+        })
+    if command.startswith("rs-enumerate-devices -s"):
+        return _RS_ENUMERATE.split("\n\n")[0]
+    if command.startswith("rs-enumerate-devices"):
+        return _RS_ENUMERATE
+    if command.startswith("ls -1 /dev/video"):
+        return "\n".join(f"/dev/video{i}" for i in range(6))
+    if command.startswith("for d in /sys/class"):
+        return _UDEV_SNAPSHOT
+    if command.startswith("udevadm info"):
+        return "E: ID_VENDOR_ID=8086" if command.split("--name=/dev/video")[-1][:1] in "0123" else "E: ID_VENDOR_ID=046d"
+    if command.startswith("aplay -l"):
+        return _APLAY
+    if command.startswith("arecord -l"):
+        return _ARECORD
+    if " scontrols" in command:
+        return "Simple mixer control 'Master',0\nSimple mixer control 'PCM',0\nSimple mixer control 'Capture',0"
+    if " sget " in command:
+        chunk = "Simple mixer control\n  Front Left: Playback 40 [63%] [-12.00dB] [on]"
+        return " __NEXT__ ".join([chunk] * (command.count(" sget ")))
+    return ""
+
+
+class _Channel:
+    def __init__(self, data: str):
+        self._data = data.encode()
+
+    def read(self) -> bytes:
+        return self._data
+
+
+class _SessionChannel:
+    """
+    장시간 유지되는 세션 채널
+    - udevadm monitor: close 또는 emit 전까지 이벤트 없음
+    - amixer -s: sendall로 들어온 줄을 received에 기록
+    - arecord -t raw: 실시간 속도로 440Hz 사인파 PCM (S16_LE)
+    """
+
+    def __init__(self):
+        self.command = None
+        self.received = []
+        self._lines = []
+        self._cond = threading.Condition()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def exec_command(self, command: str):
+        self.command = command
+        self._pcm_pos = 0
+
+    def settimeout(self, timeout: float):
+        pass
+
+    def recv(self, nbytes: int) -> bytes:
+        if self._closed or "arecord" not in (self.command or ""):
+            return b""
+        rate = int(re.search(r"-r (\d+)", self.command).group(1))
+        channels = int(re.search(r"-c (\d+)", self.command).group(1))
+        time.sleep(0.02)
+        frames = int(rate * 0.02)
+        samples = []
+        for i in range(self._pcm_pos, self._pcm_pos + frames):
+            value = int(0.3 * 32767 * math.sin(2 * math.pi * 440 * i / rate))
+            samples.extend([value] * channels)
+        self._pcm_pos += frames
+        return struct.pack(f"<{len(samples)}h", *samples)
+
+    def sendall(self, data: bytes):
+        self.received.extend(data.decode().splitlines())
+
+    def exit_status_ready(self) -> bool:
+        return self._closed
+
+    def recv_stderr_ready(self) -> bool:
+        return False
+
+    def makefile(self, mode: str = "r"):
+        return self
+
+    def __iter__(self):
+        while True:
+            with self._cond:
+                while not self._lines and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                line = self._lines.pop(0)
+            yield line
+
+    def emit(self, line: str):
+        with self._cond:
+            self._lines.append(line)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+
+class FakeSSHClient:
+    """paramiko.SSHClient 대체 (exec_command마다 latency만큼 대기)"""
+
+    def __init__(self, latency_sec: float):
+        self.latency_sec = latency_sec
+        self.commands = 0
+        self.sessions = []
+        self._lock = threading.Lock()
+
+    def exec_command(self, command: str, timeout: float = None):
+        with self._lock:
+            self.commands += 1
+        time.sleep(self.latency_sec)
+        return _Channel(""), _Channel(_remote_output(command)), _Channel("")
+
+    def get_transport(self):
+        return self
+
+    def open_session(self):
+        channel = _SessionChannel()
+        self.sessions.append(channel)
+        return channel
+
+    def is_active(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+
+def install(ssh_latency_ms: float = 30.0, ping_latency_ms: float = 1.0) -> FakeSSHClient:
+    """
+    라우터의 전역 서비스 인스턴스에 SSH/ping 대체 설치
+
+    Returns:
+        설치된 FakeSSHClient (명령 횟수 확인용)
+    """
+    from routers.pc import pc_service
+    from routers.sensors import sensor_service
+    from services import pc_monitor
+
+    ssh = FakeSSHClient(ssh_latency_ms / 1000.0)
+    pc_monitor.HAS_PARAMIKO = True
+    pc_service._get_ssh_client = lambda pc_config: ssh
+    sensor_service._get_ssh_client = lambda: ssh
+
+    real_run = subprocess.run
+
+    def _run(args, *a, **kw):
+        if isinstance(args, (list, tuple)) and args and args[0] == "ping":
+            time.sleep(ping_latency_ms / 1000.0)
+            stdout = f"64 bytes from {args[-1]}: icmp_seq=1 ttl=64 time={ping_latency_ms:.3f} ms\n"
+            return subprocess.CompletedProcess(args, 0, stdout=stdout, stderr="")
+        return real_run(args, *a, **kw)
+
+    subprocess.run = _run
+    return ssh
@@ -2,16 +2,24 @@
 Robot Web UI - FastAPI Backend Server
 로봇 PC에서 실행, WiFi로 브라우저 접속
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
 from config import config
-from routers import robot, pc, sensors, ros
+from routers import robot, pc, sensors, ros, metrics, debug, fleet, bandwidth
 from services.ros_subscriber import ros_service
+from services.image_relay import image_relay
+from services.map_tiles import map_tiles
+from services.tf_buffer import tf_buffer
+from services.diagnostics import diagnostics_aggregator
+from services.sensor_history import sensor_history
+from services.fleet_gateway import fleet_gateway
+from services.metrics import MetricsMiddleware, install_executor
+from services.bandwidth import BandwidthMiddleware, bandwidth_manager
+from services.compression import CompressionMiddleware, PrecompressedStaticFiles, asset_response
 
 
 @asynccontextmanager
@@ -19,11 +27,43 @@ async def lifespan(app: FastAPI):
     """앱 시작/종료 시 실행"""
     print("🚀 Robot Web UI Backend starting...")
     
+    # run_in_executor 대기 시간 계측
+    install_executor(asyncio.get_running_loop())
+    
+    # 브라우저 송신 대역폭 예산
+    bandwidth_manager.configure(config.bandwidth)
+    
+    # 게이트웨이 모드: 로컬 ROS/센서 대신 로봇들의 feed를 구독
+    if config.fleet.gateway_mode:
+        fleet_gateway.start(config.fleet)
+        yield
+        await fleet_gateway.stop()
+        print("👋 Robot Web UI Backend shutting down...")
+        return
+    
     # ROS2 노드 시작
-    ros_service.start(config.ros_topics)
+    ros_service.start(
+        config.ros_topics,
+        num_threads=config.ros_executor_threads,
+        high_rate_hz=config.ros_high_rate_hz,
+        standin_streams=config.ros_standin_streams if config.ros_standin else None,
+    )
+    image_relay.start(config.image_topics)
+    map_tiles.start(config.map)
+    tf_buffer.start(config.tf)
+    diagnostics_aggregator.start(config.diagnostics)
+    
+    # 센서 상태 이력 + PC2 하드웨어 목록 캐시 (udev 이벤트 무효화)
+    sensor_history.configure(config.sensor_history)
+    sensors.sensor_service.start_inventory_monitor(config.sensor_inventory)
+    sensors.probe_scheduler.start(config.sensors, config.sensor_scheduler)
     
     yield
     
+    await sensors.probe_scheduler.stop()
+    sensors.sensor_service.stop_inventory_monitor()
+    sensors.sensor_service.close_audio_sessions()
+    
     # ROS2 노드 종료
     ros_service.stop()
     print("👋 Robot Web UI Backend shutting down...")
@@ -43,31 +83,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Bandwidth-Level", "X-Poll-Interval-Scale"],
 )
 
+# 요청별 지연 시간 기록 (/api/metrics)
+app.add_middleware(MetricsMiddleware)
+
+# 응답 압축 (대역폭 집계보다 안쪽 -> 실제 전송된 압축 바이트로 집계)
+app.add_middleware(CompressionMiddleware, compression_config=config.compression)
+
+# 클라이언트별 송신 바이트 집계 + 대역폭 단계 헤더 (/api/bandwidth)
+app.add_middleware(BandwidthMiddleware)
+
 # API 라우터 등록
 app.include_router(robot.router, prefix="/api/robot", tags=["Robot"])
 app.include_router(pc.router, prefix="/api/pc", tags=["PC Monitor"])
 app.include_router(sensors.router, prefix="/api/sensors", tags=["Sensors"])
 app.include_router(ros.router, prefix="/api/ros", tags=["ROS2"])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"])
+app.include_router(debug.router, prefix="/api/debug", tags=["Debug"])
+app.include_router(fleet.router, prefix="/api/fleet", tags=["Fleet"])
+app.include_router(bandwidth.router, prefix="/api/bandwidth", tags=["Bandwidth"])
 
 
-# 정적 파일 서빙 (빌드된 React 앱)
+# 정적 파일 서빙 (빌드된 React 앱, .br/.gz 사전 압축 파일 + 해시 파일 immutable 캐시)
 BUILD_DIR = os.path.join(os.path.dirname(__file__), "..", "build")
 if os.path.exists(BUILD_DIR):
-    app.mount("/static", StaticFiles(directory=os.path.join(BUILD_DIR, "assets")), name="static")
+    app.mount("/static", PrecompressedStaticFiles(directory=os.path.join(BUILD_DIR, "assets")), name="static")
     
     @app.get("/")
-    async def serve_index():
-        return FileResponse(os.path.join(BUILD_DIR, "index.html"))
+    async def serve_index(request: Request):
+        return asset_response(os.path.join(BUILD_DIR, "index.html"), request.headers)
     
     @app.get("/{path:path}")
-    async def serve_spa(path: str):
+    async def serve_spa(path: str, request: Request):
         """SPA 라우팅 지원"""
         file_path = os.path.join(BUILD_DIR, path)
         if os.path.exists(file_path) and os.path.isfile(file_path):
-            return FileResponse(file_path)
-        return FileResponse(os.path.join(BUILD_DIR, "index.html"))
+            return asset_response(file_path, request.headers)
+        return asset_response(os.path.join(BUILD_DIR, "index.html"), request.headers)
 
 
 @app.get("/api/health")
@@ -75,6 +129,7 @@ async def health_check():
     return {
         "status": "ok",
         "ros_running": ros_service.is_running,
+        "gateway_mode": config.fleet.gateway_mode,
     }
 
 
@@ -85,8 +140,10 @@ async def get_info():
         "name": "Robot Web UI Backend",
         "version": "2.0.0",
         "architecture": {
-            "pc1": "local (this PC)",
-            "pc2": f"remote ({config.pcs['pc2'].ip})",
+            **{
+                pc_id: "local (this PC)" if pc.local else f"remote ({pc.ip})"
+                for pc_id, pc in config.pcs.items()
+            },
             "ros": "rclpy (direct subscription)",
             "frontend": "API only (no rosbridge)",
         }
@@ -0,0 +1,41 @@
+"""
+Bandwidth Router
+브라우저 클라이언트별 실시간 송신량 + 예산 조정
+"""
+from fastapi import APIRouter, Query
+from pydantic import BaseModel
+from typing import Optional
+
+from services.bandwidth import bandwidth_manager
+from config import config
+
+router = APIRouter()
+
+
+class BandwidthBudgetRequest(BaseModel):
+    """예산 변경 요청 (없는 값은 유지)"""
+    enabled: Optional[bool] = None
+    client_budget_kbps: Optional[float] = None
+    global_budget_kbps: Optional[float] = None
+
+
+@router.get("")
+async def get_bandwidth():
+    """전체/클라이언트별 송신 kbps, 예산 대비 %, 현재 단계, 라우트별 바이트"""
+    return bandwidth_manager.get_status()
+
+
+@router.put("/budget")
+async def update_bandwidth_budget(req: BandwidthBudgetRequest):
+    """기본 예산 변경 (바로 적용)"""
+    updates = req.model_dump(exclude_none=True)
+    config.bandwidth = config.bandwidth.model_copy(update=updates)
+    bandwidth_manager.configure(config.bandwidth)
+    return {"success": True, "config": config.bandwidth.model_dump()}
+
+
+@router.put("/clients/{client}/budget")
+async def update_client_budget(client: str, budget_kbps: Optional[float] = Query(None, gt=0)):
+    """클라이언트(IP) 하나의 예산 (budget_kbps가 없으면 기본 예산으로)"""
+    bandwidth_manager.set_client_budget(client, budget_kbps)
+    return {"success": True, "client": client, "budget_kbps": budget_kbps}
@@ -0,0 +1,76 @@
+"""
+Debug Router
+실행 중인 Backend 프로파일링 (재시작 없이 현장에서 CPU 사용 원인 확인)
+"""
+import ipaddress
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+
+from config import config
+from services.profiler import sampling_profiler, to_collapsed, to_summary, MAX_SECONDS, MAX_HZ
+
+router = APIRouter()
+
+
+def _is_loopback(request: Request) -> bool:
+    client = request.client
+    try:
+        return client is not None and ipaddress.ip_address(client.host).is_loopback
+    except ValueError:
+        return False
+
+
+@router.get("/profiler")
+async def get_profiler_state():
+    """프로파일러 엔드포인트 활성화 여부"""
+    return {"enabled": config.profiler_enabled, "running": sampling_profiler.is_running}
+
+
+@router.put("/profiler")
+async def set_profiler_state(enabled: bool, request: Request):
+    """
+    프로파일러 엔드포인트 켜기/끄기 (재시작 없이, 로봇 PC에서 localhost로만)
+    꺼져 있어도 샘플링 스레드는 /profile 요청 중에만 돌기 때문에 비용 없음
+    """
+    if not _is_loopback(request):
+        raise HTTPException(status_code=403, detail="Profiler can only be toggled from localhost")
+    config.profiler_enabled = enabled
+    return {"enabled": config.profiler_enabled}
+
+
+@router.get("/profile")
+async def profile(
+    seconds: float = 10.0,
+    hz: float = 100.0,
+    format: str = "collapsed",
+    idle: bool = False,
+    thread: Optional[str] = None,
+):
+    """
+    모든 스레드 스택을 seconds 동안 샘플링
+
+    - format=collapsed: flamegraph.pl / speedscope에 바로 넣을 수 있는 텍스트
+    - format=json: 상위 스택 + leaf 함수 요약
+    - idle=true: 대기 중인 스레드 샘플도 포함
+    - thread: 스레드 이름 필터 (예: ros-spin, backend-executor)
+    """
+    if not config.profiler_enabled:
+        raise HTTPException(
+            status_code=403,
+            detail="Profiler is disabled (PUT /api/debug/profiler?enabled=true from localhost, or PROFILER_ENABLED=1)",
+        )
+    if seconds <= 0 or seconds > MAX_SECONDS or hz <= 0 or hz > MAX_HZ:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {MAX_SECONDS:g}], hz in (0, {MAX_HZ:g}]")
+    if format not in ("collapsed", "json"):
+        raise HTTPException(status_code=400, detail="format must be 'collapsed' or 'json'")
+
+    try:
+        result = await sampling_profiler.run_async(seconds, hz, include_idle=idle, thread_filter=thread)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    if format == "json":
+        return to_summary(result)
+    return PlainTextResponse(to_collapsed(result))
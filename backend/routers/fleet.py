@@ -0,0 +1,257 @@
+"""
+Fleet Router
+- 로봇 쪽: /ws feed (게이트웨이가 구독, 바뀐 값만 대역폭 예산 안에서 push)
+- 게이트웨이 쪽 (GATEWAY_MODE=1): 여러 로봇 feed를 합친 fleet 상태
+"""
+import asyncio
+import itertools
+import json
+import math
+import time
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from typing import Any, Dict, List, Optional
+
+from routers import pc, ros, sensors
+from services.bandwidth import RateMeter, TokenBucket, kbps_to_bytes
+from services.fleet_gateway import (
+    FEED_SECTIONS, fleet_gateway, encode_message, encode_sections, diff_sections,
+)
+from config import config, FleetRobotConfig
+
+router = APIRouter()
+
+# 섹션별 최소 갱신 간격 (대시보드 폴링 주기와 같게, feed interval_ms보다 짧아지지 않음)
+_SECTION_PERIOD_SEC = {"summary": 0.0, "pcs": 2.0, "sensors": 3.0, "ros": 5.0}
+
+# feed 예산 기본값/하한 (0 이하면 아무것도 보낼 수 없음)
+_DEFAULT_BUDGET_KBPS = 256.0
+_MIN_BUDGET_KBPS = 1.0
+
+# 현재 연결된 feed 구독자 (로봇 쪽)
+_feed_ids = itertools.count(1)
+_feeds: Dict[int, Dict[str, Any]] = {}
+
+
+async def _collect_section(name: str) -> Dict[str, Any]:
+    """섹션 하나의 현재 값 (각 API와 같은 캐시/single-flight 경로, 요청마다 바뀌는 시각 필드 제외)"""
+    if name == "summary":
+        summary = await ros.get_ros_summary()
+        summary.pop("timestamp", None)
+        return summary
+    if name == "pcs":
+        statuses = await pc.get_all_pcs_status()
+        return {pc_id: status.model_dump(exclude={"lan_time"}) for pc_id, status in statuses.items()}
+    if name == "sensors":
+        status = await sensors.get_sensors_status()
+        return status.model_dump(mode="json", exclude={"timestamp"})
+    if name == "ros":
+        return (await ros.get_ros_status()).model_dump()
+    raise ValueError(f"unknown section: {name}")
+
+
+async def _collect_sections(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """섹션 동시 조회 (실패한 섹션은 이전 값 유지)"""
+    results = await asyncio.gather(*(_collect_section(n) for n in names), return_exceptions=True)
+    return {name: result for name, result in zip(names, results) if not isinstance(result, Exception)}
+
+
+def _positive(value: Any) -> Optional[float]:
+    """양의 유한한 숫자면 float, 아니면 None (bool/문자열/NaN 제외)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return value if math.isfinite(value) and value > 0 else None
+
+
+def _clamp_budget(budget_kbps: float) -> float:
+    return min(max(budget_kbps, _MIN_BUDGET_KBPS), config.fleet.feed_max_budget_kbps)
+
+
+def _feed_bucket(budget_kbps: float) -> TokenBucket:
+    """예산의 2초 분량까지 burst 허용 (첫 snapshot이 바로 나가도록)"""
+    rate = kbps_to_bytes(budget_kbps)
+    return TokenBucket(rate, burst=2 * rate)
+
+
+# ============================================
+# 로봇 쪽 feed
+# ============================================
+
+@router.websocket("/ws")
+async def stream_fleet_feed(
+    websocket: WebSocket,
+    interval_ms: int = 1000,
+    budget_kbps: float = _DEFAULT_BUDGET_KBPS,
+    sections: Optional[str] = None,
+):
+    """
+    이 로봇의 상태 feed (summary, pcs, sensors, ros)
+    연결 직후 snapshot, 이후 바뀐 키만 delta, 변경이 없으면 heartbeat
+    budget_kbps를 넘는 전송은 건너뛰고 다음 주기에 최신 값만 보냄
+    클라이언트가 {"budget_kbps": n} / {"interval_ms": n}을 보내면 연결 중에 변경 (양수가 아니면 무시)
+    """
+    await websocket.accept()
+    fleet = config.fleet
+    names = [n for n in (sections.split(",") if sections else FEED_SECTIONS) if n in FEED_SECTIONS]
+    interval = max(interval_ms, fleet.feed_min_interval_ms) / 1000
+    budget_kbps = _clamp_budget(budget_kbps if math.isfinite(budget_kbps) else _DEFAULT_BUDGET_KBPS)
+    bucket = _feed_bucket(budget_kbps)
+    tx = RateMeter()
+
+    feed_id = next(_feed_ids)
+    client = websocket.client
+    info = _feeds[feed_id] = {
+        "client": f"{client.host}:{client.port}" if client else None,
+        "sections": names,
+        "interval_ms": int(interval * 1000),
+        "budget_kbps": budget_kbps,
+        "skipped": 0,
+        "tx": tx,
+        "connected_at": time.time(),
+    }
+
+    sent: Dict[str, Dict[str, str]] = {}
+    current: Dict[str, Dict[str, str]] = {}
+    next_refresh = dict.fromkeys(names, 0.0)
+    seq = 0
+    last_sent = time.monotonic()
+    receiver = asyncio.ensure_future(websocket.receive_text())
+    try:
+        while True:
+            now = time.monotonic()
+            due = [n for n in names if next_refresh[n] <= now]
+            if due:
+                current.update(encode_sections(await _collect_sections(due)))
+                for name in due:
+                    next_refresh[name] = now + max(interval, _SECTION_PERIOD_SEC[name])
+
+            changed, removed = diff_sections(sent, current)
+            message = None
+            if seq == 0:
+                message = {"type": "snapshot", "sections": changed}
+            elif changed or removed:
+                message = {"type": "delta", "set": changed}
+                if removed:
+                    message["del"] = removed
+            elif now - last_sent >= fleet.feed_heartbeat_sec:
+                message = {"type": "heartbeat", "skipped": info["skipped"]}
+
+            wait = interval
+            if message is not None:
+                message.update(seq=seq + 1, t=time.time())
+                text = encode_message(message)
+                if bucket.try_consume(len(text)):
+                    await websocket.send_text(text)
+                    seq += 1
+                    sent = {name: dict(section) for name, section in current.items()}
+                    last_sent = now
+                    tx.add(len(text))
+                else:
+                    # 예산 초과: 이번 변경은 보내지 않고 토큰이 찰 때 다시 diff (그 사이 값은 최신으로 덮어씀)
+                    info["skipped"] += 1
+                    wait = min(interval, max(0.05, bucket.wait_time(len(text))))
+
+            done, _ = await asyncio.wait({receiver}, timeout=wait)
+            if receiver in done:
+                control = receiver.result()
+                receiver = asyncio.ensure_future(websocket.receive_text())
+                try:
+                    control = json.loads(control)
+                except ValueError:
+                    continue
+                if not isinstance(control, dict):
+                    continue
+                new_budget = _positive(control.get("budget_kbps"))
+                if new_budget is not None:
+                    info["budget_kbps"] = _clamp_budget(new_budget)
+                    rate = kbps_to_bytes(info["budget_kbps"])
+                    bucket.set_rate(rate, burst=2 * rate)
+                new_interval = _positive(control.get("interval_ms"))
+                if new_interval is not None:
+                    interval = max(new_interval, fleet.feed_min_interval_ms) / 1000
+                    info["interval_ms"] = int(interval * 1000)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        receiver.cancel()
+        _feeds.pop(feed_id, None)
+
+
+@router.get("/feeds")
+async def get_feed_clients():
+    """이 로봇 feed를 구독 중인 클라이언트와 실제 전송량"""
+    return {
+        "feeds": [
+            {**{k: v for k, v in info.items() if k != "tx"}, "tx": info["tx"].snapshot()}
+            for info in _feeds.values()
+        ],
+    }
+
+
+# ============================================
+# 게이트웨이 (GATEWAY_MODE=1)
+# ============================================
+
+def _require_robot(robot_id: str):
+    if robot_id not in fleet_gateway.robot_ids():
+        raise HTTPException(status_code=404, detail=f"Robot '{robot_id}' not found")
+
+
+@router.get("")
+async def get_fleet(section: Optional[List[str]] = Query(None)):
+    """
+    로봇별 연결 상태 + 마지막으로 받은 섹션 (메모리 캐시, 로봇에 요청하지 않음)
+    section=summary&section=pcs처럼 필요한 섹션만 선택 가능
+    """
+    return fleet_gateway.get_fleet(section)
+
+
+@router.get("/status")
+async def get_fleet_status():
+    """로봇별 연결/수신 대역폭 (섹션 데이터 없음)"""
+    return fleet_gateway.get_status()
+
+
+@router.get("/robots/{robot_id}")
+async def get_robot(robot_id: str):
+    _require_robot(robot_id)
+    return fleet_gateway.get_robot(robot_id)
+
+
+@router.get("/robots/{robot_id}/{section}")
+async def get_robot_section(robot_id: str, section: str):
+    _require_robot(robot_id)
+    data = fleet_gateway.get_robot(robot_id, section)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Section '{section}' not available")
+    return data
+
+
+@router.put("/robots/{robot_id}")
+async def put_robot(robot_id: str, robot: FleetRobotConfig):
+    """로봇 추가/변경 (바로 연결)"""
+    if not config.fleet.gateway_mode:
+        raise HTTPException(status_code=409, detail="Gateway mode is disabled (GATEWAY_MODE=1)")
+    robot.url = robot.url.rstrip("/")
+    config.fleet.robots[robot_id] = robot
+    fleet_gateway.add_robot(robot_id, robot)
+    return {"success": True, "robot_id": robot_id}
+
+
+@router.delete("/robots/{robot_id}")
+async def delete_robot(robot_id: str):
+    _require_robot(robot_id)
+    config.fleet.robots.pop(robot_id, None)
+    fleet_gateway.remove_robot(robot_id)
+    return {"success": True, "robot_id": robot_id}
+
+
+@router.put("/robots/{robot_id}/budget")
+async def set_robot_budget(robot_id: str, budget_kbps: float = Query(..., gt=0)):
+    """로봇 feed 대역폭 예산 변경 (재연결 없이 적용)"""
+    _require_robot(robot_id)
+    await fleet_gateway.set_budget(robot_id, budget_kbps)
+    if robot_id in config.fleet.robots:
+        config.fleet.robots[robot_id].budget_kbps = budget_kbps
+    return {"success": True, "robot_id": robot_id, "budget_kbps": budget_kbps}
@@ -0,0 +1,16 @@
+"""
+Metrics Router
+Prometheus text format 메트릭 노출
+"""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from services.metrics import metrics
+
+router = APIRouter()
+
+
+@router.get("", response_class=PlainTextResponse)
+async def get_metrics():
+    """요청 지연, 내부 구간 시간, 스레드풀 대기 시간 (Prometheus text format)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
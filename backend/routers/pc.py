@@ -1,15 +1,17 @@
 """
 PC Monitor Router
-PC1: 로컬 (직접 조회)
-PC2: SSH 원격 조회
+config.pcs의 PC (local이면 직접 조회, 아니면 SSH 원격 조회)
 """
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime
 
 from services.pc_monitor import PCMonitorService
-from config import config
+from services.ssh_pool import ssh_pool
+from config import config, PCConfig
 
 router = APIRouter()
 pc_service = PCMonitorService()
@@ -37,30 +39,42 @@ class PCStatusResponse(BaseModel):
 
 
 class PCConfigRequest(BaseModel):
-    """PC 설정 요청"""
+    """PC 설정 요청 (이전 형식, PC2만)"""
     pc2_ip: Optional[str] = None
     pc2_user: Optional[str] = None
     pc2_password: Optional[str] = None
 
 
+class PCUpdateRequest(BaseModel):
+    """PC 하나의 접속 설정 변경 (없는 PC면 원격 PC로 추가)"""
+    ip: Optional[str] = None
+    port: Optional[int] = None
+    username: Optional[str] = None
+    password: Optional[str] = None
+    ssh_key_path: Optional[str] = None
+    name: Optional[str] = None
+
+
+def _resolve_pc(pc_id: str) -> Tuple[Optional[PCConfig], bool]:
+    """pc_id -> (설정, 로컬 여부), 없으면 404"""
+    pc_config = config.pcs.get(pc_id)
+    if pc_config is None:
+        raise HTTPException(status_code=404, detail=f"PC '{pc_id}' not found")
+    return pc_config, pc_config.local
+
+
 @router.get("/{pc_id}/status", response_model=PCStatusResponse)
 async def get_pc_status(pc_id: str):
     """특정 PC 상태 조회"""
     lan_time = datetime.now()
-    
-    # PC1은 로컬, PC2는 원격
-    is_local = (pc_id == "pc1")
-    
-    if not is_local and pc_id not in config.pcs:
-        raise HTTPException(status_code=404, detail=f"PC '{pc_id}' not found")
+    pc_config, is_local = _resolve_pc(pc_id)
     
     try:
         if is_local:
-            # PC1: 로컬 직접 조회
+            # 로컬 직접 조회
             status = await pc_service.get_status(None, is_local=True)
         else:
-            # PC2: SSH 원격 조회
-            pc_config = config.pcs[pc_id]
+            # SSH 원격 조회
             status = await pc_service.get_status(pc_config, is_local=False)
         
         # 시간 차이 계산
@@ -100,56 +114,90 @@ async def get_pc_status(pc_id: str):
         )
 
 
+async def _get_pc_status_bounded(pc_id: str) -> PCStatusResponse:
+    """호스트 하나가 pc_status_timeout_sec을 넘기면 offline으로 응답 (조회 자체는 계속)"""
+    try:
+        return await asyncio.wait_for(get_pc_status(pc_id), config.pc_status_timeout_sec)
+    except asyncio.TimeoutError:
+        return PCStatusResponse(
+            pc_id=pc_id,
+            online=False,
+            is_local=config.pcs[pc_id].local,
+            lan_time=datetime.now().isoformat(),
+            error=f"timeout after {config.pc_status_timeout_sec}s",
+        )
+
+
 @router.get("/all")
 async def get_all_pcs_status():
-    """모든 PC 상태 조회"""
-    results = {}
-    for pc_id in ["pc1", "pc2"]:
-        status = await get_pc_status(pc_id)
-        results[pc_id] = status
-    return results
+    """모든 PC 상태 조회 (동시에 조회, 응답 시간은 가장 느린 호스트 기준)"""
+    pc_ids = list(config.pcs)
+    statuses = await asyncio.gather(*(_get_pc_status_bounded(pc_id) for pc_id in pc_ids))
+    return dict(zip(pc_ids, statuses))
 
 
 @router.post("/config")
 async def update_pc_config(req: PCConfigRequest):
-    """PC2 설정 업데이트 (PC1은 로컬이므로 설정 불필요)"""
-    if req.pc2_ip:
-        config.pcs["pc2"].ip = req.pc2_ip
-    if req.pc2_user:
-        config.pcs["pc2"].username = req.pc2_user
-    if req.pc2_password:
-        config.pcs["pc2"].password = req.pc2_password
-    
-    return {"status": "ok", "message": "PC2 configuration updated"}
+    """PC2 설정 업데이트 (이전 형식, PUT /{pc_id}/config 사용 권장)"""
+    return await update_single_pc_config("pc2", PCUpdateRequest(
+        ip=req.pc2_ip, username=req.pc2_user, password=req.pc2_password,
+    ))
 
 
 @router.get("/config")
 async def get_pc_config():
-    """현재 PC 설정 조회"""
+    """현재 PC 설정 조회 (config.pcs 순서)"""
     return {
-        "pc1": {"type": "local", "note": "이 PC (Backend 실행 중)"},
-        "pc2": {
+        pc_id: {"type": "local", "name": pc.name or pc_id, "note": "이 PC (Backend 실행 중)"} if pc.local else {
             "type": "remote",
-            "ip": config.pcs["pc2"].ip,
-            "username": config.pcs["pc2"].username,
-            "port": config.pcs["pc2"].port,
+            "name": pc.name or pc_id,
+            "ip": pc.ip,
+            "username": pc.username,
+            "port": pc.port,
         }
+        for pc_id, pc in config.pcs.items()
     }
 
 
+@router.put("/{pc_id}/config")
+async def update_single_pc_config(pc_id: str, req: PCUpdateRequest):
+    """PC 하나의 접속 설정 변경 (없으면 원격 PC로 추가, 기존 SSH 연결은 닫음)"""
+    pc_config = config.pcs.get(pc_id)
+    if pc_config is None:
+        if not req.ip:
+            raise HTTPException(status_code=400, detail="ip is required for a new PC")
+        pc_config = config.pcs[pc_id] = PCConfig(name=pc_id.upper())
+    elif pc_config.local:
+        raise HTTPException(status_code=400, detail=f"PC '{pc_id}' is local")
+    else:
+        ssh_pool.close(pc_config)
+    
+    for field, value in req.model_dump(exclude_none=True).items():
+        setattr(pc_config, field, value)
+    
+    return {"status": "ok", "message": f"{pc_id} configuration updated"}
+
+
+@router.delete("/{pc_id}/config")
+async def delete_pc_config(pc_id: str):
+    """원격 PC 제거 (로컬 PC와 센서/PTP PC는 제거 불가)"""
+    pc_config, is_local = _resolve_pc(pc_id)
+    if is_local or pc_id in (config.sensor_pc, config.time_sync_master_pc):
+        raise HTTPException(status_code=400, detail=f"PC '{pc_id}' cannot be removed")
+    ssh_pool.close(pc_config)
+    del config.pcs[pc_id]
+    return {"status": "ok"}
+
+
 @router.get("/{pc_id}/processes")
 async def get_pc_processes(pc_id: str, top_n: int = 10):
     """특정 PC의 상위 프로세스 목록 조회"""
-    is_local = (pc_id == "pc1")
-    
-    if not is_local and pc_id not in config.pcs:
-        raise HTTPException(status_code=404, detail=f"PC '{pc_id}' not found")
+    pc_config, is_local = _resolve_pc(pc_id)
     
     try:
         if is_local:
             processes = await pc_service.get_processes(None, is_local=True, top_n=top_n)
         else:
-            pc_config = config.pcs[pc_id]
             processes = await pc_service.get_processes(pc_config, is_local=False, top_n=top_n)
         
         return {"pc_id": pc_id, "processes": processes}
@@ -164,16 +212,12 @@ _ptp_processes: dict = {"running": False, "pids": []}
 @router.get("/{pc_id}/network")
 async def get_network_interfaces(pc_id: str):
     """네트워크 인터페이스 목록 및 트래픽 요약 (bmon 스타일)"""
-    is_local = (pc_id == "pc1")
-    
-    if not is_local and pc_id not in config.pcs:
-        raise HTTPException(status_code=404, detail=f"PC '{pc_id}' not found")
+    pc_config, is_local = _resolve_pc(pc_id)
     
     try:
         if is_local:
             data = await pc_service.get_network_interfaces(None, is_local=True)
         else:
-            pc_config = config.pcs[pc_id]
             data = await pc_service.get_network_interfaces(pc_config, is_local=False)
         
         return {"pc_id": pc_id, **data}
@@ -183,15 +227,12 @@ async def get_network_interfaces(pc_id: str):
 
 @router.get("/{pc_id}/tegrastats")
 async def get_tegrastats_power(pc_id: str, duration: int = 3):
-    """Jetson tegrastats로 전력 측정 (PC2 전용)"""
-    if pc_id == "pc1":
-        return {"pc_id": pc_id, "error": "tegrastats is only for Jetson (PC2)"}
-    
-    if pc_id not in config.pcs:
-        raise HTTPException(status_code=404, detail=f"PC '{pc_id}' not found")
+    """Jetson tegrastats로 전력 측정 (원격 Jetson PC)"""
+    pc_config, is_local = _resolve_pc(pc_id)
+    if is_local:
+        return {"pc_id": pc_id, "error": "tegrastats is only for remote Jetson PCs"}
     
     try:
-        pc_config = config.pcs[pc_id]
         data = await pc_service.get_tegrastats_power(pc_config, duration_sec=min(duration, 10))
         return {"pc_id": pc_id, **data}
     except Exception as e:
@@ -200,37 +241,16 @@ async def get_tegrastats_power(pc_id: str, duration: int = 3):
 
 @router.post("/time-sync/start")
 async def start_time_sync():
-    """PTP 시간 동기화 시작 (PC1: slave, PC2: master)"""
+    """PTP 시간 동기화 시작 (이 PC: slave, time_sync_master_pc: master)"""
     global _ptp_processes
     
     if _ptp_processes["running"]:
         return {"status": "already_running", "message": "Time sync is already running"}
     
     try:
-        # PC2 (Master) - sudo 명령어 실행
-        pc2_config = config.pcs["pc2"]
-        
-        # SSH 연결 및 PTP 명령 실행 (백그라운드)
-        import paramiko
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        
-        if pc2_config.password:
-            client.connect(
-                hostname=pc2_config.ip,
-                port=pc2_config.port,
-                username=pc2_config.username,
-                password=pc2_config.password,
-                timeout=5,
-            )
-        else:
-            client.connect(
-                hostname=pc2_config.ip,
-                port=pc2_config.port,
-                username=pc2_config.username,
-                key_filename=pc2_config.ssh_key_path,
-                timeout=5,
-            )
+        # PTP master (기본 PC2) - sudo 명령어 실행, SSH 연결은 풀에서 재사용
+        pc2_config = config.pcs[config.time_sync_master_pc]
+        client = pc_service._get_ssh_client(pc2_config)
         
         # PC2에서 PTP master 실행
         pc2_cmd = '''
@@ -245,7 +265,6 @@ echo $! > /tmp/phc2sys.pid
         
         stdin, stdout, stderr = client.exec_command(pc2_cmd, timeout=10)
         stdout.read()
-        client.close()
         
         # PC1 (Slave) - 로컬 실행
         import subprocess
@@ -297,29 +316,9 @@ async def stop_time_sync():
         subprocess.run(['sudo', 'pkill', '-f', 'ptp4l'], timeout=5, check=False)
         subprocess.run(['sudo', 'pkill', '-f', 'phc2sys'], timeout=5, check=False)
         
-        # PC2 원격 프로세스 종료
-        pc2_config = config.pcs["pc2"]
-        
-        import paramiko
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        
-        if pc2_config.password:
-            client.connect(
-                hostname=pc2_config.ip,
-                port=pc2_config.port,
-                username=pc2_config.username,
-                password=pc2_config.password,
-                timeout=5,
-            )
-        else:
-            client.connect(
-                hostname=pc2_config.ip,
-                port=pc2_config.port,
-                username=pc2_config.username,
-                key_filename=pc2_config.ssh_key_path,
-                timeout=5,
-            )
+        # PTP master 원격 프로세스 종료
+        pc2_config = config.pcs[config.time_sync_master_pc]
+        client = pc_service._get_ssh_client(pc2_config)
         
         stop_cmd = '''
 echo "{password}" | sudo -S bash -c '
@@ -330,7 +329,6 @@ pkill -f phc2sys || true
         
         stdin, stdout, stderr = client.exec_command(stop_cmd, timeout=10)
         stdout.read()
-        client.close()
         
         _ptp_processes = {"running": False, "pids": []}
         
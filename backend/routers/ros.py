@@ -3,13 +3,23 @@ ROS2 Data Router
 Backend에서 rclpy로 구독한 ROS 토픽 데이터를 API로 제공
 (rosbridge 대신 사용 - WiFi 부하 감소)
 """
-from fastapi import APIRouter
+import asyncio
+import time
+from contextlib import aclosing
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from services.ros_subscriber import ros_service, HAS_RCLPY
-from config import config
+from services.ros_summary import ros_summary
+from services.image_relay import image_relay
+from services.map_tiles import map_tiles
+from services.tf_buffer import tf_buffer
+from services.diagnostics import diagnostics_aggregator
+from services.bandwidth import bandwidth_manager, decimate_message
+from config import config, RosTopicConfig
 
 router = APIRouter()
 
@@ -23,12 +33,27 @@ class TopicDataResponse(BaseModel):
     available: bool = False
 
 
+class SubscriptionRequest(RosTopicConfig):
+    """런타임 구독 추가 요청"""
+    name: Optional[str] = None
+    throttle_hz: float = 0.0
+    idle_timeout_sec: float = 60.0  # 런타임 구독은 기본적으로 읽는 클라이언트가 없으면 해제
+
+
 class RosStatusResponse(BaseModel):
     """ROS 상태 응답"""
     ros_available: bool
     node_running: bool
     subscribed_topics: List[str]
     domain_id: Optional[int] = None
+    standin: bool = False
+
+
+def _active_topics() -> List[Dict[str, Any]]:
+    """현재 구독 중인 토픽 (노드가 없으면 설정 파일 기준)"""
+    if ros_service.is_running:
+        return ros_service.get_subscriptions()
+    return [{"name": t.name, "topic": t.topic, "msg_type": t.msg_type} for t in config.ros_topics]
 
 
 @router.get("/status", response_model=RosStatusResponse)
@@ -38,37 +63,41 @@ async def get_ros_status():
     return RosStatusResponse(
         ros_available=HAS_RCLPY,
         node_running=ros_service.is_running,
-        subscribed_topics=[t.topic for t in config.ros_topics],
+        subscribed_topics=[t["topic"] for t in _active_topics()],
         domain_id=int(os.getenv("ROS_DOMAIN_ID", "0")) if HAS_RCLPY else None,
+        standin=ros_service.is_standin,
     )
 
 
 @router.get("/topics")
-async def get_all_topics():
-    """모든 구독 중인 토픽 데이터"""
+async def get_all_topics(request: Request):
+    """모든 구독 중인 토픽 데이터 (대역폭 단계가 올라간 클라이언트는 LaserScan 등 허용된 배열 decimation)"""
     all_data = ros_service.get_all_data()
+    decimation = bandwidth_manager.profile(bandwidth_manager.client_key(request)).decimation
     
     result = {}
-    for topic_config in config.ros_topics:
-        topic = topic_config.topic
+    for sub in _active_topics():
+        topic = sub["topic"]
         if topic in all_data:
+            record = all_data[topic]
             result[topic] = {
-                "name": topic_config.name,
+                "name": sub["name"],
                 "available": True,
-                **all_data[topic]
+                **record,
+                "data": decimate_message(record.get("data"), record.get("msg_type"), decimation),
             }
         else:
             result[topic] = {
-                "name": topic_config.name,
+                "name": sub["name"],
                 "available": False,
-                "msg_type": topic_config.msg_type,
+                "msg_type": sub["msg_type"],
             }
     
     return result
 
 
 @router.get("/topic/{topic_path:path}", response_model=TopicDataResponse)
-async def get_topic_data(topic_path: str):
+async def get_topic_data(topic_path: str, request: Request):
     """특정 토픽 데이터"""
     topic = "/" + topic_path if not topic_path.startswith("/") else topic_path
     data = ros_service.get_topic_data(topic)
@@ -78,7 +107,11 @@ async def get_topic_data(topic_path: str):
             topic=topic,
             timestamp=data.get("timestamp"),
             msg_type=data.get("msg_type"),
-            data=data.get("data"),
+            data=decimate_message(
+                data.get("data"),
+                data.get("msg_type"),
+                bandwidth_manager.profile(bandwidth_manager.client_key(request)).decimation,
+            ),
             available=True,
         )
     else:
@@ -90,40 +123,221 @@ async def get_topic_data(topic_path: str):
 
 @router.get("/summary")
 async def get_ros_summary():
-    """ROS 데이터 요약 (WiFi 트래픽 최소화)"""
-    all_data = ros_service.get_all_data()
-    
-    summary = {
+    """ROS 데이터 요약 (WiFi 트래픽 최소화, 메시지 수신 시 증분 갱신된 값)"""
+    return {
         "timestamp": datetime.now().isoformat(),
-        "topics_active": len(all_data),
-        "topics_configured": len(config.ros_topics),
+        "topics_configured": len(_active_topics()),
+        **ros_summary.get_summary(),
     }
+
+
+# ============================================
+# 런타임 구독 관리 (재시작 없이 추가/해제)
+# ============================================
+
+@router.get("/subscriptions")
+async def get_subscriptions():
+    """현재 구독 목록 (QoS, 주기, idle 시간 포함)"""
+    return {"subscriptions": ros_service.get_subscriptions()}
+
+
+@router.post("/subscriptions")
+async def add_subscription(req: SubscriptionRequest):
+    """
+    토픽 구독 추가 (idle_timeout_sec 동안 /topics 또는 /topic/{토픽}으로 읽히지 않으면 자동 해제, 0이면 유지)
+    이미 구독 중인 토픽을 다른 타입/QoS/주기로 보내면 새 설정으로 다시 구독
+    """
+    if not ros_service.is_running:
+        raise HTTPException(status_code=503, detail="ROS node is not running")
     
-    # 주요 데이터 요약
-    # Battery
-    battery_data = all_data.get("/battery_state", {}).get("data", {})
-    if battery_data:
-        summary["battery"] = {
-            "percentage": battery_data.get("percentage", 0) * 100,
-            "voltage": battery_data.get("voltage", 0),
-        }
+    if not ros_service.add_subscription(req):
+        raise HTTPException(status_code=400, detail=f"Unknown message type: {req.msg_type}")
     
-    # Joint States
-    joint_data = all_data.get("/joint_states", {}).get("data", {})
-    if joint_data:
-        names = joint_data.get("name", [])
-        summary["joints"] = {
-            "count": len(names) if isinstance(names, list) else 0,
-            "names": names[:5] if isinstance(names, list) else [],  # 처음 5개만
-        }
+    return {"status": "ok", "topic": req.topic}
+
+
+@router.delete("/subscriptions/{topic_path:path}")
+async def remove_subscription(topic_path: str):
+    """토픽 구독 해제"""
+    topic = "/" + topic_path if not topic_path.startswith("/") else topic_path
+    if not ros_service.remove_subscription(topic):
+        raise HTTPException(status_code=404, detail=f"Topic '{topic}' is not subscribed")
     
-    # Diagnostics
-    diag_data = all_data.get("/diagnostics", {}).get("data", {})
-    if diag_data:
-        statuses = diag_data.get("status", [])
-        summary["diagnostics"] = {
-            "count": len(statuses) if isinstance(statuses, list) else 0,
-            "errors": sum(1 for s in statuses if isinstance(s, dict) and s.get("level", 0) >= 2) if isinstance(statuses, list) else 0,
-        }
+    return {"status": "ok", "topic": topic}
+
+
+# ============================================
+# 이미지 릴레이 (JPEG/WebP 재인코딩 스트림)
+# ============================================
+
+@router.get("/images")
+async def list_image_streams():
+    """이미지 릴레이 스트림 목록 (failed: 메시지 타입 문제로 구독하지 못한 설정 토픽)"""
+    return {"streams": image_relay.list_streams(), "failed": image_relay.list_failed()}
+
+
+def _get_image_stream(topic: str):
+    """스트림 조회 (설정에 없으면 404, 메시지 타입 문제로 구독하지 못했으면 400)"""
+    stream = image_relay.get_stream(topic)
+    if not stream:
+        error = image_relay.get_error(topic)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+        raise HTTPException(status_code=404, detail=f"Image stream '{topic}' not found")
+    return stream
+
+
+@router.get("/image/snapshot")
+async def get_image_snapshot(topic: str):
+    """최신 프레임 1장"""
+    stream = _get_image_stream(topic)
+    frame = await stream.next_frame(after_seq=0, timeout=2.0)
+    if not frame or frame[1] is None:
+        raise HTTPException(status_code=503, detail="No image data")
+    return Response(content=frame[1], media_type=stream.media_type)
+
+
+async def _adaptive_frames(stream, client: str):
+    """
+    뷰어 하나의 프레임 스트림
+    대역폭 단계에 따라 품질/fps를 낮추고, 그래도 예산을 넘으면 전송 전에 대기
+    """
+    seq = 0
+    last_sent = 0.0
+    with stream.viewer():
+        while True:
+            profile = bandwidth_manager.profile(client)
+            if profile.fps_scale < 1 and stream.config.max_fps > 0:
+                delay = last_sent + 1.0 / (stream.config.max_fps * profile.fps_scale) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            quality = stream.config.quality * profile.quality_scale if profile.quality_scale < 1 else None
+            frame = await stream.next_frame(seq, quality=quality)
+            if frame is None:
+                continue
+            seq, data = frame
+            if data is None:
+                continue
+            await bandwidth_manager.pace(client, len(data))
+            last_sent = time.monotonic()
+            yield data
+
+
+@router.get("/image/mjpeg")
+async def stream_image_mjpeg(topic: str, request: Request):
+    """
+    MJPEG 스트림 (<img src>로 바로 표시 가능)
+    클라이언트가 느리면 중간 프레임은 건너뛰고 최신 프레임만 전송
+    """
+    stream = _get_image_stream(topic)
+    client = bandwidth_manager.client_key(request)
+    
+    async def generate():
+        async with aclosing(_adaptive_frames(stream, client)) as frames:
+            async for data in frames:
+                yield (
+                    b"--frame\r\n"
+                    + f"Content-Type: {stream.media_type}\r\nContent-Length: {len(data)}\r\n\r\n".encode()
+                    + data
+                    + b"\r\n"
+                )
+    
+    return StreamingResponse(generate(), media_type="multipart/x-mixed-replace; boundary=frame")
+
+
+@router.websocket("/image/ws")
+async def stream_image_ws(websocket: WebSocket, topic: str):
+    """
+    WebSocket 바이너리 스트림 (프레임당 메시지 1개)
+    전송이 끝난 뒤 최신 프레임을 가져오므로 느린 클라이언트는 자동으로 프레임 드롭
+    """
+    stream = image_relay.get_stream(topic)
+    if not stream:
+        await websocket.close(code=1008, reason=image_relay.get_error(topic) or f"Image stream '{topic}' not found")
+        return
+    
+    await websocket.accept()
+    try:
+        async with aclosing(_adaptive_frames(stream, bandwidth_manager.client_key(websocket))) as frames:
+            async for data in frames:
+                await websocket.send_bytes(data)
+    except WebSocketDisconnect:
+        pass
+
+
+# ============================================
+# 맵 타일 (OccupancyGrid 증분 전송)
+# ============================================
+
+@router.get("/map/tiles")
+async def get_map_tiles(since: int = 0):
+    """
+    맵 메타데이터 + since 버전 이후 변경된 타일 목록
+    full=true면 클라이언트는 기존 타일을 모두 버리고 다시 받아야 함
+    """
+    return map_tiles.get_tiles(since)
+
+
+@router.get("/map/tile/{tx}/{ty}.png")
+async def get_map_tile(tx: int, ty: int, request: Request):
+    """타일 PNG (해시를 ETag로 사용, 변경 없으면 304)"""
+    loop = asyncio.get_event_loop()
+    tile = await loop.run_in_executor(None, map_tiles.get_tile_png, tx, ty)
+    if not tile:
+        raise HTTPException(status_code=404, detail=f"Tile ({tx}, {ty}) not found")
     
-    return summary
+    tile_hash, png = tile
+    etag = f'"{tile_hash}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=png, media_type="image/png", headers=headers)
+
+
+# ============================================
+# TF (프레임 트리 + 변환 조회)
+# ============================================
+
+@router.get("/tf/frames")
+async def get_tf_frames():
+    """TF 프레임 트리 (child -> parent)"""
+    return {"frames": tf_buffer.get_frames()}
+
+
+@router.get("/tf/lookup")
+async def lookup_transform(target: str, source: str, time: Optional[float] = None):
+    """
+    source 프레임을 target 프레임 기준으로 표현한 변환
+    time(초, ROS 시간)을 주면 이력에서 보간, 없으면 최신 값
+    """
+    try:
+        return tf_buffer.lookup(target, source, time)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+# ============================================
+# Diagnostics (컴포넌트별 상태 + 전이 기록)
+# ============================================
+
+@router.get("/diagnostics")
+async def get_diagnostics(level: Optional[int] = None, min_level: Optional[int] = None,
+                          hardware_id: Optional[str] = None):
+    """컴포넌트별 최신 상태 (level: 0=OK, 1=WARN, 2=ERROR, 3=STALE)"""
+    components = diagnostics_aggregator.query(level=level, min_level=min_level, hardware_id=hardware_id)
+    return {"count": len(components), "components": components}
+
+
+@router.get("/diagnostics/transitions")
+async def get_diagnostics_transitions(limit: int = 100, to_level: Optional[int] = None):
+    """최근 상태 전이 (to_level=2면 ERROR로 바뀐 기록만)"""
+    return {"transitions": diagnostics_aggregator.get_transitions(limit=limit, to_level=to_level)}
+
+
+@router.get("/diagnostics/component")
+async def get_diagnostics_component(name: str):
+    """컴포넌트 하나의 상태 + 전이 기록"""
+    component = diagnostics_aggregator.get_component(name)
+    if not component:
+        raise HTTPException(status_code=404, detail=f"Component '{name}' not found")
+    return component
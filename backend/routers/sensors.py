@@ -2,16 +2,30 @@
 Sensors Router
 센서 연결 상태 확인 (ping, RealSense, USB)
 """
-from fastapi import APIRouter
+import asyncio
+import re
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 
-from services.sensor_check import SensorCheckService
+from services.sensor_check import SensorCheckService, INVENTORY_SUBSYSTEMS
+from services.device_registry import device_registry
+from services.sensor_history import sensor_history
+from services.sensor_scheduler import SensorProbeScheduler, CAMERAS_JOB
 from config import config, SensorConfig
 
 router = APIRouter()
+
+# udev 모니터가 꺼져 있을 때 /devices/ws를 닫는 코드 (클라이언트는 재연결하지 않음)
+DEVICE_EVENTS_DISABLED_CODE = 4001
+
+# 원격 셸로 넘어가는 오디오 장치 ID (hw:1,0 / plughw:1,0 / default만 허용)
+_AUDIO_DEVICE_RE = re.compile(r"(plug)?hw:\d+,\d+|default")
+
 sensor_service = SensorCheckService()
+probe_scheduler = SensorProbeScheduler(sensor_service)
 
 
 class LidarStatus(BaseModel):
@@ -28,6 +42,7 @@ class RealSenseStatus(BaseModel):
     serial: str
     connected: bool
     device_name: Optional[str] = None
+    firmware: Optional[str] = None
 
 
 class CameraStatus(BaseModel):
@@ -61,7 +76,11 @@ class SensorConfigRequest(BaseModel):
 
 @router.get("/status", response_model=SensorsStatusResponse)
 async def get_sensors_status():
-    """모든 센서 상태 조회"""
+    """모든 센서 상태 조회 (스케줄러가 실행 중이면 캐시된 결과, 아니면 요청마다 확인)"""
+    if probe_scheduler.running:
+        await probe_scheduler.wait_ready(timeout=5.0)
+        return _status_from_scheduler()
+    
     lidars = []
     realsense_list = []
     
@@ -77,16 +96,16 @@ async def get_sensors_status():
             ))
     
     # RealSense 확인
-    connected_rs = await sensor_service.get_realsense_devices()
+    connected_rs = await sensor_service.get_realsense_inventory()
     for sensor in config.sensors:
         if sensor.type == "realsense" and sensor.serial:
-            is_connected = sensor.serial in connected_rs
-            device_name = connected_rs.get(sensor.serial)
+            info = connected_rs.get(sensor.serial, {})
             realsense_list.append(RealSenseStatus(
                 name=sensor.name,
                 serial=sensor.serial,
-                connected=is_connected,
-                device_name=device_name,
+                connected=sensor.serial in connected_rs,
+                device_name=info.get("name"),
+                firmware=info.get("firmware"),
             ))
     
     # 일반 카메라 확인
@@ -99,6 +118,14 @@ async def get_sensors_status():
         AudioStatus(name="Microphone", type="microphone", connected=audio_status.get("microphone", False)),
     ]
     
+    # 이미 확인한 결과를 이력에 기록 (추가 probe 없음)
+    sensor_types = {s.name: s.type for s in config.sensors}
+    sensor_history.record_many(
+        [(l.name, sensor_types.get(l.name, "lidar"), l.online) for l in lidars]
+        + [(r.name, "realsense", r.connected) for r in realsense_list]
+        + [(a.name, sensor_types.get(a.name, a.type), a.connected) for a in audio_list]
+    )
+    
     return SensorsStatusResponse(
         timestamp=datetime.now(),
         lidars=lidars,
@@ -108,6 +135,60 @@ async def get_sensors_status():
     )
 
 
+def _status_from_scheduler() -> SensorsStatusResponse:
+    """스케줄러 결과 -> 상태 응답 (probe 없음, 아직 확인 안 된 센서는 offline)"""
+    results = probe_scheduler.results()
+    lidars, realsense_list = [], []
+    audio = {"audio_output": False, "audio_input": False}
+    
+    for sensor in config.sensors:
+        result = results.get(sensor.name, {})
+        if sensor.type in ["lidar_2d", "lidar_3d"] and sensor.ip:
+            lidars.append(LidarStatus(
+                name=sensor.name,
+                ip=sensor.ip,
+                online=result.get("online", False) and result.get("ip") == sensor.ip,
+                ping_ms=result.get("ping_ms"),
+            ))
+        elif sensor.type == "realsense" and sensor.serial:
+            connected = result.get("online", False) and result.get("serial") == sensor.serial
+            realsense_list.append(RealSenseStatus(
+                name=sensor.name,
+                serial=sensor.serial,
+                connected=connected,
+                device_name=result.get("device_name") if connected else None,
+                firmware=result.get("firmware") if connected else None,
+            ))
+        elif sensor.type in audio:
+            audio[sensor.type] = result.get("online", False)
+    
+    return SensorsStatusResponse(
+        timestamp=datetime.now(),
+        lidars=lidars,
+        realsense=realsense_list,
+        cameras=results.get(CAMERAS_JOB, {}).get("cameras", []),
+        audio=[
+            AudioStatus(name="Speaker", type="speaker", connected=audio["audio_output"]),
+            AudioStatus(name="Microphone", type="microphone", connected=audio["audio_input"]),
+        ],
+    )
+
+
+@router.get("/scheduler")
+async def get_probe_scheduler():
+    """센서 확인 스케줄러 상태 (센서별 현재 간격, 다음 확인까지 남은 시간, 연속 상태 횟수)"""
+    return probe_scheduler.get_status()
+
+
+@router.post("/scheduler/trigger")
+async def trigger_probe(kind: Optional[str] = None):
+    """센서를 바로 다시 확인 (kind: lidar_2d/lidar_3d/realsense/audio_output/audio_input, 없으면 전체)"""
+    if not probe_scheduler.running:
+        raise HTTPException(status_code=409, detail="Probe scheduler is not running")
+    probe_scheduler.trigger([kind] if kind else None)
+    return {"status": "ok", "triggered": kind or "all"}
+
+
 @router.get("/ping/{ip}")
 async def ping_sensor(ip: str):
     """특정 IP ping 테스트"""
@@ -122,6 +203,18 @@ async def get_realsense_devices():
     return {"devices": devices}
 
 
+@router.get("/realsense/health")
+async def get_realsense_health(serial: Optional[List[str]] = Query(None), frames: bool = False):
+    """
+    RealSense 상태 확인 (펌웨어, USB 링크 속도, frames=true면 depth/color 프레임 수신)
+    serial이 없으면 설정된 RealSense 전체, 동시에 확인하고 시리얼별로 30초 캐시
+    """
+    names = {s.serial: s.name for s in config.sensors if s.type == "realsense" and s.serial}
+    serials = serial or list(names)
+    results = await sensor_service.check_realsense_health(serials, frames=frames)
+    return {"devices": [{"name": names.get(r["serial"]), **r} for r in results]}
+
+
 @router.get("/cameras")
 async def get_camera_devices():
     """사용 가능한 카메라 디바이스 목록"""
@@ -129,20 +222,112 @@ async def get_camera_devices():
     return {"cameras": cameras}
 
 
+@router.get("/inventory")
+async def get_inventory_status():
+    """PC2 하드웨어 목록 캐시 상태 (항목, 적중률, udev 모니터 연결 여부)"""
+    return sensor_service.get_inventory_status()
+
+
+@router.post("/inventory/invalidate")
+async def invalidate_inventory(kind: Optional[str] = None):
+    """하드웨어 목록 캐시 무효화 (kind: realsense/video/audio/mixer, 없으면 전체)"""
+    if kind is not None and kind not in INVENTORY_SUBSYSTEMS:
+        raise HTTPException(status_code=400, detail=f"Unknown kind '{kind}'")
+    sensor_service.invalidate_inventory([kind] if kind else None)
+    return {"status": "ok", "invalidated": kind or "all"}
+
+
+@router.get("/history")
+async def get_sensor_history(window_sec: Optional[float] = None, kind: Optional[str] = None,
+                             flapping: Optional[bool] = None, min_flaps: int = 0):
+    """
+    센서별 상태 이력 요약 (uptime %, flap 횟수, 마지막 변경 시각, flap 많은 순)
+    window_sec이 없으면 보관된 전체 이력, flapping=true면 최근 flap 중인 센서만
+    """
+    return {"sensors": sensor_history.query(window_sec=window_sec, kind=kind, flapping=flapping, min_flaps=min_flaps)}
+
+
+@router.get("/history/sensor")
+async def get_sensor_history_detail(name: str, limit: int = 100):
+    """센서 하나의 이력 (상태 구간, 최신 순)"""
+    sensor = sensor_history.get_sensor(name, limit=limit)
+    if sensor is None:
+        raise HTTPException(status_code=404, detail=f"No history for '{name}'")
+    return sensor
+
+
+@router.delete("/history")
+async def reset_sensor_history(name: Optional[str] = None):
+    """이력 초기화 (name이 없으면 전체)"""
+    sensor_history.reset(name)
+    return {"status": "ok"}
+
+
+@router.get("/devices")
+async def get_devices(host: Optional[str] = None, kind: Optional[str] = None):
+    """
+    udev 이벤트로 유지되는 장치 목록 (host: pc1/pc2, kind: realsense/camera/speaker/microphone/usb)
+    SENSOR_UDEV_MONITOR=1일 때만 채워짐
+    """
+    return {**device_registry.status(), "devices": device_registry.devices(host, kind)}
+
+
+@router.websocket("/devices/ws")
+async def stream_device_events(websocket: WebSocket):
+    """
+    장치 add/remove 이벤트 push (연결 직후 현재 상태 1회, 이후 변경마다)
+    udev 모니터가 꺼져 있으면 이벤트가 없으므로 DEVICE_EVENTS_DISABLED_CODE로 바로 닫음
+    """
+    await websocket.accept()
+    if not sensor_service.udev_monitor_enabled:
+        await websocket.close(code=DEVICE_EVENTS_DISABLED_CODE, reason="udev monitor disabled (SENSOR_UDEV_MONITOR=0)")
+        return
+    queue = device_registry.subscribe()
+    receiver = asyncio.ensure_future(websocket.receive_text())
+    try:
+        await websocket.send_json({"type": "status", **device_registry.status()})
+        while True:
+            getter = asyncio.ensure_future(queue.get())
+            done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                await websocket.send_json(getter.result())
+            else:
+                getter.cancel()
+            if receiver in done:
+                # 클라이언트 메시지는 무시, 연결 종료만 확인
+                receiver.result()
+                receiver = asyncio.ensure_future(websocket.receive_text())
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        receiver.cancel()
+        device_registry.unsubscribe(queue)
+
+
 @router.post("/config")
 async def update_sensor_config(req: SensorConfigRequest):
-    """센서 설정 업데이트"""
+    """센서 설정 업데이트 (IP/시리얼이 바뀐 센서는 스케줄러가 바로 다시 확인)"""
+    changed = set()
     for sensor in config.sensors:
-        if sensor.type == "lidar_2d" and req.lidar_2d_ip:
-            sensor.ip = req.lidar_2d_ip
-        elif sensor.type == "lidar_3d" and req.lidar_3d_ip:
-            sensor.ip = req.lidar_3d_ip
+        if sensor.type == "lidar_2d":
+            ip = req.lidar_2d_ip
+        elif sensor.type == "lidar_3d":
+            ip = req.lidar_3d_ip
+        else:
+            continue
+        if ip and sensor.ip != ip:
+            sensor.ip = ip
+            changed.add(sensor.type)
     
     if req.realsense_serials:
         rs_sensors = [s for s in config.sensors if s.type == "realsense"]
         for i, serial in enumerate(req.realsense_serials):
-            if i < len(rs_sensors):
+            if i < len(rs_sensors) and rs_sensors[i].serial != serial:
                 rs_sensors[i].serial = serial
+                changed.add("realsense")
+    
+    if changed:
+        probe_scheduler.trigger(sorted(changed))
     
     return {"status": "ok", "message": "Sensor configuration updated"}
 
@@ -185,6 +370,54 @@ async def test_microphone(device_id: str = "default"):
     return result
 
 
+@router.websocket("/audio/level/ws")
+async def stream_mic_level(
+    websocket: WebSocket,
+    device_id: str = "default",
+    rate: int = 16000,
+    channels: int = 1,
+    interval_ms: int = 100,
+    duration: float = 60.0,
+):
+    """
+    마이크 실시간 레벨 (PC2 arecord raw PCM -> 채널별 RMS/peak JSON, interval_ms마다)
+    클라이언트가 "stop"을 보내거나 연결을 끊으면 즉시 중지, duration초 후 자동 종료
+    device_id가 hw:X,Y / plughw:X,Y / default가 아니면 1008로 닫음
+    """
+    if not _AUDIO_DEVICE_RE.fullmatch(device_id):
+        await websocket.close(code=1008, reason=f"Invalid device_id: {device_id!r}")
+        return
+    
+    await websocket.accept()
+    stream = sensor_service.open_mic_level_stream(
+        device_id,
+        rate=max(8000, min(rate, 48000)),
+        channels=max(1, min(channels, 8)),
+        interval_sec=max(20, min(interval_ms, 1000)) / 1000.0,
+        max_sec=max(1.0, min(duration, 600.0)),
+    )
+    
+    async def _receive():
+        try:
+            while await websocket.receive_text() != "stop":
+                pass
+        except WebSocketDisconnect:
+            pass
+        stream.stop()
+    
+    receiver = asyncio.ensure_future(_receive())
+    try:
+        async for level in stream.levels():
+            await websocket.send_json(level)
+        await websocket.send_json({"done": True})
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        receiver.cancel()
+        sensor_service.close_mic_level_stream(stream)
+
+
 @router.get("/audio/volume")
 async def get_volume():
     """현재 볼륨 조회"""
@@ -0,0 +1,105 @@
+"""
+amixer 헬퍼
+- scontrols 출력 파싱 / 볼륨 컨트롤 선택
+- 카드별로 유지되는 원격 `amixer -s` (stdin 모드) 세션: sset 한 줄 쓰기 = SSH 왕복 없음
+"""
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+# 우선순위 순 후보 컨트롤
+CONTROL_CANDIDATES = {
+    "speaker": ["Master", "PCM", "Speaker", "Headphone", "Playback"],
+    "microphone": ["Capture", "Mic", "Microphone", "Input"],
+}
+
+_PERCENT_RE = re.compile(r"\[(\d+)%\]")
+_CARD_RE = re.compile(r"hw:(\d+)(?:,\d+)?")
+
+
+def card_from_device_id(device_id: str) -> str:
+    """
+    hw:X,Y -> X (그 외는 0)
+    카드 번호는 원격 셸 명령과 세션 캐시 키로 쓰이므로 숫자일 때만 사용
+    """
+    match = _CARD_RE.fullmatch(device_id)
+    return match.group(1) if match else "0"
+
+
+def parse_scontrols(output: str) -> List[str]:
+    """Simple mixer control 'Master',0 -> Master"""
+    controls = []
+    for line in output.split("\n"):
+        if "Simple mixer control" in line and "'" in line:
+            controls.append(line.split("'")[1])
+    return controls
+
+
+def pick_controls(available: List[str], device_type: str) -> List[str]:
+    """우선순위 순으로 존재하는 컨트롤 (Master/PCM이 둘 다 있으면 둘 다)"""
+    return [c for c in CONTROL_CANDIDATES.get(device_type, []) if c in available]
+
+
+def parse_percent(output: str) -> Optional[int]:
+    match = _PERCENT_RE.search(output)
+    return int(match.group(1)) if match else None
+
+
+class AmixerSession:
+    """
+    원격 `amixer -c N -s -q` 프로세스 하나 (채널이 닫히면 다음 사용 시 다시 염)
+    amixer -s는 명령별 응답(성공/실패)을 보내지 않으므로 sset은 쓰기까지만 확인
+    """
+
+    def __init__(self, card: str, transport_factory: Callable):
+        self.card = card
+        self._transport_factory = transport_factory
+        # 컨트롤 조회 ~ sset을 한 번에 묶을 때도 사용 (재진입 가능)
+        self.lock = threading.RLock()
+        self._channel = None
+
+    def _open(self):
+        channel = self._transport_factory().open_session()
+        channel.exec_command(f"amixer -c {self.card} -s -q")
+        self._channel = channel
+        return channel
+
+    def _alive(self) -> bool:
+        channel = self._channel
+        return channel is not None and not channel.closed and not channel.exit_status_ready()
+
+    def sset(self, commands: Dict[str, str]):
+        """
+        {컨트롤: 값} 적용 (예: {"Master": "55%"})
+        세션에 쓰지 못하면 예외 (amixer가 값을 거부한 경우는 알 수 없음)
+        """
+        payload = "".join(f"sset '{control}' {value}\n" for control, value in commands.items())
+        with self.lock:
+            # 이전 명령이 stderr로 남긴 오류는 로그만 (버퍼가 쌓이지 않게)
+            if self._alive() and self._channel.recv_stderr_ready():
+                error = self._channel.recv_stderr(4096).decode(errors="replace").strip()
+                if error:
+                    print(f"Warning: amixer card {self.card}: {error}")
+
+            for attempt in range(2):
+                try:
+                    channel = self._channel if self._alive() else self._open()
+                    channel.sendall(payload.encode())
+                    return
+                except Exception:
+                    # 세션이 끊겼으면 한 번만 다시 열어서 재시도
+                    self._close_locked()
+                    if attempt:
+                        raise
+
+    def _close_locked(self):
+        if self._channel is not None:
+            try:
+                self._channel.close()
+            except Exception:
+                pass
+            self._channel = None
+
+    def close(self):
+        with self.lock:
+            self._close_locked()
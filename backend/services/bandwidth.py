@@ -0,0 +1,385 @@
+"""
+Bandwidth Budget
+WiFi 링크로 나가는/들어오는 바이트를 예산 안에 맞추기 위한 공용 도구
+- TokenBucket: 초당 바이트 예산 (보낼 수 없으면 이번 전송을 건너뛰고 다음에 최신 값만 보냄)
+- RateMeter: 최근 window_sec 동안의 실제 바이트/초
+- BandwidthManager: 브라우저 클라이언트(IP)별 + 전체 송신 예산
+  모든 HTTP 응답/WebSocket/스트림 바이트를 미들웨어에서 집계하고, 예산에 가까워지면 단계(level)를 올려
+  이미지 품질/fps, 토픽 배열 decimation, 폴링 주기를 낮춤 (여유가 생기면 hold_sec 뒤 한 단계씩 복구)
+"""
+import asyncio
+import collections
+import time
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from config import BandwidthConfig
+from services.metrics import route_template
+
+
+def kbps_to_bytes(kbps: float) -> float:
+    """kbit/s -> byte/s"""
+    return kbps * 1000.0 / 8.0
+
+
+class TokenBucket:
+    """바이트 단위 token bucket (rate_bps 바이트/초, burst 바이트까지 누적)"""
+
+    def __init__(self, rate_bps: float, burst: Optional[float] = None):
+        self.rate_bps = rate_bps
+        self.burst = burst if burst is not None else rate_bps
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+
+    def set_rate(self, rate_bps: float, burst: Optional[float] = None):
+        """예산 변경 (쌓인 토큰은 새 burst 이하로만 유지)"""
+        self._refill(time.monotonic())
+        self.rate_bps = rate_bps
+        self.burst = burst if burst is not None else rate_bps
+        self.tokens = min(self.tokens, self.burst)
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate_bps)
+        self._updated = now
+
+    def try_consume(self, size: int) -> bool:
+        """
+        size 바이트를 보낼 수 있으면 차감 후 True
+        burst보다 큰 메시지는 bucket이 가득 찼을 때 보내고 부족분은 빚으로 남김 (영원히 막히지 않게)
+        """
+        self._refill(time.monotonic())
+        if self.tokens < min(size, self.burst):
+            return False
+        self.tokens -= size
+        return True
+
+    def consume(self, size: int):
+        """이미 보낸 바이트 차감 (부족하면 빚으로 남김)"""
+        self._refill(time.monotonic())
+        self.tokens -= size
+
+    def wait_time(self, size: int) -> float:
+        """size 바이트를 보낼 수 있을 때까지 남은 시간 (초)"""
+        self._refill(time.monotonic())
+        missing = min(size, self.burst) - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate_bps if self.rate_bps > 0 else float("inf")
+
+
+class RateMeter:
+    """최근 window_sec 동안의 바이트/초, 메시지/초"""
+
+    def __init__(self, window_sec: float = 10.0):
+        self.window_sec = window_sec
+        self.total_bytes = 0
+        self.total_messages = 0
+        self._samples: Deque[Tuple[float, int]] = collections.deque()
+        self._started = time.monotonic()
+
+    def add(self, size: int):
+        now = time.monotonic()
+        self.total_bytes += size
+        self.total_messages += 1
+        self._samples.append((now, size))
+        self._trim(now)
+
+    def _trim(self, now: float):
+        while self._samples and self._samples[0][0] < now - self.window_sec:
+            self._samples.popleft()
+
+    def rate(self) -> Tuple[float, float]:
+        """(바이트/초, 메시지/초)"""
+        now = time.monotonic()
+        self._trim(now)
+        span = min(self.window_sec, max(now - self._started, 1e-3))
+        return sum(size for _, size in self._samples) / span, len(self._samples) / span
+
+    def snapshot(self) -> dict:
+        bytes_per_sec, messages_per_sec = self.rate()
+        return {
+            "kbps": round(bytes_per_sec * 8 / 1000, 2),
+            "messages_per_sec": round(messages_per_sec, 2),
+            "total_bytes": self.total_bytes,
+            "total_messages": self.total_messages,
+        }
+
+
+# ============================================
+# 클라이언트별 송신 예산
+# ============================================
+
+class Profile(NamedTuple):
+    """단계별 전송 설정 (level 0 = 원래 설정)"""
+    quality_scale: float  # 이미지 인코딩 품질 배율
+    fps_scale: float  # 이미지 스트림 fps 배율
+    decimation: int  # DECIMATE_FIELDS 배열(LaserScan ranges 등)을 N개 중 1개만
+    poll_scale: float  # 폴링 주기 배율 (X-Poll-Interval-Scale 헤더로 전달)
+
+
+PROFILES = (
+    Profile(1.0, 1.0, 1, 1.0),
+    Profile(0.8, 0.5, 2, 1.5),
+    Profile(0.6, 0.25, 4, 2.0),
+    Profile(0.4, 0.1, 8, 3.0),
+)
+
+# decimation 대상 배열 최소 길이 (짧은 배열은 그대로)
+DECIMATE_MIN_LEN = 64
+
+# decimation해도 되는 메시지 타입별 (배열 필드, 같이 배율을 적용할 간격 필드)
+# 나머지 타입의 배열은 shape 메타데이터(OccupancyGrid info.width/height, PointCloud2 point_step 등)와
+# 묶여 있어 줄이면 메시지가 깨지므로 그대로 보냄
+DECIMATE_FIELDS = {
+    "sensor_msgs/msg/LaserScan": (("ranges", "intensities"), ("angle_increment", "time_increment")),
+}
+
+# 클라이언트별로 따로 집계하는 라우트 수 (나머지는 other)
+_MAX_ROUTES = 20
+
+
+def _is_long_numeric(value: Any, min_len: int) -> bool:
+    return isinstance(value, list) and len(value) >= min_len and isinstance(value[0], (int, float))
+
+
+def _normalize_msg_type(msg_type: Optional[str]) -> str:
+    """sensor_msgs/LaserScan -> sensor_msgs/msg/LaserScan"""
+    parts = (msg_type or "").strip("/").split("/")
+    if len(parts) == 2:
+        parts = [parts[0], "msg", parts[1]]
+    return "/".join(parts)
+
+
+def decimate_message(data: Any, msg_type: Optional[str], factor: int, min_len: int = DECIMATE_MIN_LEN) -> Any:
+    """
+    DECIMATE_FIELDS에 있는 타입이면 긴 배열을 factor개 중 1개만 남긴 사본 (원본은 수정하지 않음)
+    간격 필드도 factor배로 맞춤, 그 외 타입은 그대로 반환
+    """
+    fields = DECIMATE_FIELDS.get(_normalize_msg_type(msg_type))
+    if factor <= 1 or fields is None or not isinstance(data, dict):
+        return data
+    arrays, increments = fields
+    result = dict(data)
+    decimated = False
+    for key in arrays:
+        if _is_long_numeric(result.get(key), min_len):
+            result[key] = result[key][::factor]
+            decimated = True
+    if decimated:
+        for key in increments:
+            if isinstance(result.get(key), (int, float)):
+                result[key] = result[key] * factor
+    return result
+
+
+class _Client:
+    """클라이언트 하나의 사용량 + 현재 단계"""
+
+    __slots__ = ("key", "meter", "bucket", "level", "changed_at", "evaluated_at", "routes", "last_seen",
+                 "budget_kbps", "first_seen")
+
+    def __init__(self, key: str, budget_kbps: float, window_sec: float):
+        now = time.monotonic()
+        self.key = key
+        self.meter = RateMeter(window_sec)
+        self.bucket = TokenBucket(kbps_to_bytes(budget_kbps))
+        self.budget_kbps = budget_kbps
+        self.level = 0
+        self.changed_at = now
+        self.evaluated_at = 0.0
+        self.routes: Dict[str, int] = {}
+        self.first_seen = time.time()
+        self.last_seen = now
+
+
+class BandwidthManager:
+    """클라이언트(IP)별/전체 송신량 집계 + 단계 조절 (이벤트 루프 스레드에서만 사용)"""
+
+    def __init__(self, bandwidth_config: Optional[BandwidthConfig] = None):
+        self._config = bandwidth_config or BandwidthConfig()
+        self._clients: Dict[str, _Client] = {}
+        self._overrides: Dict[str, float] = {}  # 클라이언트별 예산 (없으면 client_budget_kbps)
+        self._global_meter = RateMeter(self._config.window_sec)
+        self._global_bucket = TokenBucket(kbps_to_bytes(self._config.global_budget_kbps))
+
+    @property
+    def enabled(self) -> bool:
+        return self._config.enabled
+
+    def configure(self, bandwidth_config: BandwidthConfig):
+        self._config = bandwidth_config
+        self._global_meter.window_sec = bandwidth_config.window_sec
+        self._global_bucket.set_rate(kbps_to_bytes(bandwidth_config.global_budget_kbps))
+        for client in self._clients.values():
+            client.meter.window_sec = bandwidth_config.window_sec
+            self._apply_budget(client)
+
+    def set_client_budget(self, key: str, budget_kbps: Optional[float]):
+        """클라이언트 하나의 예산 (None이면 기본값으로)"""
+        if budget_kbps is None:
+            self._overrides.pop(key, None)
+        else:
+            self._overrides[key] = budget_kbps
+        client = self._clients.get(key)
+        if client is not None:
+            self._apply_budget(client)
+
+    def _apply_budget(self, client: _Client):
+        client.budget_kbps = self._overrides.get(client.key, self._config.client_budget_kbps)
+        client.bucket.set_rate(kbps_to_bytes(client.budget_kbps))
+
+    @staticmethod
+    def client_key(connection) -> str:
+        """Request/WebSocket -> 클라이언트 키 (IP)"""
+        client = connection.client
+        return client.host if client else "unknown"
+
+    def _client(self, key: str) -> _Client:
+        client = self._clients.get(key)
+        if client is None:
+            client = self._clients[key] = _Client(
+                key, self._overrides.get(key, self._config.client_budget_kbps), self._config.window_sec,
+            )
+            self._evict_idle()
+        return client
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self._config.idle_sec
+        for key in [k for k, c in self._clients.items() if c.last_seen < cutoff]:
+            del self._clients[key]
+
+    def record(self, key: str, size: int, route: str = "other"):
+        """실제로 보낸 바이트 (미들웨어에서 호출)"""
+        client = self._client(key)
+        client.meter.add(size)
+        client.bucket.consume(size)
+        client.last_seen = time.monotonic()
+        if route in client.routes or len(client.routes) < _MAX_ROUTES:
+            client.routes[route] = client.routes.get(route, 0) + size
+        else:
+            client.routes["other"] = client.routes.get("other", 0) + size
+        self._global_meter.add(size)
+        self._global_bucket.consume(size)
+
+    def level(self, key: str) -> int:
+        if not self._config.enabled:
+            return 0
+        client = self._clients.get(key)
+        if client is None:
+            return 0
+        self._evaluate(client)
+        return client.level
+
+    def profile(self, key: str) -> Profile:
+        return PROFILES[self.level(key)]
+
+    def _evaluate(self, client: _Client):
+        """
+        사용량/예산 비율로 단계 조절 (0.5초에 한 번)
+        - 클라이언트 예산의 raise_at 이상이면 한 단계 올림 (효과를 볼 수 있게 window_sec 간격)
+        - 전체 예산이 raise_at 이상이면 평균 이상 쓰는 클라이언트만 올림
+        - 둘 다 lower_at 이하로 hold_sec 동안 유지되면 한 단계 내림
+        """
+        cfg = self._config
+        now = time.monotonic()
+        if now - client.evaluated_at < 0.5:
+            return
+        client.evaluated_at = now
+
+        client_rate = client.meter.rate()[0]
+        client_ratio = client_rate / kbps_to_bytes(client.budget_kbps) if client.budget_kbps > 0 else 0.0
+        global_rate = self._global_meter.rate()[0]
+        global_ratio = global_rate / kbps_to_bytes(cfg.global_budget_kbps) if cfg.global_budget_kbps > 0 else 0.0
+        fair_share = global_rate / max(1, len(self._clients))
+
+        over = client_ratio >= cfg.raise_at or (global_ratio >= cfg.raise_at and client_rate >= fair_share)
+        under = client_ratio <= cfg.lower_at and global_ratio <= cfg.lower_at
+        since_change = now - client.changed_at
+        if over and client.level < len(PROFILES) - 1 and since_change >= cfg.window_sec:
+            client.level += 1
+            client.changed_at = now
+        elif under and client.level > 0 and since_change >= cfg.hold_sec:
+            client.level -= 1
+            client.changed_at = now
+
+    async def pace(self, key: str, size: int):
+        """스트림 프레임 전송 전 대기 (최고 단계에서도 예산을 넘으면 여기서 fps가 더 낮아짐)"""
+        if not self._config.enabled:
+            return
+        client = self._client(key)
+        delay = max(client.bucket.wait_time(size), self._global_bucket.wait_time(size))
+        if delay > 0:
+            await asyncio.sleep(min(delay, 5.0))
+
+    def get_status(self) -> Dict[str, Any]:
+        """클라이언트별 실시간 송신량 (많이 쓰는 순)"""
+        cfg = self._config
+        self._evict_idle()
+        clients: List[Dict[str, Any]] = []
+        for client in self._clients.values():
+            self._evaluate(client)
+            usage = client.meter.snapshot()
+            clients.append({
+                "client": client.key,
+                **usage,
+                "budget_kbps": client.budget_kbps,
+                "usage_pct": round(100 * usage["kbps"] / client.budget_kbps, 1) if client.budget_kbps else None,
+                "level": client.level,
+                "profile": PROFILES[client.level]._asdict(),
+                "routes": dict(sorted(client.routes.items(), key=lambda kv: -kv[1])),
+                "first_seen": client.first_seen,
+                "idle_sec": round(time.monotonic() - client.last_seen, 1),
+            })
+        usage = self._global_meter.snapshot()
+        return {
+            "enabled": cfg.enabled,
+            "config": cfg.model_dump(),
+            "global": {
+                **usage,
+                "budget_kbps": cfg.global_budget_kbps,
+                "usage_pct": round(100 * usage["kbps"] / cfg.global_budget_kbps, 1) if cfg.global_budget_kbps else None,
+            },
+            "clients": sorted(clients, key=lambda c: -c["kbps"]),
+        }
+
+
+class BandwidthMiddleware:
+    """
+    모든 HTTP 응답 본문/WebSocket 메시지 바이트를 클라이언트별로 집계
+    단계가 올라간 클라이언트의 HTTP 응답에는 X-Bandwidth-Level, X-Poll-Interval-Scale 헤더 추가
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket") or not bandwidth_manager.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        key = client[0] if client else "unknown"
+
+        async def send_wrapper(message):
+            kind = message["type"]
+            if kind == "http.response.start":
+                level = bandwidth_manager.level(key)
+                if level:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-bandwidth-level", str(level).encode()))
+                    headers.append((b"x-poll-interval-scale", str(PROFILES[level].poll_scale).encode()))
+                    message = {**message, "headers": headers}
+            elif kind == "http.response.body":
+                size = len(message.get("body", b""))
+                if size:
+                    bandwidth_manager.record(key, size, route_template(scope))
+            elif kind == "websocket.send":
+                data = message.get("bytes")
+                if data is None:
+                    data = (message.get("text") or "").encode()
+                bandwidth_manager.record(key, len(data), route_template(scope))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+bandwidth_manager = BandwidthManager()
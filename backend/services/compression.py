@@ -0,0 +1,228 @@
+"""
+Response Compression
+- CompressionMiddleware: minimum_size 이상인 JSON/텍스트 응답을 brotli(설치된 경우) 또는 gzip으로 압축
+  (이미지, MJPEG, 이미 압축된 응답은 그대로)
+- asset_response: 빌드 결과(build/)의 .br/.gz 사전 압축 파일이 있으면 그대로 전송 (요청마다 압축 안 함)
+  해시가 붙은 파일(index-AbCd1234.js)은 1년 immutable 캐시, 나머지는 ETag로 재검증
+"""
+import mimetypes
+import os
+import re
+import zlib
+from typing import Optional
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import FileResponse, Response
+
+# brotli 압축 (없으면 gzip만)
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+from config import CompressionConfig
+
+# 압축할 Content-Type (text/event-stream은 제외)
+_COMPRESSIBLE_TYPES = (
+    "application/json", "application/javascript", "application/xml", "application/manifest+json",
+    "image/svg+xml", "text/html", "text/css", "text/javascript", "text/plain", "text/xml",
+)
+
+# Vite 빌드 파일 이름의 content hash (index-AbCd1234.js)
+_HASHED_RE = re.compile(r"-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$")
+
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# 사전 압축 파일 (선호 순)
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+def _accepted(accept_encoding: str) -> set:
+    """Accept-Encoding -> q=0이 아닌 encoding 집합"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if name and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name)
+    return accepted
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.split(";")[0].strip().lower() in _COMPRESSIBLE_TYPES
+
+
+def _append_vary(headers: MutableHeaders):
+    vary = headers.get("vary")
+    if not vary:
+        headers["vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["vary"] = f"{vary}, Accept-Encoding"
+
+
+class _Compressor:
+    """gzip/brotli 스트림 압축 (청크 단위)"""
+
+    def __init__(self, encoding: str, compression_config: CompressionConfig):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=compression_config.brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(compression_config.gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data)
+        return self._zlib.compress(data)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.finish()
+        return self._zlib.flush()
+
+
+class CompressionMiddleware:
+    """
+    응답 압축 (Accept-Encoding 기준 br > gzip)
+    본문이 한 번에 오면 minimum_size 미만은 그대로, 스트리밍(FileResponse 등)은 청크 단위로 압축
+    """
+
+    def __init__(self, app, compression_config: Optional[CompressionConfig] = None):
+        self.app = app
+        self.config = compression_config or CompressionConfig()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.config.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        accepted = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        if HAS_BROTLI and "br" in accepted:
+            encoding = "br"
+        elif "gzip" in accepted:
+            encoding = "gzip"
+        else:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        started = False
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_start():
+            nonlocal started
+            if not started:
+                started = True
+                await send(start_message)
+
+        async def send_wrapper(message):
+            nonlocal start_message, compressor, passthrough
+            kind = message["type"]
+            if kind == "http.response.start":
+                start_message = message
+                headers = Headers(raw=message.get("headers", []))
+                passthrough = (
+                    message["status"] in (204, 206, 304)
+                    or "content-encoding" in headers
+                    or "content-range" in headers
+                    or not _is_compressible(headers.get("content-type", ""))
+                )
+                return
+
+            # 압축 대상이 아니거나 본문이 아닌 메시지 (http.response.pathsend 등)는 그대로
+            if passthrough or kind != "http.response.body":
+                await send_start()
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if compressor is None:
+                if not more_body and len(body) < self.config.minimum_size:
+                    passthrough = True
+                    await send_start()
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding, self.config)
+                headers = MutableHeaders(raw=start_message["headers"])
+                headers["content-encoding"] = encoding
+                _append_vary(headers)
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["etag"] = f"W/{etag}"
+                if not more_body:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["content-length"] = str(len(body))
+                    await send_start()
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                if "content-length" in headers:
+                    del headers["content-length"]
+                await send_start()
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+# ============================================
+# 빌드 자산 (사전 압축 파일 + 캐시 헤더)
+# ============================================
+
+def cache_control(path: str) -> str:
+    """해시가 붙은 빌드 파일은 immutable, 나머지(index.html 등)는 매번 ETag 재검증"""
+    return IMMUTABLE_CACHE if _HASHED_RE.search(os.path.basename(path)) else REVALIDATE_CACHE
+
+
+def asset_response(full_path: str, request_headers: Headers, status_code: int = 200) -> Response:
+    """
+    빌드 파일 응답
+    .br/.gz가 옆에 있고 브라우저가 받을 수 있으면 그 파일을 Content-Encoding과 함께 전송
+    If-None-Match가 ETag와 같으면 304
+    """
+    media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+    headers = {"cache-control": cache_control(full_path), "vary": "Accept-Encoding"}
+
+    path = full_path
+    accepted = _accepted(request_headers.get("accept-encoding", ""))
+    for name, suffix in _PRECOMPRESSED:
+        if name in accepted and os.path.isfile(full_path + suffix):
+            # 압축 파일의 mtime/크기로 ETag를 만들므로 encoding별로 ETag가 다름
+            path = full_path + suffix
+            headers["content-encoding"] = name
+            break
+
+    response = FileResponse(path, status_code=status_code, media_type=media_type, headers=headers,
+                            stat_result=os.stat(path))
+    if status_code == 200 and _is_not_modified(response.headers["etag"], request_headers):
+        return Response(status_code=304, headers={
+            k: v for k, v in response.headers.items()
+            if k in ("cache-control", "etag", "vary", "content-encoding", "last-modified")
+        })
+    return response
+
+
+def _is_not_modified(etag: str, request_headers: Headers) -> bool:
+    if_none_match = request_headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles + 사전 압축 파일/캐시 헤더"""
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        return asset_response(str(full_path), Headers(scope=scope), status_code)
@@ -0,0 +1,291 @@
+"""
+Device Registry
+udevadm monitor 이벤트로 유지되는 호스트별 장치 목록 (PC1 로컬, PC2 SSH)
+- 연결 시 /sys 스냅샷으로 채우고 이후 add/remove 이벤트만 반영 (폴링 없음)
+- 변경은 구독 중인 asyncio 큐로 즉시 전달
+"""
+import asyncio
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# 관심 subsystem (RealSense/USB 카메라/오디오)
+UDEV_SUBSYSTEMS = ("usb", "video4linux", "sound")
+
+UDEV_MONITOR_CMD = "udevadm monitor --udev --property " + " ".join(
+    f"--subsystem-match={s}" for s in UDEV_SUBSYSTEMS
+)
+
+# 현재 연결된 장치 (udevadm info 블록, 빈 줄로 구분)
+UDEV_SNAPSHOT_CMD = (
+    "for d in /sys/class/video4linux/* /sys/class/sound/* /sys/bus/usb/devices/*; do "
+    '[ -e "$d/uevent" ] && udevadm info --query=property --path="$d" && echo; done'
+)
+
+_PCM_RE = re.compile(r"/dev/snd/pcmC(\d+)D(\d+)([pc])$")
+_HEADER_RE = re.compile(r"^UDEV\s+\[[\d.]+\]\s+(\w+)\s+(\S+)\s+\((\w+)\)")
+
+INTEL_VENDOR_ID = "8086"
+
+
+def parse_udev_blocks(lines: Iterable[str]) -> Iterable[Dict[str, str]]:
+    """
+    'KEY=VALUE' 블록 (빈 줄로 구분) -> dict
+    udevadm monitor 헤더 줄 (UDEV [ts] add /devices/... (usb))은 ACTION/DEVPATH/SUBSYSTEM으로 변환
+    """
+    props: Dict[str, str] = {}
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line.strip():
+            if props:
+                yield props
+                props = {}
+            continue
+        header = _HEADER_RE.match(line)
+        if header:
+            if props:
+                yield props
+            action, devpath, subsystem = header.groups()
+            props = {"ACTION": action, "DEVPATH": devpath, "SUBSYSTEM": subsystem}
+        elif "=" in line:
+            key, _, value = line.partition("=")
+            props[key.strip()] = value.strip()
+    if props:
+        yield props
+
+
+def classify(props: Dict[str, str]) -> Optional[str]:
+    """
+    udev 속성 -> 장치 종류 (관심 없는 장치는 None)
+    realsense / camera / speaker / microphone / usb
+    """
+    subsystem = props.get("SUBSYSTEM")
+    devname = props.get("DEVNAME", "")
+    if subsystem == "usb":
+        if props.get("DEVTYPE") != "usb_device":
+            return None
+        return "realsense" if props.get("ID_VENDOR_ID") == INTEL_VENDOR_ID else "usb"
+    if subsystem == "video4linux":
+        if not devname.startswith("/dev/video"):
+            return None
+        return "realsense" if props.get("ID_VENDOR_ID") == INTEL_VENDOR_ID else "camera"
+    if subsystem == "sound":
+        match = _PCM_RE.match(devname)
+        if not match:
+            return None
+        return "speaker" if match.group(3) == "p" else "microphone"
+    return None
+
+
+class DeviceRegistry:
+    """호스트별 DEVPATH -> 장치 정보 (udev 스레드에서 갱신, API는 스냅샷 조회)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._devices: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._live: Dict[str, bool] = {}
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
+        self.version = 0
+
+    @staticmethod
+    def _entry(host: str, kind: str, props: Dict[str, str], since: float) -> Dict[str, Any]:
+        entry = {
+            "host": host,
+            "kind": kind,
+            "devpath": props.get("DEVPATH"),
+            "subsystem": props.get("SUBSYSTEM"),
+            "devname": props.get("DEVNAME"),
+            "vendor_id": props.get("ID_VENDOR_ID"),
+            "model_id": props.get("ID_MODEL_ID"),
+            "model": props.get("ID_MODEL_FROM_DATABASE") or props.get("ID_MODEL"),
+            "serial": props.get("ID_SERIAL_SHORT"),
+            "since": since,
+        }
+        match = _PCM_RE.match(props.get("DEVNAME", ""))
+        if match:
+            entry["alsa_id"] = f"hw:{match.group(1)},{match.group(2)}"
+        return entry
+
+    def replace(self, host: str, blocks: Iterable[Dict[str, str]]):
+        """스냅샷으로 호스트 장치 목록 교체 (연결 직후)"""
+        now = time.time()
+        devices = {}
+        for props in blocks:
+            kind = classify(props)
+            if kind and props.get("DEVPATH"):
+                previous = self._devices.get(host, {}).get(props["DEVPATH"])
+                devices[props["DEVPATH"]] = self._entry(host, kind, props, previous["since"] if previous else now)
+        with self._lock:
+            self._devices[host] = devices
+            self._live[host] = True
+            self.version += 1
+        self._publish({"type": "snapshot", "host": host, "count": len(devices)})
+
+    def apply(self, host: str, props: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """udev 이벤트 하나 반영 (관심 장치의 add/remove만, 변경된 항목 반환)"""
+        action, devpath = props.get("ACTION"), props.get("DEVPATH")
+        kind = classify(props)
+        if not devpath or not kind or action not in ("add", "remove", "change", "bind", "unbind"):
+            return None
+        with self._lock:
+            devices = self._devices.setdefault(host, {})
+            if action == "remove":
+                entry = devices.pop(devpath, None)
+                if entry is None:
+                    return None
+            elif action in ("add", "change") or devpath not in devices:
+                previous = devices.get(devpath)
+                entry = self._entry(host, kind, props, previous["since"] if previous else time.time())
+                devices[devpath] = entry
+            else:
+                return None
+            self.version += 1
+        self._publish({"type": "remove" if action == "remove" else "add", "device": entry})
+        return entry
+
+    def set_live(self, host: str, live: bool):
+        """모니터 연결 상태 (끊기면 목록은 남기되 live=False)"""
+        with self._lock:
+            changed = self._live.get(host) != live
+            self._live[host] = live
+        if changed:
+            self._publish({"type": "live", "host": host, "live": live})
+
+    def is_live(self, host: str) -> bool:
+        return self._live.get(host, False)
+
+    def devices(self, host: Optional[str] = None, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            hosts = [host] if host else list(self._devices)
+            result = [
+                dict(entry)
+                for h in hosts
+                for entry in self._devices.get(h, {}).values()
+                if kind is None or entry["kind"] == kind
+            ]
+        return sorted(result, key=lambda d: (d["host"], d["kind"], d["devname"] or d["devpath"]))
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "hosts": {
+                    host: {"live": self._live.get(host, False), "devices": len(self._devices.get(host, {}))}
+                    for host in set(self._devices) | set(self._live)
+                },
+            }
+
+    # ============================================
+    # 변경 구독 (WebSocket)
+    # ============================================
+
+    def subscribe(self, maxsize: int = 100) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        with self._lock:
+            self._subscribers.append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers = [(loop, q) for loop, q in self._subscribers if q is not queue]
+
+    def _publish(self, event: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_put_latest, queue, event)
+            except RuntimeError:  # 이벤트 루프 종료됨
+                self.unsubscribe(queue)
+
+
+def _put_latest(queue: asyncio.Queue, item):
+    # 느린 구독자는 오래된 이벤트부터 버림
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+class UdevMonitor:
+    """
+    호스트 하나의 udevadm monitor 스트림 (끊기면 backoff 후 재연결)
+
+    open_stream() -> (줄 iterable, close 함수), snapshot() -> udevadm info 출력
+    모니터를 먼저 연 뒤 스냅샷을 읽으므로 그 사이의 이벤트도 놓치지 않음
+    """
+
+    def __init__(self, host: str, registry: DeviceRegistry,
+                 open_stream: Callable[[], Tuple[Iterable[str], Callable[[], None]]],
+                 snapshot: Callable[[], str],
+                 on_connect: Optional[Callable[[], None]] = None,
+                 on_event: Optional[Callable[[Dict[str, str]], None]] = None):
+        self.host = host
+        self.registry = registry
+        self._open_stream = open_stream
+        self._snapshot = snapshot
+        self._on_connect = on_connect
+        self._on_event = on_event
+        self._stop = threading.Event()
+        self._close: Optional[Callable[[], None]] = None
+        self._thread: Optional[threading.Thread] = None
+        self.connected = False
+        self.events = 0
+        self.reconnects = 0
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=f"udev-monitor-{self.host}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        close = self._close
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                pass
+        if self._thread:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _loop(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                lines, self._close = self._open_stream()
+                self.registry.replace(self.host, parse_udev_blocks(self._snapshot().splitlines()))
+                self.connected = True
+                if self._on_connect:
+                    self._on_connect()
+                backoff = 1.0
+
+                for props in parse_udev_blocks(lines):
+                    if self._stop.is_set():
+                        break
+                    self.events += 1
+                    self.registry.apply(self.host, props)
+                    if self._on_event:
+                        self._on_event(props)
+            except Exception:
+                pass
+            finally:
+                self.connected = False
+                self.registry.set_live(self.host, False)
+                close, self._close = self._close, None
+                if close is not None:
+                    try:
+                        close()
+                    except Exception:
+                        pass
+
+            if self._stop.wait(backoff):
+                break
+            self.reconnects += 1
+            backoff = min(backoff * 2, 30.0)
+
+
+device_registry = DeviceRegistry()
@@ -0,0 +1,191 @@
+"""
+Diagnostics Aggregator Service
+/diagnostics의 DiagnosticStatus를 컴포넌트 이름별로 누적 관리
+(메시지마다 일부 컴포넌트만 발행해도 유지, 상태 전이 기록, level/hardware_id 인덱스)
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Set
+
+from config import DiagnosticsConfig
+from services.ros_subscriber import ros_service
+from services.ros_summary import ros_summary, DIAG_LEVELS
+
+
+def _level_to_int(level) -> int:
+    """DiagnosticStatus.level (rclpy에서는 길이 1인 bytes) -> int"""
+    if isinstance(level, (bytes, bytearray)):
+        return level[0] if level else 0
+    return int(level)
+
+
+class _Component:
+    """컴포넌트 하나의 최신 상태 + 전이 기록"""
+
+    __slots__ = ("name", "hardware_id", "level", "message", "values", "updated_at", "updated_mono", "transitions")
+
+    def __init__(self, name: str, history: int):
+        self.name = name
+        self.hardware_id: Optional[str] = None  # 첫 갱신 때 인덱스에 들어가도록 (빈 문자열도 유효한 값)
+        self.level: Optional[int] = None
+        self.message = ""
+        self.values: Dict[str, str] = {}
+        self.updated_at = ""
+        self.updated_mono = 0.0
+        self.transitions = deque(maxlen=history)
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "hardware_id": self.hardware_id,
+            "level": self.level,
+            "level_name": DIAG_LEVELS.get(self.level, "unknown"),
+            "message": self.message,
+            "values": self.values,
+            "updated_at": self.updated_at,
+            "age_sec": round(now - self.updated_mono, 1),
+        }
+
+
+class DiagnosticsAggregator:
+    """컴포넌트별 Diagnostics 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config = DiagnosticsConfig()
+        self._components: Dict[str, _Component] = {}
+
+        # 인덱스: level -> 컴포넌트 이름, hardware_id -> 컴포넌트 이름
+        self._by_level: Dict[int, Set[str]] = {}
+        self._by_hardware: Dict[str, Set[str]] = {}
+
+        self._transitions = deque(maxlen=self._config.history_total)
+
+    def start(self, diag_config: DiagnosticsConfig) -> bool:
+        """/diagnostics 원본 구독 (ROS 노드 시작 후 호출)"""
+        self._config = diag_config
+        self._transitions = deque(maxlen=diag_config.history_total)
+        if not ros_service.subscribe_raw(diag_config.topic, "diagnostic_msgs/msg/DiagnosticArray", self.on_message):
+            return False
+
+        # 요약의 diagnostics 항목은 최신 메시지 대신 누적 상태로 갱신
+        ros_summary.unregister(diag_config.topic, "diagnostics")
+        return True
+
+    def on_message(self, msg):
+        """ROS 콜백 - DiagnosticArray 병합"""
+        now_iso = datetime.now().isoformat()
+        now = time.monotonic()
+
+        with self._lock:
+            for status in msg.status:
+                self._update(
+                    status.name,
+                    _level_to_int(status.level),
+                    status.message,
+                    status.hardware_id,
+                    {kv.key: kv.value for kv in status.values},
+                    now_iso,
+                    now,
+                )
+            fragment = self._summary_fragment()
+
+        ros_summary.set_fragment("diagnostics", fragment)
+
+    def _update(self, name: str, level: int, message: str, hardware_id: str,
+                values: Dict[str, str], now_iso: str, now: float):
+        """컴포넌트 상태 갱신 (호출자가 self._lock을 잡고 있어야 함)"""
+        comp = self._components.get(name)
+        if comp is None:
+            comp = _Component(name, self._config.history_per_component)
+            self._components[name] = comp
+
+        if comp.level != level:
+            if comp.level is not None:
+                self._by_level.get(comp.level, set()).discard(name)
+                transition = {
+                    "name": name,
+                    "time": now_iso,
+                    "from": DIAG_LEVELS.get(comp.level, str(comp.level)),
+                    "to": DIAG_LEVELS.get(level, str(level)),
+                    "message": message,
+                }
+                comp.transitions.append(transition)
+                self._transitions.append(transition)
+            self._by_level.setdefault(level, set()).add(name)
+
+        if comp.hardware_id != hardware_id:
+            self._by_hardware.get(comp.hardware_id, set()).discard(name)
+            self._by_hardware.setdefault(hardware_id, set()).add(name)
+
+        comp.level = level
+        comp.message = message
+        comp.hardware_id = hardware_id
+        comp.values = values
+        comp.updated_at = now_iso
+        comp.updated_mono = now
+
+    def _summary_fragment(self) -> Dict[str, Any]:
+        """요약용 level별 개수 (인덱스 크기만 사용)"""
+        by_level = {name: len(self._by_level.get(level, ())) for level, name in DIAG_LEVELS.items()}
+        return {
+            "count": len(self._components),
+            "errors": by_level["error"] + by_level["stale"],  # level >= 2
+            "by_level": by_level,
+        }
+
+    def query(self, level: Optional[int] = None, min_level: Optional[int] = None,
+              hardware_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        컴포넌트 조회 (인덱스 교집합으로 필터링)
+
+        Args:
+            level: 이 level인 컴포넌트만
+            min_level: 이 level 이상인 컴포넌트만
+            hardware_id: 이 hardware_id인 컴포넌트만
+        """
+        now = time.monotonic()
+        with self._lock:
+            names: Optional[Set[str]] = None
+            if level is not None:
+                names = set(self._by_level.get(level, ()))
+            if min_level is not None:
+                matched = set()
+                for lv, members in self._by_level.items():
+                    if lv >= min_level:
+                        matched |= members
+                names = matched if names is None else names & matched
+            if hardware_id is not None:
+                matched = self._by_hardware.get(hardware_id, set())
+                names = set(matched) if names is None else names & matched
+            if names is None:
+                names = self._components.keys()
+
+            return [self._components[name].to_dict(now) for name in sorted(names)]
+
+    def get_component(self, name: str) -> Optional[Dict[str, Any]]:
+        """컴포넌트 상태 + 전이 기록"""
+        now = time.monotonic()
+        with self._lock:
+            comp = self._components.get(name)
+            if comp is None:
+                return None
+            return {**comp.to_dict(now), "transitions": list(comp.transitions)}
+
+    def get_transitions(self, limit: int = 100, to_level: Optional[int] = None) -> List[Dict[str, Any]]:
+        """최근 상태 전이 (최신순)"""
+        target = DIAG_LEVELS.get(to_level) if to_level is not None else None
+        with self._lock:
+            result = []
+            for transition in reversed(self._transitions):
+                if target is None or transition["to"] == target:
+                    result.append(transition)
+                    if len(result) >= limit:
+                        break
+            return result
+
+
+# 전역 인스턴스
+diagnostics_aggregator = DiagnosticsAggregator()
@@ -0,0 +1,261 @@
+"""
+Fleet Gateway
+여러 로봇 Backend의 /api/fleet/ws feed를 구독해서 하나의 fleet 상태로 합침 (GATEWAY_MODE=1)
+- 로봇 쪽 feed: 연결 직후 snapshot 1회, 이후 바뀐 키만 delta로 push (폴링 없음)
+- 로봇별 budget_kbps: 로봇이 token bucket으로 지킴 (예산을 넘으면 전송을 건너뛰고 다음에 최신 값만)
+- 게이트웨이 API는 메모리에 합쳐진 상태만 반환 (요청이 로봇까지 가지 않음)
+"""
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+# 로봇 feed 연결 (uvicorn[standard]에 포함)
+try:
+    import websockets
+    HAS_WEBSOCKETS = True
+except ImportError:
+    HAS_WEBSOCKETS = False
+
+from config import FleetConfig, FleetRobotConfig
+from services.bandwidth import RateMeter
+
+# feed 섹션 (로봇 쪽 API 하나씩)
+FEED_SECTIONS = ("summary", "pcs", "sensors", "ros")
+
+
+# ============================================
+# feed 프로토콜 (로봇 /api/fleet/ws <-> 게이트웨이)
+# ============================================
+
+def encode_message(message: Dict[str, Any]) -> str:
+    return json.dumps(message, separators=(",", ":"), default=str)
+
+
+def encode_sections(sections: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+    """섹션별 키 -> JSON 문자열 (이전 전송분과 비교용)"""
+    return {
+        name: {key: encode_message(value) for key, value in section.items()}
+        for name, section in sections.items()
+    }
+
+
+def diff_sections(sent: Dict[str, Dict[str, str]],
+                  current: Dict[str, Dict[str, str]]) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, List[str]]]:
+    """
+    마지막으로 보낸 상태 대비 바뀐 키 (set)와 사라진 키 (del)
+    건너뛴 변경은 sent가 그대로라 다음 diff에 최신 값으로 포함됨
+    """
+    changed: Dict[str, Dict[str, Any]] = {}
+    removed: Dict[str, List[str]] = {}
+    for name, section in current.items():
+        previous = sent.get(name, {})
+        values = {key: value for key, value in section.items() if previous.get(key) != value}
+        if values:
+            changed[name] = {key: json.loads(value) for key, value in values.items()}
+        gone = [key for key in previous if key not in section]
+        if gone:
+            removed[name] = gone
+    return changed, removed
+
+
+def apply_message(state: Dict[str, Dict[str, Any]], message: Dict[str, Any]) -> bool:
+    """snapshot/delta 메시지를 섹션 상태에 반영 (상태가 바뀌었으면 True)"""
+    kind = message.get("type")
+    if kind == "snapshot":
+        state.clear()
+        state.update({name: dict(section) for name, section in message.get("sections", {}).items()})
+        return True
+    if kind == "delta":
+        for name, values in message.get("set", {}).items():
+            state.setdefault(name, {}).update(values)
+        for name, keys in message.get("del", {}).items():
+            section = state.get(name, {})
+            for key in keys:
+                section.pop(key, None)
+        return True
+    return False
+
+
+# ============================================
+# 게이트웨이
+# ============================================
+
+class RobotLink:
+    """로봇 하나의 feed 연결 상태 + 마지막으로 받은 섹션"""
+
+    def __init__(self, robot_id: str, robot: FleetRobotConfig):
+        self.robot_id = robot_id
+        self.robot = robot
+        self.sections: Dict[str, Dict[str, Any]] = {}
+        self.rx = RateMeter()
+        self.connected = False
+        self.connects = 0
+        self.last_message: Optional[float] = None  # time.time()
+        self.last_update: Optional[float] = None
+        self.last_seq: Optional[int] = None
+        self.error: Optional[str] = None
+        self.websocket = None
+
+    @property
+    def feed_url(self) -> str:
+        base = self.robot.url
+        if base.startswith("https://"):
+            base = "wss://" + base[len("https://"):]
+        elif base.startswith("http://"):
+            base = "ws://" + base[len("http://"):]
+        elif "://" not in base:
+            base = "ws://" + base
+        query = urlencode({"interval_ms": self.robot.interval_ms, "budget_kbps": self.robot.budget_kbps})
+        return f"{base}/api/fleet/ws?{query}"
+
+    def status(self, stale_after_sec: float) -> Dict[str, Any]:
+        now = time.time()
+        age = now - self.last_message if self.last_message else None
+        return {
+            "id": self.robot_id,
+            "name": self.robot.name or self.robot_id,
+            "url": self.robot.url,
+            "connected": self.connected,
+            "stale": not self.connected or age is None or age > stale_after_sec,
+            "age_sec": round(age, 2) if age is not None else None,
+            "last_update": self.last_update,
+            "budget_kbps": self.robot.budget_kbps,
+            "rx": self.rx.snapshot(),
+            "connects": self.connects,
+            "error": self.error,
+        }
+
+
+class FleetGateway:
+    """로봇별 feed 구독 태스크 + 합쳐진 fleet 상태"""
+
+    def __init__(self):
+        self._config = FleetConfig()
+        self._links: Dict[str, RobotLink] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self, fleet_config: FleetConfig):
+        """로봇별 연결 태스크 시작 (이벤트 루프에서 호출)"""
+        self._config = fleet_config
+        if not fleet_config.gateway_mode or self.running:
+            return
+        if not HAS_WEBSOCKETS:
+            print("⚠️ websockets not installed, fleet gateway disabled. Install with: pip install websockets")
+            return
+        for robot_id, robot in fleet_config.robots.items():
+            self.add_robot(robot_id, robot)
+
+    def add_robot(self, robot_id: str, robot: FleetRobotConfig):
+        """로봇 추가 (같은 ID면 다시 연결)"""
+        self.remove_robot(robot_id)
+        link = self._links[robot_id] = RobotLink(robot_id, robot)
+        self._tasks[robot_id] = asyncio.ensure_future(self._run(link))
+
+    def remove_robot(self, robot_id: str) -> bool:
+        task = self._tasks.pop(robot_id, None)
+        if task is not None:
+            task.cancel()
+        return self._links.pop(robot_id, None) is not None
+
+    async def stop(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = {}
+
+    async def set_budget(self, robot_id: str, budget_kbps: float) -> bool:
+        """로봇 feed 예산 변경 (연결 중이면 재연결 없이 로봇에 전달)"""
+        link = self._links.get(robot_id)
+        if link is None:
+            return False
+        link.robot = link.robot.model_copy(update={"budget_kbps": budget_kbps})
+        websocket = link.websocket
+        if websocket is not None:
+            try:
+                await websocket.send(encode_message({"budget_kbps": budget_kbps}))
+            except Exception:
+                pass  # 재연결 시 새 예산이 URL로 전달됨
+        return True
+
+    def robot_ids(self) -> List[str]:
+        return list(self._links)
+
+    def get_status(self) -> Dict[str, Any]:
+        """로봇별 연결/대역폭 상태 (섹션 데이터 없음)"""
+        stale_after = self._config.stale_after_sec
+        robots = [link.status(stale_after) for link in self._links.values()]
+        return {
+            "gateway_mode": self._config.gateway_mode,
+            "robots": robots,
+            "total": len(robots),
+            "online": sum(1 for r in robots if not r["stale"]),
+            "rx_kbps": round(sum(r["rx"]["kbps"] for r in robots), 2),
+            "budget_kbps": sum(r["budget_kbps"] for r in robots),
+        }
+
+    def get_fleet(self, sections: Optional[List[str]] = None) -> Dict[str, Any]:
+        """합쳐진 fleet 상태 (로봇별 상태 + 요청한 섹션)"""
+        stale_after = self._config.stale_after_sec
+        robots = {}
+        for robot_id, link in self._links.items():
+            robots[robot_id] = {
+                **link.status(stale_after),
+                "sections": {
+                    name: section for name, section in link.sections.items()
+                    if sections is None or name in sections
+                },
+            }
+        return {
+            "timestamp": time.time(),
+            "total": len(robots),
+            "online": sum(1 for r in robots.values() if not r["stale"]),
+            "robots": robots,
+        }
+
+    def get_robot(self, robot_id: str, section: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        link = self._links.get(robot_id)
+        if link is None:
+            return None
+        if section is not None:
+            return link.sections.get(section)
+        return {**link.status(self._config.stale_after_sec), "sections": link.sections}
+
+    async def _run(self, link: RobotLink):
+        """연결 -> 메시지 반영, 끊기면 backoff 후 재연결 (마지막 상태는 stale로 유지)"""
+        backoff = 1.0
+        while True:
+            try:
+                async with websockets.connect(link.feed_url, open_timeout=5, max_size=8 * 1024 * 1024) as websocket:
+                    link.websocket = websocket
+                    link.connected = True
+                    link.connects += 1
+                    link.error = None
+                    backoff = 1.0
+                    async for raw in websocket:
+                        link.rx.add(len(raw))
+                        message = json.loads(raw)
+                        link.last_message = time.time()
+                        link.last_seq = message.get("seq", link.last_seq)
+                        if apply_message(link.sections, message):
+                            link.last_update = link.last_message
+                link.error = "connection closed"
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                link.error = str(e) or type(e).__name__
+            finally:
+                link.connected = False
+                link.websocket = None
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self._config.reconnect_max_sec)
+
+
+fleet_gateway = FleetGateway()
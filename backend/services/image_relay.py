@@ -0,0 +1,319 @@
+"""
+Image Relay Service
+sensor_msgs/Image, CompressedImage 토픽을 Backend에서 구독하고
+JPEG/WebP로 재인코딩하여 MJPEG / WebSocket 스트림으로 제공
+(여러 뷰어가 프레임당 한 번의 인코딩을 공유, 느린 클라이언트는 프레임 드롭)
+"""
+import asyncio
+import io
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, List, Tuple
+
+# 이미지 처리 라이브러리 (없으면 릴레이 비활성화)
+try:
+    import numpy as np
+    from PIL import Image as PILImage
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+from config import ImageStreamConfig
+from services.ros_subscriber import ros_service
+
+
+# sensor_msgs/Image encoding -> (dtype, 채널 수)
+_RAW_ENCODINGS = {
+    "rgb8": ("u1", 3),
+    "bgr8": ("u1", 3),
+    "rgba8": ("u1", 4),
+    "bgra8": ("u1", 4),
+    "mono8": ("u1", 1),
+    "8uc1": ("u1", 1),
+    "mono16": ("u2", 1),
+    "16uc1": ("u2", 1),
+    "32fc1": ("f4", 1),
+}
+
+
+def _raw_image_to_pil(msg):
+    """sensor_msgs/Image -> PIL Image (depth/16bit는 8bit 그레이로 정규화)"""
+    encoding = msg.encoding.lower()
+    if encoding not in _RAW_ENCODINGS:
+        raise ValueError(f"Unsupported image encoding: {msg.encoding}")
+
+    dtype_str, channels = _RAW_ENCODINGS[encoding]
+    dtype = np.dtype(dtype_str).newbyteorder(">" if msg.is_bigendian else "<")
+    row_bytes = msg.width * channels * dtype.itemsize
+
+    # step(행 바이트)에 패딩이 있을 수 있으므로 행 단위로 잘라냄
+    buf = np.frombuffer(msg.data, dtype=np.uint8).reshape(msg.height, msg.step)[:, :row_bytes]
+    arr = np.ascontiguousarray(buf).view(dtype).reshape(msg.height, msg.width, channels)
+
+    if dtype.itemsize > 1:
+        # Depth 등: 유효 범위를 0-255로 정규화
+        values = arr[..., 0].astype(np.float32)
+        valid = np.isfinite(values) & (values > 0)
+        if valid.any():
+            lo, hi = float(values[valid].min()), float(values[valid].max())
+            scale = 255.0 / (hi - lo) if hi > lo else 0.0
+            values = np.where(valid, (values - lo) * scale, 0)
+        else:
+            values = np.zeros_like(values)
+        return PILImage.fromarray(values.astype(np.uint8), mode="L")
+
+    if channels == 1:
+        return PILImage.fromarray(arr[..., 0], mode="L")
+    if encoding.startswith("bgr"):
+        arr = arr[..., [2, 1, 0]] if channels == 3 else arr[..., [2, 1, 0, 3]]
+    return PILImage.fromarray(np.ascontiguousarray(arr), mode="RGB" if channels == 3 else "RGBA")
+
+
+def encode_image_msg(msg, fmt: str = "jpeg", quality: int = 70, max_width: int = 0) -> bytes:
+    """
+    ROS 이미지 메시지를 JPEG/WebP 바이트로 인코딩
+
+    Args:
+        msg: sensor_msgs/Image 또는 sensor_msgs/CompressedImage
+        fmt: "jpeg" 또는 "webp"
+        quality: 인코딩 품질 (1-100)
+        max_width: 0보다 크면 이 폭 이하로 축소
+    """
+    fmt = fmt.lower()
+
+    if hasattr(msg, "encoding"):
+        img = _raw_image_to_pil(msg)
+    else:
+        data = bytes(msg.data)
+        img = PILImage.open(io.BytesIO(data))  # 헤더만 읽음 (lazy)
+        # 이미 원하는 포맷/크기면 재인코딩 없이 그대로 전달
+        if img.format == "JPEG" and fmt == "jpeg" and (not max_width or img.width <= max_width):
+            return data
+
+    if max_width and img.width > max_width:
+        height = max(1, round(img.height * max_width / img.width))
+        img = img.resize((max_width, height), PILImage.BILINEAR)
+
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+
+    out = io.BytesIO()
+    img.save(out, format="WEBP" if fmt == "webp" else "JPEG", quality=quality)
+    return out.getvalue()
+
+
+class ImageStream:
+    """단일 이미지 토픽 스트림 (최신 프레임 1장만 유지)"""
+
+    def __init__(self, stream_config: ImageStreamConfig):
+        self.config = stream_config
+        self._lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+
+        # 최신 원본 메시지 (인코딩은 뷰어가 요청할 때 한 번만)
+        self._raw = None
+        self._raw_seq = 0
+        self._raw_time = 0.0
+
+        # 인코딩 결과 캐시 (같은 프레임을 품질별로 한 번씩, 대역폭 단계가 다른 뷰어용)
+        self._encoded: Dict[int, Optional[bytes]] = {}
+        self._encoded_seq = 0
+        self._last_error: Optional[str] = None
+
+        # 새 프레임 대기 중인 뷰어 (loop, asyncio.Event)
+        self._waiters = set()
+        self._viewers = 0
+
+        self._frames_received = 0
+        self._frames_throttled = 0
+        self._frames_encoded = 0
+
+    @property
+    def media_type(self) -> str:
+        return "image/webp" if self.config.format.lower() == "webp" else "image/jpeg"
+
+    def on_message(self, msg):
+        """ROS 콜백 - 원본 메시지만 교체하고 대기 중인 뷰어를 깨움"""
+        now = time.monotonic()
+        min_interval = 1.0 / self.config.max_fps if self.config.max_fps > 0 else 0.0
+
+        with self._lock:
+            self._frames_received += 1
+            if now - self._raw_time < min_interval:
+                self._frames_throttled += 1
+                return
+            self._raw = msg
+            self._raw_seq += 1
+            self._raw_time = now
+            waiters = list(self._waiters)
+
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def encode_latest(self, quality: Optional[int] = None) -> Optional[Tuple[int, Optional[bytes]]]:
+        """
+        최신 프레임 인코딩 (이미 인코딩된 프레임/품질이면 캐시 반환)
+
+        Args:
+            quality: 인코딩 품질 (없으면 설정값, 5 단위로 맞춰 캐시 개수 제한)
+
+        Returns:
+            (seq, bytes) - 인코딩 실패 시 bytes는 None, 프레임이 없으면 None
+        """
+        quality = self.config.quality if quality is None else max(10, min(100, int(round(quality / 5)) * 5))
+        with self._encode_lock:
+            with self._lock:
+                msg, seq = self._raw, self._raw_seq
+            if msg is None:
+                return None
+
+            if seq != self._encoded_seq:
+                self._encoded = {}
+                self._encoded_seq = seq
+            if quality not in self._encoded:
+                try:
+                    self._encoded[quality] = encode_image_msg(
+                        msg,
+                        fmt=self.config.format,
+                        quality=quality,
+                        max_width=self.config.max_width,
+                    )
+                    self._last_error = None
+                    self._frames_encoded += 1
+                except Exception as e:
+                    self._encoded[quality] = None
+                    self._last_error = str(e)
+
+            return self._encoded_seq, self._encoded[quality]
+
+    async def next_frame(self, after_seq: int, timeout: float = 5.0,
+                         quality: Optional[int] = None) -> Optional[Tuple[int, Optional[bytes]]]:
+        """
+        after_seq 이후의 최신 프레임 대기
+        중간 프레임은 건너뛰고 항상 가장 최신 프레임을 반환 (느린 클라이언트 프레임 드롭)
+        quality를 주면 그 품질로 인코딩 (대역폭 단계가 올라간 뷰어)
+
+        Returns:
+            (seq, bytes) 또는 timeout 시 None
+        """
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter = (loop, event)
+
+        with self._lock:
+            ready = self._raw_seq > after_seq
+            if not ready:
+                self._waiters.add(waiter)
+
+        try:
+            if not ready:
+                await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+        return await loop.run_in_executor(None, self.encode_latest, quality)
+
+    @contextmanager
+    def viewer(self):
+        """뷰어 수 집계"""
+        with self._lock:
+            self._viewers += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._viewers -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """스트림 상태"""
+        with self._lock:
+            return {
+                "name": self.config.name,
+                "topic": self.config.topic,
+                "msg_type": self.config.msg_type,
+                "format": self.config.format,
+                "quality": self.config.quality,
+                "max_width": self.config.max_width,
+                "max_fps": self.config.max_fps,
+                "available": self._raw is not None,
+                "viewers": self._viewers,
+                "frames_received": self._frames_received,
+                "frames_throttled": self._frames_throttled,
+                "frames_encoded": self._frames_encoded,
+                "last_error": self._last_error,
+            }
+
+
+# 릴레이할 수 있는 메시지 타입
+SUPPORTED_MSG_TYPES = ("sensor_msgs/msg/Image", "sensor_msgs/msg/CompressedImage")
+
+
+def _normalize_msg_type(msg_type: str) -> str:
+    """sensor_msgs/Image -> sensor_msgs/msg/Image"""
+    parts = msg_type.strip("/").split("/")
+    if len(parts) == 2:
+        parts = [parts[0], "msg", parts[1]]
+    return "/".join(parts)
+
+
+class ImageRelayService:
+    """이미지 릴레이 서비스"""
+
+    def __init__(self):
+        self._streams: Dict[str, ImageStream] = {}
+        self._errors: Dict[str, Dict[str, str]] = {}  # 구독하지 못한 설정 토픽 -> 이유
+
+    def start(self, image_topics: List[ImageStreamConfig] = None) -> bool:
+        """설정된 이미지 토픽 구독 (ROS 노드 시작 후 호출)"""
+        if not HAS_PIL:
+            print("Warning: numpy/Pillow not available. Image relay disabled.")
+            return False
+
+        if not ros_service.is_running:
+            return False
+
+        for stream_config in image_topics or []:
+            topic = stream_config.topic
+            if topic in self._streams:
+                continue
+            if _normalize_msg_type(stream_config.msg_type) not in SUPPORTED_MSG_TYPES:
+                error = f"Unsupported image message type: {stream_config.msg_type}"
+            else:
+                stream = ImageStream(stream_config)
+                if ros_service.subscribe_raw(topic, stream_config.msg_type, stream.on_message):
+                    self._streams[topic] = stream
+                    self._errors.pop(topic, None)
+                    continue
+                error = f"Unknown message type: {stream_config.msg_type}"
+            print(f"Warning: image stream {topic} disabled ({error})")
+            self._errors[topic] = {"name": stream_config.name, "topic": topic,
+                                   "msg_type": stream_config.msg_type, "error": error}
+
+        return True
+
+    def get_stream(self, topic: str) -> Optional[ImageStream]:
+        """토픽 이름으로 스트림 조회"""
+        topic = "/" + topic if not topic.startswith("/") else topic
+        return self._streams.get(topic)
+
+    def get_error(self, topic: str) -> Optional[str]:
+        """설정됐지만 구독하지 못한 토픽이면 그 이유"""
+        topic = "/" + topic if not topic.startswith("/") else topic
+        failed = self._errors.get(topic)
+        return failed["error"] if failed else None
+
+    def list_streams(self) -> List[Dict[str, Any]]:
+        """모든 스트림 상태"""
+        return [stream.get_stats() for stream in self._streams.values()]
+
+    def list_failed(self) -> List[Dict[str, str]]:
+        """구독하지 못한 설정 토픽 (메시지 타입 오류)"""
+        return list(self._errors.values())
+
+
+# 전역 인스턴스
+image_relay = ImageRelayService()
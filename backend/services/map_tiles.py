@@ -0,0 +1,174 @@
+"""
+Map Tile Service
+nav_msgs/OccupancyGrid를 고정 크기 타일로 나누고 타일별 해시로 변경 여부 추적
+클라이언트는 자신의 버전 이후 바뀐 타일만 PNG로 받음 (큰 맵도 WiFi로 전송 가능)
+"""
+import hashlib
+import io
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+# 이미지 처리 라이브러리 (없으면 맵 타일 비활성화)
+try:
+    import numpy as np
+    from PIL import Image as PILImage
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+from config import MapConfig
+from services.ros_subscriber import ros_service
+
+
+def _build_palette():
+    """셀 값(int8을 uint8로 본 값) -> 그레이스케일 (Nav2Viewer와 동일: unknown 회색, free 흰색)"""
+    lut = np.zeros(256, dtype=np.uint8)
+    for value in range(101):
+        lut[value] = 255 - round(value * 2.55)
+    lut[100 + 1:] = 128  # -1(255) 등 범위 밖 값은 unknown
+    return lut
+
+
+class MapTileService:
+    """OccupancyGrid 타일 캐시"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._config: Optional[MapConfig] = None
+        self._lut = None
+
+        self._grid = None  # (height, width) int8
+        self._info: Optional[Dict[str, Any]] = None
+
+        # version: 타일이 하나라도 바뀔 때마다 증가
+        # reset_version: 크기/해상도/원점이 바뀐 버전 (그 이전 버전 클라이언트는 전체 재요청)
+        self._version = 0
+        self._reset_version = 0
+
+        self._tile_hashes: Dict[Tuple[int, int], str] = {}
+        self._tile_versions: Dict[Tuple[int, int], int] = {}
+        self._png_cache: Dict[Tuple[int, int], Tuple[str, bytes]] = {}
+
+    def start(self, map_config: MapConfig) -> bool:
+        """맵 토픽 구독 (ROS 노드 시작 후 호출)"""
+        if not HAS_PIL:
+            print("Warning: numpy/Pillow not available. Map tiles disabled.")
+            return False
+
+        self._config = map_config
+        self._lut = _build_palette()
+        return ros_service.subscribe_raw(
+            map_config.topic, "nav_msgs/msg/OccupancyGrid", self.on_message, latched=map_config.latched
+        )
+
+    def on_message(self, msg):
+        """ROS 콜백 - 타일 해시 계산 후 바뀐 타일만 버전 갱신"""
+        info = msg.info
+        width, height = info.width, info.height
+        grid = np.frombuffer(msg.data, dtype=np.int8)
+        if grid.size != width * height:
+            return
+        grid = grid.reshape(height, width)
+
+        meta = {
+            "frame_id": msg.header.frame_id,
+            "width": width,
+            "height": height,
+            "resolution": info.resolution,
+            "origin": {
+                "position": {"x": info.origin.position.x, "y": info.origin.position.y, "z": info.origin.position.z},
+                "orientation": {
+                    "x": info.origin.orientation.x,
+                    "y": info.origin.orientation.y,
+                    "z": info.origin.orientation.z,
+                    "w": info.origin.orientation.w,
+                },
+            },
+        }
+
+        size = self._config.tile_size
+        hashes = {}
+        for ty in range(0, height, size):
+            for tx in range(0, width, size):
+                tile = grid[ty:ty + size, tx:tx + size]
+                hashes[(tx // size, ty // size)] = hashlib.blake2b(tile.tobytes(), digest_size=8).hexdigest()
+
+        with self._lock:
+            if meta != self._info:
+                self._version += 1
+                self._reset_version = self._version
+                self._tile_versions = {key: self._version for key in hashes}
+                self._png_cache.clear()
+            else:
+                changed = [key for key, h in hashes.items() if self._tile_hashes.get(key) != h]
+                if changed:
+                    self._version += 1
+                    for key in changed:
+                        self._tile_versions[key] = self._version
+                        self._png_cache.pop(key, None)
+
+            self._grid = grid
+            self._info = meta
+            self._tile_hashes = hashes
+
+    def get_tiles(self, since: int = 0) -> Dict[str, Any]:
+        """
+        since 버전 이후 변경된 타일 목록
+
+        Args:
+            since: 클라이언트가 가진 맵 버전 (0이면 전체)
+        """
+        with self._lock:
+            if self._grid is None:
+                return {"available": False, "version": 0}
+
+            full = since < self._reset_version
+            tiles = [
+                {"x": key[0], "y": key[1], "hash": self._tile_hashes[key], "version": version}
+                for key, version in self._tile_versions.items()
+                if full or version > since
+            ]
+            size = self._config.tile_size
+            return {
+                "available": True,
+                "version": self._version,
+                "full": full,
+                "tile_size": size,
+                "tiles_x": (self._info["width"] + size - 1) // size,
+                "tiles_y": (self._info["height"] + size - 1) // size,
+                **self._info,
+                "tiles": tiles,
+            }
+
+    def get_tile_png(self, tx: int, ty: int) -> Optional[Tuple[str, bytes]]:
+        """
+        타일 PNG (맵이 바뀌기 전까지 캐시)
+
+        Returns:
+            (hash, png bytes) 또는 타일이 없으면 None
+        """
+        key = (tx, ty)
+        with self._lock:
+            tile_hash = self._tile_hashes.get(key)
+            if tile_hash is None:
+                return None
+            cached = self._png_cache.get(key)
+            if cached and cached[0] == tile_hash:
+                return cached
+            grid = self._grid
+
+        size = self._config.tile_size
+        tile = grid[ty * size:(ty + 1) * size, tx * size:(tx + 1) * size]
+        out = io.BytesIO()
+        PILImage.fromarray(self._lut[tile.view(np.uint8)], mode="L").save(out, format="PNG", optimize=True)
+        entry = (tile_hash, out.getvalue())
+
+        with self._lock:
+            # 인코딩 중 맵이 바뀌었으면 캐시하지 않음
+            if self._tile_hashes.get(key) == tile_hash:
+                self._png_cache[key] = entry
+        return entry
+
+
+# 전역 인스턴스
+map_tiles = MapTileService()
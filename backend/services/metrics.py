@@ -0,0 +1,244 @@
+"""
+Metrics Service
+요청별 지연 히스토그램 + 내부 구간(span) 시간 + 스레드풀 대기 시간을 모아
+Prometheus text format으로 노출 (/api/metrics)
+외부 라이브러리 없이 고정 bucket 히스토그램만 구현
+"""
+import bisect
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Tuple
+
+# 초 단위 bucket (0.5ms ~ 10s)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """라벨별 누적 히스토그램"""
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # 라벨 값 -> [bucket별 개수(비누적) ..., +Inf 개수], 합계
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labelvalues: str):
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labelvalues] = series
+            series[0][idx] += 1
+            series[1][0] += value
+
+    @contextmanager
+    def time(self, *labelvalues: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = [(labels, list(counts), total[0]) for labels, (counts, total) in self._series.items()]
+        for labels, counts, total in sorted(series):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_labels_text(self.labelnames, labels, le)} {cumulative}")
+            cumulative += counts[-1]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels_text(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels_text(self.labelnames, labels)} {total:.6f}")
+            lines.append(f"{self.name}_count{_labels_text(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """읽을 때 콜백으로 값을 계산하는 gauge"""
+
+    def __init__(self, name: str, help_text: str, fn: Callable[[], float]):
+        self.name = name
+        self.help = help_text
+        self._fn = fn
+
+    def render(self) -> List[str]:
+        try:
+            value = float(self._fn())
+        except Exception:
+            return []
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge", f"{self.name} {value:g}"]
+
+
+class MetricsRegistry:
+    """메트릭 목록 + Prometheus text 출력"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def histogram(self, name: str, help_text: str, labelnames: Tuple[str, ...] = (),
+                  buckets=DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help_text, labelnames, buckets)
+            return self._metrics[name]
+
+    def gauge(self, name: str, help_text: str, fn: Callable[[], float]) -> Gauge:
+        with self._lock:
+            self._metrics[name] = Gauge(name, help_text, fn)
+            return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# 전역 인스턴스
+metrics = MetricsRegistry()
+
+REQUEST_LATENCY = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status"),
+)
+SPAN_LATENCY = metrics.histogram(
+    "backend_span_duration_seconds", "Time spent in instrumented backend operations", ("span",),
+)
+EXECUTOR_WAIT = metrics.histogram(
+    "backend_executor_queue_wait_seconds", "Time a run_in_executor job waited for a free worker thread",
+)
+
+
+def span(name: str):
+    """구간 시간 측정 (with span("ssh_command"): ...)"""
+    return SPAN_LATENCY.time(name)
+
+
+def timed(name: str, fn: Callable) -> Callable:
+    """함수 실행 시간을 span으로 기록하는 래퍼 (run_in_executor에 넘기는 동기 함수용)"""
+    def wrapper(*args, **kwargs):
+        with SPAN_LATENCY.time(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+# ============================================
+# HTTP 미들웨어 (ASGI)
+# ============================================
+
+class MetricsMiddleware:
+    """요청 처리 시간을 라우트 템플릿 기준으로 기록 (경로 파라미터별로 시계열이 늘어나지 않도록)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.observe(time.perf_counter() - start, scope["method"], route_template(scope), status[0])
+
+
+def route_template(scope) -> str:
+    """
+    요청 경로 -> 라우트 템플릿 (/api/pc/pc2/status -> /api/pc/{pc_id}/status)
+    include_router 방식에 따라 route.path에 prefix가 빠져 있을 수 있어 실제 경로에서 prefix를 복원
+    """
+    route = scope.get("route")
+    path_format = getattr(route, "path_format", None)
+    if not path_format:
+        return "unmatched"
+    try:
+        filled = path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return path_format
+    path = scope["path"]
+    if filled and path.endswith(filled):
+        return path[:len(path) - len(filled)] + path_format
+    return path_format
+
+
+# ============================================
+# 스레드풀 대기 시간 (loop 기본 executor 교체)
+# ============================================
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    """submit ~ 실제 실행 시작까지의 대기 시간 기록"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = 0
+        self._active = 0
+        self._count_lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        submitted = time.perf_counter()
+        with self._count_lock:
+            self._pending += 1
+
+        def _run():
+            EXECUTOR_WAIT.observe(time.perf_counter() - submitted)
+            with self._count_lock:
+                self._pending -= 1
+                self._active += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._count_lock:
+                    self._active -= 1
+
+        return super().submit(_run)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+
+def install_executor(loop) -> InstrumentedThreadPoolExecutor:
+    """이벤트 루프 기본 executor를 계측 executor로 교체 (lifespan에서 호출)"""
+    executor = InstrumentedThreadPoolExecutor(thread_name_prefix="backend-executor")
+    loop.set_default_executor(executor)
+    metrics.gauge("backend_executor_pending", "run_in_executor jobs waiting for a worker", lambda: executor.pending)
+    metrics.gauge("backend_executor_active", "run_in_executor jobs currently running", lambda: executor.active)
+    metrics.gauge("backend_executor_max_workers", "Worker threads in the default executor",
+                  lambda: executor._max_workers)
+    return executor
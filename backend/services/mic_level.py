@@ -0,0 +1,161 @@
+"""
+Mic Level Service
+PC2에서 arecord raw PCM을 SSH 채널 하나로 받아 채널별 RMS/peak 레벨을 계산
+(녹음 후 재생 테스트 대신 실시간 레벨 미터, 중간에 언제든 중지 가능)
+"""
+import array
+import asyncio
+import math
+import shlex
+import socket
+import sys
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+# 레벨 계산 (없으면 array 모듈로 계산)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+_FULL_SCALE = 32768.0
+_MIN_DB = -100.0
+
+
+def _to_db(value: float) -> float:
+    return round(20 * math.log10(value), 1) if value > 1e-5 else _MIN_DB
+
+
+def compute_levels(pcm: bytes, channels: int) -> Dict[str, List[float]]:
+    """S16_LE interleaved PCM -> 채널별 rms/peak (0~1)"""
+    frame_bytes = 2 * channels
+    pcm = pcm[:len(pcm) - len(pcm) % frame_bytes]
+    if not pcm:
+        return {"rms": [0.0] * channels, "peak": [0.0] * channels}
+
+    if HAS_NUMPY:
+        samples = np.frombuffer(pcm, dtype="<i2").reshape(-1, channels).astype(np.float32) / _FULL_SCALE
+        rms = np.sqrt(np.mean(samples * samples, axis=0))
+        peak = np.max(np.abs(samples), axis=0)
+        return {"rms": [round(float(v), 4) for v in rms], "peak": [round(float(v), 4) for v in peak]}
+
+    samples = array.array("h", pcm)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    rms, peak = [], []
+    for ch in range(channels):
+        values = samples[ch::channels]
+        rms.append(round(math.sqrt(sum(v * v for v in values) / len(values)) / _FULL_SCALE, 4))
+        peak.append(round(max(abs(v) for v in values) / _FULL_SCALE, 4))
+    return {"rms": rms, "peak": peak}
+
+
+class MicLevelStream:
+    """arecord 하나 -> 레벨 이벤트 스트림 (스레드에서 PCM 수신, asyncio 큐로 전달)"""
+
+    def __init__(self, transport_factory: Callable, device_id: str, rate: int = 16000, channels: int = 1,
+                 interval_sec: float = 0.1, max_sec: float = 60.0):
+        self.device_id = device_id
+        self.rate = rate
+        self.channels = channels
+        self.interval_sec = interval_sec
+        self.max_sec = max_sec
+        self._transport_factory = transport_factory
+        self._stop = threading.Event()
+        self._channel = None
+
+    @property
+    def command(self) -> str:
+        # hw: -> plughw: (포맷/채널 변환 허용), 원격에서도 max_sec 후 자동 종료
+        device = "plug" + self.device_id if self.device_id.startswith("hw:") else self.device_id
+        return (
+            f"timeout {int(math.ceil(self.max_sec))} "
+            f"arecord -q -D {shlex.quote(device)} -f S16_LE -r {self.rate} -c {self.channels} -t raw"
+        )
+
+    def stop(self):
+        """중지 (원격 arecord는 채널이 닫히면 SIGPIPE로 종료)"""
+        self._stop.set()
+        channel = self._channel
+        if channel is not None:
+            try:
+                channel.close()
+            except Exception:
+                pass
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    async def levels(self) -> AsyncIterator[Dict[str, Any]]:
+        """interval_sec마다 레벨 dict (느린 소비자는 오래된 레벨부터 버림)"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=10)
+
+        def _put(item):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(item)
+
+        def _emit(item):
+            try:
+                loop.call_soon_threadsafe(_put, item)
+            except RuntimeError:  # 이벤트 루프 종료됨
+                self._stop.set()
+
+        thread = threading.Thread(
+            target=self._read_loop, args=(_emit,), name=f"mic-level-{self.device_id}", daemon=True,
+        )
+        thread.start()
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                yield item
+        finally:
+            self.stop()
+
+    def _read_loop(self, emit: Callable[[Optional[Dict[str, Any]]], None]):
+        chunk_bytes = max(1, int(self.rate * self.interval_sec)) * self.channels * 2
+        buffer = bytearray()
+        start = time.monotonic()
+        try:
+            channel = self._transport_factory().open_session()
+            self._channel = channel
+            channel.settimeout(0.5)
+            channel.exec_command(self.command)
+
+            # 원격 timeout이 없거나 늦어도 max_sec에서 끝냄
+            while not self._stop.is_set() and time.monotonic() - start < self.max_sec:
+                try:
+                    data = channel.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    break
+                buffer.extend(data)
+                while len(buffer) >= chunk_bytes:
+                    chunk = bytes(buffer[:chunk_bytes])
+                    del buffer[:chunk_bytes]
+                    levels = compute_levels(chunk, self.channels)
+                    emit({
+                        "t": round(time.monotonic() - start, 2),
+                        **levels,
+                        "rms_db": [_to_db(v) for v in levels["rms"]],
+                        "peak_db": [_to_db(v) for v in levels["peak"]],
+                        "clipped": any(v >= 0.999 for v in levels["peak"]),
+                    })
+
+            if not self._stop.is_set() and channel.recv_stderr_ready():
+                error = channel.recv_stderr(4096).decode(errors="replace").strip()
+                if error:
+                    emit({"error": error})
+        except Exception as e:
+            if not self._stop.is_set():
+                emit({"error": str(e)})
+        finally:
+            self.stop()
+            emit(None)
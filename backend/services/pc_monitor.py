@@ -6,8 +6,9 @@ PC2: SSH를 통한 원격 조회
 import asyncio
 import json
 import subprocess
-from typing import Dict, Any, Optional
-from datetime import datetime
+import time
+from typing import Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta
 import psutil
 
 try:
@@ -17,14 +18,14 @@ except ImportError:
     HAS_PARAMIKO = False
 
 from config import PCConfig
+from services.metrics import timed
+from services.singleflight import single_flight
+from services.ssh_pool import ssh_pool
 
 
 class PCMonitorService:
     """PC 모니터링 서비스"""
     
-    def __init__(self):
-        self._ssh_clients: Dict[str, paramiko.SSHClient] = {} if HAS_PARAMIKO else {}
-    
     async def get_status(self, pc_config: PCConfig, is_local: bool = False) -> Dict[str, Any]:
         """
         PC 상태 조회
@@ -124,10 +125,27 @@ class PCMonitorService:
             return result
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _get_sync)
+        return await loop.run_in_executor(None, timed("pc_local_status", _get_sync))
     
     async def _get_remote_status(self, pc_config: PCConfig) -> Dict[str, Any]:
-        """원격 PC 상태 조회 (SSH)"""
+        """
+        원격 PC 상태 조회 (SSH)
+        캐시된 결과면 pc_time을 캐시 나이만큼 앞당겨서 시간 차이(time_diff_ms)가 틀어지지 않게 함
+        """
+        fetched_at, status = await self._fetch_remote_status(pc_config)
+        status = dict(status)
+        age = time.monotonic() - fetched_at
+        if status.get("pc_time") and age > 0:
+            try:
+                status["pc_time"] = (datetime.fromisoformat(status["pc_time"]) + timedelta(seconds=age)).isoformat()
+            except ValueError:
+                pass
+        return status
+
+    # 여러 탭이 동시에 폴링해도 SSH 스크립트는 한 번만 실행, 1초 동안 결과 재사용
+    @single_flight(ttl=1.0, key=lambda pc_config: (pc_config.ip, pc_config.port))
+    async def _fetch_remote_status(self, pc_config: PCConfig) -> Tuple[float, Dict[str, Any]]:
+        """원격 스크립트 실행 -> (받은 시각 monotonic, 결과)"""
         if not HAS_PARAMIKO:
             raise ImportError("paramiko is required for SSH. Install with: pip install paramiko")
         
@@ -230,60 +248,20 @@ print(json.dumps(result))
             error = stderr.read().decode().strip()
             
             if error and not output:
-                return {"error": error}
+                return time.monotonic(), {"error": error}
             
-            return json.loads(output) if output else {"error": "No output"}
+            return time.monotonic(), (json.loads(output) if output else {"error": "No output"})
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _get_sync)
+        return await loop.run_in_executor(None, timed("pc_remote_status", _get_sync))
     
     def _get_ssh_client(self, pc_config: PCConfig):
-        """SSH 클라이언트 생성 또는 재사용"""
-        key = f"{pc_config.ip}:{pc_config.port}"
-        
-        if key in self._ssh_clients:
-            client = self._ssh_clients[key]
-            if client.get_transport() and client.get_transport().is_active():
-                return client
-        
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        
-        if pc_config.ssh_key_path:
-            client.connect(
-                hostname=pc_config.ip,
-                port=pc_config.port,
-                username=pc_config.username,
-                key_filename=pc_config.ssh_key_path,
-                timeout=5,
-            )
-        elif pc_config.password:
-            client.connect(
-                hostname=pc_config.ip,
-                port=pc_config.port,
-                username=pc_config.username,
-                password=pc_config.password,
-                timeout=5,
-            )
-        else:
-            client.connect(
-                hostname=pc_config.ip,
-                port=pc_config.port,
-                username=pc_config.username,
-                timeout=5,
-            )
-        
-        self._ssh_clients[key] = client
-        return client
+        """SSH 클라이언트 (호스트별로 풀에서 재사용)"""
+        return ssh_pool.get(pc_config)
     
     def close_all(self):
         """모든 SSH 연결 종료"""
-        for client in self._ssh_clients.values():
-            try:
-                client.close()
-            except:
-                pass
-        self._ssh_clients.clear()
+        ssh_pool.close_all()
     
     async def get_processes(self, pc_config: PCConfig, is_local: bool = False, top_n: int = 10) -> list:
         """
@@ -322,7 +300,7 @@ print(json.dumps(result))
             return processes[:top_n]
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _get_sync)
+        return await loop.run_in_executor(None, timed("pc_local_processes", _get_sync))
     
     async def _get_remote_processes(self, pc_config: PCConfig, top_n: int = 10) -> list:
         """원격 PC 프로세스 목록 (SSH)"""
@@ -378,7 +356,7 @@ print(json.dumps(processes[:{top_n}]))
             return json.loads(output) if output else []
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _get_sync)
+        return await loop.run_in_executor(None, timed("pc_remote_processes", _get_sync))
 
     async def get_tegrastats_power(self, pc_config: PCConfig, duration_sec: int = 3) -> Dict[str, Any]:
         """
@@ -450,7 +428,7 @@ else:
             return {"error": "No tegrastats output"}
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _get_sync)
+        return await loop.run_in_executor(None, timed("tegrastats", _get_sync))
 
     async def get_network_interfaces(self, pc_config: PCConfig, is_local: bool = False) -> Dict[str, Any]:
         """
@@ -505,7 +483,7 @@ else:
             return {'interfaces': interfaces, 'timestamp': datetime.now().isoformat()}
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _get_sync)
+        return await loop.run_in_executor(None, timed("pc_local_network", _get_sync))
     
     async def _get_remote_network(self, pc_config: PCConfig) -> Dict[str, Any]:
         """원격 PC 네트워크 인터페이스 정보 (SSH)"""
@@ -565,5 +543,5 @@ print(json.dumps({'interfaces': interfaces, 'timestamp': datetime.now().isoforma
             return json.loads(output) if output else {"interfaces": []}
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _get_sync)
+        return await loop.run_in_executor(None, timed("pc_remote_network", _get_sync))
 
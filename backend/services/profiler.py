@@ -0,0 +1,171 @@
+"""
+Sampling Profiler Service
+실행 중인 Backend의 모든 스레드(이벤트 루프, ros-spin, executor 워커 등) 스택을
+주기적으로 샘플링하여 collapsed stack 형식(flamegraph.pl / speedscope 입력)으로 반환
+요청이 있을 때만 샘플링 스레드를 띄우므로 꺼져 있을 때 비용 없음 (재시작 불필요)
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, Any, Optional, Tuple
+
+# 스레드가 대기 중임을 뜻하는 leaf 프레임 (파일명, 함수명) - idle 샘플 제외용
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("base_events.py", "_run_once"),
+}
+
+MAX_SECONDS = 60.0
+MAX_HZ = 1000.0
+
+
+def _frame_label(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}".replace(";", ",")
+
+
+class SamplingProfiler:
+    """sys._current_frames() 기반 샘플링 프로파일러 (동시에 하나만 실행)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._labels: Dict[Any, str] = {}  # code 객체 -> 라벨 캐시
+
+    @property
+    def is_running(self) -> bool:
+        return self._lock.locked()
+
+    def run(self, seconds: float, hz: float = 100.0, include_idle: bool = False,
+            thread_filter: Optional[str] = None) -> Dict[str, Any]:
+        """
+        seconds 동안 hz 주기로 모든 스레드 스택 샘플링
+
+        Args:
+            include_idle: False면 대기 중(wait/select/queue.get)인 스레드 샘플 제외
+            thread_filter: 스레드 이름에 이 문자열이 포함된 스레드만
+
+        Raises:
+            RuntimeError: 이미 다른 프로파일이 실행 중일 때
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("Profiler is already running")
+        try:
+            return self._sample(min(seconds, MAX_SECONDS), min(max(hz, 1.0), MAX_HZ), include_idle, thread_filter)
+        finally:
+            self._labels.clear()
+            self._lock.release()
+
+    def _sample(self, seconds: float, hz: float, include_idle: bool,
+                thread_filter: Optional[str]) -> Dict[str, Any]:
+        interval = 1.0 / hz
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        thread_samples: Counter = Counter()
+        ticks = 0
+        overhead = 0.0
+
+        start = time.perf_counter()
+        next_time = start
+        while True:
+            now = time.perf_counter()
+            if now - start >= seconds:
+                break
+
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                name = names.get(ident, f"thread-{ident}")
+                if thread_filter and thread_filter not in name:
+                    continue
+                stack = self._walk(frame, include_idle)
+                if stack is None:
+                    continue
+                stacks[(name,) + stack] += 1
+                thread_samples[name] += 1
+            ticks += 1
+            overhead += time.perf_counter() - now
+
+            next_time += interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_time = time.perf_counter()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "duration_sec": round(elapsed, 3),
+            "hz": hz,
+            "ticks": ticks,
+            "overhead_pct": round(overhead / elapsed * 100, 2) if elapsed else 0.0,
+            "threads": dict(thread_samples.most_common()),
+            "stacks": stacks,
+        }
+
+    def _walk(self, frame, include_idle: bool) -> Optional[Tuple[str, ...]]:
+        """leaf -> root 프레임을 root -> leaf 라벨 튜플로 (idle이면 None)"""
+        if not include_idle:
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+                return None
+
+        labels = []
+        labels_cache = self._labels
+        while frame is not None:
+            code = frame.f_code
+            label = labels_cache.get(code)
+            if label is None:
+                label = _frame_label(code)
+                labels_cache[code] = label
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return tuple(labels)
+
+    async def run_async(self, seconds: float, hz: float = 100.0, include_idle: bool = False,
+                        thread_filter: Optional[str] = None) -> Dict[str, Any]:
+        """전용 스레드에서 샘플링 (executor 워커를 점유하지 않도록)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def _run():
+            try:
+                result = self.run(seconds, hz, include_idle, thread_filter)
+            except Exception as e:
+                loop.call_soon_threadsafe(future.set_exception, e)
+                return
+            loop.call_soon_threadsafe(future.set_result, result)
+
+        threading.Thread(target=_run, name="profiler", daemon=True).start()
+        return await future
+
+
+def to_collapsed(profile: Dict[str, Any]) -> str:
+    """flamegraph.pl collapsed 형식 (스레드;root;...;leaf count)"""
+    lines = [f"{';'.join(stack)} {count}" for stack, count in profile["stacks"].most_common()]
+    return "\n".join(lines) + "\n"
+
+
+def to_summary(profile: Dict[str, Any], top: int = 50) -> Dict[str, Any]:
+    """JSON 요약 (상위 스택 + leaf 함수별 self 샘플 수)"""
+    stacks: Counter = profile["stacks"]
+    leaves: Counter = Counter()
+    for stack, count in stacks.items():
+        leaves[stack[-1]] += count
+    return {
+        **{k: v for k, v in profile.items() if k != "stacks"},
+        "samples": sum(stacks.values()),
+        "top_self": [{"frame": frame, "samples": count} for frame, count in leaves.most_common(top)],
+        "top_stacks": [{"stack": ";".join(stack), "samples": count} for stack, count in stacks.most_common(top)],
+    }
+
+
+# 전역 인스턴스
+sampling_profiler = SamplingProfiler()
@@ -0,0 +1,315 @@
+"""
+ROS Stand-in Service
+ROS2가 없는 PC에서 RosService를 부하 테스트/프로파일링하기 위한 가상 publisher
+JointState, Imu, TFMessage, DiagnosticArray, LaserScan, BatteryState를 설정한 주기/크기로 만들어
+실제 노드와 같은 구독 -> 변환(_msg_to_dict) -> TopicStore 경로로 전달
+"""
+import array
+import math
+import random
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from config import StandinStreamConfig
+from services.ros_subscriber import TopicSubscriberMixin, TopicStore, get_msg_type
+
+
+# ============================================
+# 가상 메시지 (rclpy 메시지처럼 get_fields_and_field_types 제공)
+# ============================================
+
+class _Msg:
+    """ROS 메시지 흉내"""
+    _fields: Dict[str, str] = {}
+
+    def __init__(self, **kwargs):
+        for field in self._fields:
+            setattr(self, field, kwargs.get(field))
+
+    @classmethod
+    def get_fields_and_field_types(cls) -> Dict[str, str]:
+        return dict(cls._fields)
+
+
+def _msg_class(name: str, fields: Dict[str, str]):
+    return type(name, (_Msg,), {"_fields": fields})
+
+
+Time = _msg_class("Time", {"sec": "int32", "nanosec": "uint32"})
+Header = _msg_class("Header", {"stamp": "builtin_interfaces/Time", "frame_id": "string"})
+Vector3 = _msg_class("Vector3", {"x": "double", "y": "double", "z": "double"})
+Quaternion = _msg_class("Quaternion", {"x": "double", "y": "double", "z": "double", "w": "double"})
+Transform = _msg_class("Transform", {"translation": "geometry_msgs/Vector3", "rotation": "geometry_msgs/Quaternion"})
+TransformStamped = _msg_class("TransformStamped", {
+    "header": "std_msgs/Header", "child_frame_id": "string", "transform": "geometry_msgs/Transform",
+})
+TFMessage = _msg_class("TFMessage", {"transforms": "sequence<geometry_msgs/TransformStamped>"})
+JointState = _msg_class("JointState", {
+    "header": "std_msgs/Header", "name": "sequence<string>",
+    "position": "sequence<double>", "velocity": "sequence<double>", "effort": "sequence<double>",
+})
+Imu = _msg_class("Imu", {
+    "header": "std_msgs/Header",
+    "orientation": "geometry_msgs/Quaternion", "orientation_covariance": "double[9]",
+    "angular_velocity": "geometry_msgs/Vector3", "angular_velocity_covariance": "double[9]",
+    "linear_acceleration": "geometry_msgs/Vector3", "linear_acceleration_covariance": "double[9]",
+})
+LaserScan = _msg_class("LaserScan", {
+    "header": "std_msgs/Header", "angle_min": "float", "angle_max": "float", "angle_increment": "float",
+    "time_increment": "float", "scan_time": "float", "range_min": "float", "range_max": "float",
+    "ranges": "sequence<float>", "intensities": "sequence<float>",
+})
+BatteryState = _msg_class("BatteryState", {
+    "header": "std_msgs/Header", "voltage": "float", "current": "float", "charge": "float",
+    "capacity": "float", "percentage": "float", "power_supply_status": "uint8", "present": "boolean",
+})
+KeyValue = _msg_class("KeyValue", {"key": "string", "value": "string"})
+DiagnosticStatus = _msg_class("DiagnosticStatus", {
+    "level": "byte", "name": "string", "message": "string", "hardware_id": "string",
+    "values": "sequence<diagnostic_msgs/KeyValue>",
+})
+DiagnosticArray = _msg_class("DiagnosticArray", {
+    "header": "std_msgs/Header", "status": "sequence<diagnostic_msgs/DiagnosticStatus>",
+})
+
+STANDIN_MSG_TYPES = {
+    "sensor_msgs/msg/JointState": JointState,
+    "sensor_msgs/msg/Imu": Imu,
+    "sensor_msgs/msg/LaserScan": LaserScan,
+    "sensor_msgs/msg/BatteryState": BatteryState,
+    "tf2_msgs/msg/TFMessage": TFMessage,
+    "diagnostic_msgs/msg/DiagnosticArray": DiagnosticArray,
+}
+
+
+def _header(frame_id: str = "") -> Header:
+    now = time.time()
+    sec = int(now)
+    return Header(stamp=Time(sec=sec, nanosec=int((now - sec) * 1e9)), frame_id=frame_id)
+
+
+def _quat_yaw(yaw: float) -> Quaternion:
+    return Quaternion(x=0.0, y=0.0, z=math.sin(yaw / 2), w=math.cos(yaw / 2))
+
+
+# ============================================
+# 타입별 메시지 생성기 (seq: 발행 순번, size: 타입별 크기)
+# ============================================
+
+def make_joint_state(seq: int, size: int) -> JointState:
+    size = size or 30
+    t = seq * 0.01
+    return JointState(
+        header=_header(),
+        name=[f"joint_{i}" for i in range(size)],
+        position=array.array("d", (math.sin(t + i) for i in range(size))),
+        velocity=array.array("d", (math.cos(t + i) for i in range(size))),
+        effort=array.array("d", [0.0] * size),
+    )
+
+
+def make_imu(seq: int, size: int) -> Imu:
+    t = seq * 0.01
+    return Imu(
+        header=_header("imu_link"),
+        orientation=_quat_yaw(t),
+        orientation_covariance=array.array("d", [0.0] * 9),
+        angular_velocity=Vector3(x=0.0, y=0.0, z=math.cos(t)),
+        angular_velocity_covariance=array.array("d", [0.0] * 9),
+        linear_acceleration=Vector3(x=random.gauss(0, 0.05), y=random.gauss(0, 0.05), z=9.81),
+        linear_acceleration_covariance=array.array("d", [0.0] * 9),
+    )
+
+
+def make_tf(seq: int, size: int) -> TFMessage:
+    """map -> odom -> base_link -> link_0 -> ... (size개 프레임)"""
+    size = size or 10
+    t = seq * 0.01
+    frames = ["map", "odom", "base_link"] + [f"link_{i}" for i in range(max(0, size - 2))]
+    transforms = []
+    for i in range(size):
+        transforms.append(TransformStamped(
+            header=_header(frames[i]),
+            child_frame_id=frames[i + 1],
+            transform=Transform(
+                translation=Vector3(x=0.1 * math.cos(t + i), y=0.1 * math.sin(t + i), z=0.05),
+                rotation=_quat_yaw(0.1 * math.sin(t + i)),
+            ),
+        ))
+    return TFMessage(transforms=transforms)
+
+
+def make_laser_scan(seq: int, size: int) -> LaserScan:
+    size = size or 1080
+    increment = 2 * math.pi / size
+    return LaserScan(
+        header=_header("laser"),
+        angle_min=-math.pi, angle_max=math.pi, angle_increment=increment,
+        time_increment=0.0, scan_time=0.1, range_min=0.05, range_max=30.0,
+        ranges=array.array("f", (5.0 + math.sin(i * increment * 4 + seq * 0.05) for i in range(size))),
+        intensities=array.array("f", [100.0] * size),
+    )
+
+
+def make_battery_state(seq: int, size: int) -> BatteryState:
+    percentage = max(0.0, 1.0 - (seq % 36000) / 36000)
+    return BatteryState(
+        header=_header(), voltage=22.0 + 3.0 * percentage, current=-2.5, charge=percentage * 20.0,
+        capacity=20.0, percentage=percentage, power_supply_status=2, present=True,
+    )
+
+
+def make_diagnostic_array(seq: int, size: int) -> DiagnosticArray:
+    """size개 컴포넌트, 가끔 level이 바뀜 (전이 기록 부하용)"""
+    size = size or 50
+    statuses = []
+    for i in range(size):
+        level = 0
+        if random.random() < 0.02:
+            level = random.choice((1, 2))
+        statuses.append(DiagnosticStatus(
+            level=bytes([level]),
+            name=f"standin: component_{i}",
+            message="OK" if level == 0 else "synthetic fault",
+            hardware_id=f"hw_{i % 8}",
+            values=[KeyValue(key="seq", value=str(seq)), KeyValue(key="index", value=str(i))],
+        ))
+    return DiagnosticArray(header=_header(), status=statuses)
+
+
+MSG_FACTORIES = {
+    "sensor_msgs/msg/JointState": make_joint_state,
+    "sensor_msgs/msg/Imu": make_imu,
+    "sensor_msgs/msg/LaserScan": make_laser_scan,
+    "sensor_msgs/msg/BatteryState": make_battery_state,
+    "tf2_msgs/msg/TFMessage": make_tf,
+    "diagnostic_msgs/msg/DiagnosticArray": make_diagnostic_array,
+}
+
+
+# ============================================
+# Stand-in 노드 (rclpy Node 대신 사용)
+# ============================================
+
+class _Logger:
+    def info(self, msg):
+        print(f"[standin] {msg}")
+
+    def warn(self, msg):
+        print(f"[standin] Warning: {msg}")
+
+
+class _Subscription:
+    __slots__ = ("topic", "callback")
+
+    def __init__(self, topic: str, callback):
+        self.topic = topic
+        self.callback = callback
+
+
+class _StandinRuntime:
+    """rclpy Node 대체 (구독/타이머만 구현, 콜백은 publisher 스레드에서 실행)"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._subs_lock = threading.Lock()
+        self._subs: Dict[str, List[_Subscription]] = {}
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._logger = _Logger()
+
+    def get_logger(self):
+        return self._logger
+
+    def create_subscription(self, msg_type, topic: str, callback, qos, callback_group=None):
+        sub = _Subscription(topic, callback)
+        with self._subs_lock:
+            self._subs[topic] = self._subs.get(topic, []) + [sub]
+        return sub
+
+    def destroy_subscription(self, sub: _Subscription):
+        with self._subs_lock:
+            self._subs[sub.topic] = [s for s in self._subs.get(sub.topic, []) if s is not sub]
+
+    def create_timer(self, period_sec: float, callback, callback_group=None):
+        def _run():
+            while not self._stop.wait(period_sec):
+                callback()
+        thread = threading.Thread(target=_run, name=f"standin-timer-{len(self._threads)}", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        return thread
+
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._subs.get(topic))
+
+    def dispatch(self, topic: str, msg):
+        """구독자 콜백 호출 (실제 executor처럼 콜백 예외는 로그만)"""
+        for sub in self._subs.get(topic, []):
+            try:
+                sub.callback(msg)
+            except Exception as e:
+                self._logger.warn(f"callback for {topic} failed: {e}")
+
+    def destroy_node(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+
+
+class StandinNode(TopicSubscriberMixin, _StandinRuntime):
+    """가상 publisher를 가진 stand-in 노드"""
+
+    def __init__(self, store: TopicStore, streams: List[StandinStreamConfig], high_rate_hz: float = 5.0):
+        super().__init__(store, high_rate_hz=high_rate_hz)
+        self._streams = streams
+        self._stats: Dict[str, Dict[str, Any]] = {}
+
+    def _make_qos(self, reliability: str = "best_effort", durability: str = "volatile", depth: int = 1):
+        return {"reliability": reliability, "durability": durability, "depth": depth}
+
+    def _new_callback_group(self, exclusive: bool = True):
+        return None
+
+    def _resolve_msg_type(self, msg_type_str: str):
+        # 가상 타입이 없으면 설치된 실제 타입, 그래도 없으면 발행되지 않는 빈 타입으로 구독만 허용
+        return STANDIN_MSG_TYPES.get(msg_type_str) or get_msg_type(msg_type_str) or _Msg
+
+    def start_publishers(self):
+        """스트림별 publisher 스레드 시작"""
+        for stream in self._streams:
+            factory = MSG_FACTORIES.get(stream.msg_type)
+            if not factory or stream.rate_hz <= 0:
+                self._logger.warn(f"Unsupported stand-in stream: {stream.topic} ({stream.msg_type})")
+                continue
+            stats = {"topic": stream.topic, "msg_type": stream.msg_type, "rate_hz": stream.rate_hz,
+                     "size": stream.size, "published": 0, "overruns": 0}
+            self._stats[stream.topic] = stats
+            thread = threading.Thread(target=self._publish_loop, args=(stream, factory, stats),
+                                      name=f"standin-pub{stream.topic}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            self._logger.info(f"Publishing {stream.topic} at {stream.rate_hz:g} Hz (size={stream.size})")
+
+    def _publish_loop(self, stream: StandinStreamConfig, factory, stats: Dict[str, Any]):
+        interval = 1.0 / stream.rate_hz
+        next_time = time.perf_counter()
+        seq = 0
+        while not self._stop.is_set():
+            seq += 1
+            # 구독자가 없으면 메시지를 만들지 않음 (DDS와 동일하게 비용 없음)
+            if self.has_subscribers(stream.topic):
+                self.dispatch(stream.topic, factory(seq, stream.size))
+                stats["published"] += 1
+
+            next_time += interval
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                stats["overruns"] += 1
+                next_time = time.perf_counter()
+
+    def get_publisher_stats(self) -> List[Dict[str, Any]]:
+        return [dict(stats) for stats in self._stats.values()]
@@ -3,8 +3,11 @@ ROS2 Subscriber Service
 rclpy를 사용하여 ROS2 토픽 구독하고 최신 데이터 저장
 (Frontend에서 rosbridge 사용 안 함 - WiFi 부하 감소)
 """
+import importlib
 import threading
-from typing import Dict, Any, Optional, Callable
+from abc import ABC, abstractmethod
+import time
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 import json
 
@@ -13,93 +16,312 @@ try:
     import rclpy
     from rclpy.node import Node
     from rclpy.executors import MultiThreadedExecutor
-    from rclpy.qos import QoSProfile, ReliabilityPolicy, HistoryPolicy
+    from rclpy.callback_groups import MutuallyExclusiveCallbackGroup, ReentrantCallbackGroup
+    from rclpy.qos import QoSProfile, ReliabilityPolicy, HistoryPolicy, DurabilityPolicy
     HAS_RCLPY = True
 except ImportError:
     HAS_RCLPY = False
     Node = object
 
-# 메시지 타입 임포트
-MSG_TYPES = {}
-if HAS_RCLPY:
+from services.metrics import span
+
+# 메시지 타입 캐시 ("pkg/msg/Type" -> 클래스)
+# 처음 요청될 때 rosidl 런타임으로 임포트 (사용하지 않는 메시지 패키지는 임포트하지 않음)
+MSG_TYPES: Dict[str, Any] = {}
+_msg_types_lock = threading.Lock()
+
+try:
+    from rosidl_runtime_py.utilities import get_message as _rosidl_get_message
+except ImportError:
+    _rosidl_get_message = None
+
+# 정수로 내보낼 byte 필드 (메시지 클래스 이름, 필드) - 나머지 byte 필드는 "<bytes len=N>"
+_BYTE_INT_FIELDS = {("DiagnosticStatus", "level")}
+
+
+def get_msg_type(msg_type_str: str):
+    """
+    메시지 타입 문자열로 메시지 클래스 조회 (설치된 모든 타입 지원)
+
+    Args:
+        msg_type_str: "sensor_msgs/msg/Image" 또는 "sensor_msgs/Image"
+
+    Returns:
+        메시지 클래스, 찾을 수 없으면 None
+    """
+    msg_type = MSG_TYPES.get(msg_type_str)
+    if msg_type is not None:
+        return msg_type
+    if not HAS_RCLPY:
+        return None
+
+    parts = msg_type_str.strip("/").split("/")
+    if len(parts) == 2:
+        parts = [parts[0], "msg", parts[1]]
+    if len(parts) != 3 or parts[1] != "msg" or not all(parts):
+        return None
+
     try:
-        from sensor_msgs.msg import JointState, BatteryState, Imu, LaserScan, PointCloud2, Image
-        from geometry_msgs.msg import Twist, PoseStamped, WrenchStamped
-        from std_msgs.msg import String, Float32, Int32
-        from nav_msgs.msg import Odometry, OccupancyGrid, Path
-        from diagnostic_msgs.msg import DiagnosticArray
-        from tf2_msgs.msg import TFMessage
-        
-        MSG_TYPES = {
-            "sensor_msgs/msg/JointState": JointState,
-            "sensor_msgs/msg/BatteryState": BatteryState,
-            "sensor_msgs/msg/Imu": Imu,
-            "sensor_msgs/msg/LaserScan": LaserScan,
-            "sensor_msgs/msg/PointCloud2": PointCloud2,
-            "sensor_msgs/msg/Image": Image,
-            "geometry_msgs/msg/Twist": Twist,
-            "geometry_msgs/msg/PoseStamped": PoseStamped,
-            "geometry_msgs/msg/WrenchStamped": WrenchStamped,
-            "std_msgs/msg/String": String,
-            "std_msgs/msg/Float32": Float32,
-            "std_msgs/msg/Int32": Int32,
-            "nav_msgs/msg/Odometry": Odometry,
-            "nav_msgs/msg/OccupancyGrid": OccupancyGrid,
-            "nav_msgs/msg/Path": Path,
-            "diagnostic_msgs/msg/DiagnosticArray": DiagnosticArray,
-            "tf2_msgs/msg/TFMessage": TFMessage,
-        }
-    except ImportError as e:
-        print(f"Warning: Some ROS2 message types not available: {e}")
+        if _rosidl_get_message:
+            msg_type = _rosidl_get_message("/".join(parts))
+        else:
+            module = importlib.import_module(f"{parts[0]}.msg")
+            msg_type = getattr(module, parts[2])
+    except (ImportError, AttributeError, ValueError):
+        return None
 
+    with _msg_types_lock:
+        MSG_TYPES[msg_type_str] = msg_type
+    return msg_type
 
-class RosSubscriberNode(Node):
-    """ROS2 토픽 구독 노드"""
+
+class TopicStore:
+    """
+    토픽별 최신 값 저장소 (copy-on-write 스냅샷)
+    - writer: 새 레코드를 넣은 새 dict를 만들어 참조를 한 번에 교체 (writer끼리만 짧은 락)
+    - reader: 현재 스냅샷 참조를 그대로 가져감 (락/복사 없음)
+    레코드와 스냅샷은 발행 후 절대 수정하지 않으므로 반환값은 읽기 전용으로 사용해야 함
+    """
     
     def __init__(self):
+        self._snapshot: Dict[str, Dict[str, Any]] = {}
+        self._write_lock = threading.Lock()
+        self._listeners: List[Callable[[str, Optional[Dict[str, Any]]], None]] = []
+    
+    def add_listener(self, listener: Callable[[str, Optional[Dict[str, Any]]], None]):
+        """발행/삭제 알림 등록 (listener(topic, record), 삭제 시 record=None)"""
+        self._listeners.append(listener)
+    
+    def publish(self, topic: str, record: Dict[str, Any]):
+        """토픽 레코드 발행"""
+        with self._write_lock:
+            snapshot = dict(self._snapshot)
+            snapshot[topic] = record
+            self._snapshot = snapshot
+        self._notify(topic, record)
+    
+    def remove(self, topic: str):
+        """토픽 레코드 삭제"""
+        with self._write_lock:
+            if topic not in self._snapshot:
+                return
+            snapshot = dict(self._snapshot)
+            del snapshot[topic]
+            self._snapshot = snapshot
+        self._notify(topic, None)
+    
+    def _notify(self, topic: str, record: Optional[Dict[str, Any]]):
+        for listener in self._listeners:
+            try:
+                listener(topic, record)
+            except Exception as e:
+                print(f"Warning: topic listener failed for {topic}: {e}")
+    
+    def get(self, topic: str) -> Optional[Dict[str, Any]]:
+        return self._snapshot.get(topic)
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return self._snapshot
+
+
+class TopicSubscriberMixin(ABC):
+    """
+    토픽 구독/변환/캐시 로직
+    rclpy Node(RosSubscriberNode) 또는 stand-in 런타임(services/ros_standin.py)과 조합해서 사용
+    QoS, callback group 생성은 조합하는 쪽에서 구현 (빠뜨리면 인스턴스 생성 시 TypeError)
+    """
+    
+    def __init__(self, store: TopicStore, high_rate_hz: float = 5.0):
         super().__init__('web_ui_backend')
-        self._topic_data: Dict[str, Dict[str, Any]] = {}
+        self._store = store
         self._subscribers = {}
-        self._lock = threading.Lock()
+        self._raw_subscribers = {}
+        self._sub_info: Dict[str, Dict[str, Any]] = {}
+        # _subscribers/_sub_info는 HTTP 스레드(추가/해제)와 idle 정리 타이머(executor 스레드)가 같이 변경
+        self._subs_lock = threading.RLock()
+        
+        # Callback group
+        # - 고주기 토픽 (throttle_hz >= high_rate_hz 또는 제한 없음)과 raw 구독: 토픽마다 전용 그룹
+        #   (한 토픽의 버스트가 executor 스레드를 최대 1개만 점유)
+        # - 저주기 토픽과 타이머: 공용 Reentrant 그룹
+        self._high_rate_hz = high_rate_hz
+        self._low_rate_group = self._new_callback_group(exclusive=False)
         
         # QoS 설정
-        self._qos = QoSProfile(
-            reliability=ReliabilityPolicy.BEST_EFFORT,
-            history=HistoryPolicy.KEEP_LAST,
-            depth=1
-        )
+        self._qos = self._make_qos("best_effort", "volatile", 1)
+        
+        # Latched 토픽용 QoS (/map 등 TRANSIENT_LOCAL로 한 번만 발행되는 토픽)
+        self._latched_qos = self._make_qos("reliable", "transient_local", 1)
+        
+        # idle 구독 정리 타이머
+        self._reaper = self.create_timer(5.0, self._reap_idle_subscriptions, callback_group=self._low_rate_group)
     
-    def subscribe_topic(self, topic: str, msg_type_str: str):
-        """토픽 구독 시작"""
-        if topic in self._subscribers:
-            return
+    def _callback_group_for(self, rate_hz: float):
+        """구독 주기에 맞는 callback group"""
+        if rate_hz <= 0 or rate_hz >= self._high_rate_hz:
+            return self._new_callback_group(exclusive=True)
+        return self._low_rate_group
+    
+    @abstractmethod
+    def _make_qos(self, reliability: str = "best_effort", durability: str = "volatile", depth: int = 1):
+        """구독별 QoS 생성"""
+    
+    @abstractmethod
+    def _new_callback_group(self, exclusive: bool = True):
+        """callback group 생성 (exclusive=False면 Reentrant)"""
+    
+    def _resolve_msg_type(self, msg_type_str: str):
+        """메시지 타입 문자열 -> 메시지 클래스"""
+        return get_msg_type(msg_type_str)
+    
+    def subscribe_topic(self, topic: str, msg_type_str: str, throttle_hz: float = 0.0,
+                        reliability: str = "best_effort", durability: str = "volatile", depth: int = 1,
+                        idle_timeout_sec: float = 0.0, name: Optional[str] = None) -> bool:
+        """
+        토픽 구독 시작
         
-        msg_type = MSG_TYPES.get(msg_type_str)
+        Args:
+            name: 표시용 이름 (없으면 토픽 이름)
+            throttle_hz: 0보다 크면 이 주기보다 빠른 메시지는 변환하지 않고 버림
+            idle_timeout_sec: 0보다 크면 이 시간 동안 읽는 클라이언트가 없을 때 자동 구독 해제
+        
+        이미 구독 중인 토픽은 타입/QoS/주기가 같으면 이름과 idle_timeout_sec만 갱신, 다르면 다시 구독
+        """
+        msg_type = self._resolve_msg_type(msg_type_str)
         if not msg_type:
             self.get_logger().warn(f"Unknown message type: {msg_type_str}")
-            return
+            return False
+        
+        settings = {
+            "msg_type": msg_type_str,
+            "throttle_hz": throttle_hz,
+            "reliability": reliability,
+            "durability": durability,
+            "depth": depth,
+        }
+        with self._subs_lock:
+            current = self._sub_info.get(topic)
+            if current is not None:
+                if all(current[k] == v for k, v in settings.items()):
+                    current["name"] = name or topic
+                    current["idle_timeout_sec"] = idle_timeout_sec
+                    current["_last_read"] = time.monotonic()
+                    return True
+                self.get_logger().info(f"Resubscribing {topic} with new settings")
+                self.unsubscribe_topic(topic)
+            self._create_topic_subscription(topic, msg_type, msg_type_str, throttle_hz, reliability,
+                                            durability, depth, idle_timeout_sec, name)
+        return True
+    
+    def _create_topic_subscription(self, topic: str, msg_type, msg_type_str: str, throttle_hz: float,
+                                   reliability: str, durability: str, depth: int, idle_timeout_sec: float,
+                                   name: Optional[str]):
+        """구독 생성 + 등록 (_subs_lock 안에서 호출)"""
+        min_interval = 1.0 / throttle_hz if throttle_hz > 0 else 0.0
+        info = {
+            "name": name or topic,
+            "topic": topic,
+            "msg_type": msg_type_str,
+            "throttle_hz": throttle_hz,
+            "reliability": reliability,
+            "durability": durability,
+            "depth": depth,
+            "idle_timeout_sec": idle_timeout_sec,
+            "subscribed_at": datetime.now().isoformat(),
+            "received": 0,
+            "throttled": 0,
+            "_last_msg": 0.0,
+            "_last_read": time.monotonic(),
+        }
         
         def callback(msg):
-            with self._lock:
-                self._topic_data[topic] = {
-                    "timestamp": datetime.now().isoformat(),
-                    "data": self._msg_to_dict(msg),
-                    "msg_type": msg_type_str,
-                }
-        
-        sub = self.create_subscription(msg_type, topic, callback, self._qos)
+            now = time.monotonic()
+            if now - info["_last_msg"] < min_interval:
+                info["throttled"] += 1
+                return
+            info["_last_msg"] = now
+            info["received"] += 1
+            with span("ros_msg_to_dict"):
+                data = self._msg_to_dict(msg)
+            self._store.publish(topic, {
+                "timestamp": datetime.now().isoformat(),
+                "data": data,
+                "msg_type": msg_type_str,
+            })
+        
+        qos = self._make_qos(reliability, durability, depth)
+        group = self._callback_group_for(throttle_hz)
+        sub = self.create_subscription(msg_type, topic, callback, qos, callback_group=group)
         self._subscribers[topic] = sub
+        self._sub_info[topic] = info
         self.get_logger().info(f"Subscribed to {topic}")
     
-    def get_topic_data(self, topic: str) -> Optional[Dict[str, Any]]:
-        """토픽 최신 데이터 가져오기"""
-        with self._lock:
-            return self._topic_data.get(topic)
+    def unsubscribe_topic(self, topic: str) -> bool:
+        """토픽 구독 해제 (캐시된 데이터도 삭제)"""
+        with self._subs_lock:
+            sub = self._subscribers.pop(topic, None)
+            if sub is None:
+                return False
+            
+            self.destroy_subscription(sub)
+            self._sub_info.pop(topic, None)
+            self._store.remove(topic)
+        self.get_logger().info(f"Unsubscribed from {topic}")
+        return True
+    
+    def get_subscriptions(self) -> List[Dict[str, Any]]:
+        """현재 구독 목록 (QoS, 주기, 마지막 읽기 이후 경과 시간)"""
+        now = time.monotonic()
+        result = []
+        with self._subs_lock:
+            infos = list(self._sub_info.values())
+        for info in infos:
+            item = {k: v for k, v in info.items() if not k.startswith("_")}
+            item["idle_sec"] = round(now - info["_last_read"], 1)
+            result.append(item)
+        return result
+    
+    def _reap_idle_subscriptions(self):
+        """읽는 클라이언트가 없는 구독 자동 해제 (ROS 타이머)"""
+        with self._subs_lock:
+            now = time.monotonic()
+            for topic, info in list(self._sub_info.items()):
+                timeout = info["idle_timeout_sec"]
+                if timeout > 0 and now - info["_last_read"] > timeout:
+                    self.get_logger().info(f"Dropping idle subscription {topic}")
+                    self.unsubscribe_topic(topic)
+    
+    def subscribe_raw(self, topic: str, msg_type_str: str, callback: Callable[[Any], None], latched: bool = False) -> bool:
+        """
+        원본 메시지 구독 (dict 변환 없이 콜백으로 전달)
+        이미지, 맵처럼 큰 메시지는 _msg_to_dict를 거치지 않고 서비스에서 직접 처리
+        
+        Returns:
+            구독 중이면 True, 메시지 타입을 찾을 수 없으면 False
+        """
+        if topic in self._raw_subscribers:
+            return True
+        
+        msg_type = self._resolve_msg_type(msg_type_str)
+        if not msg_type:
+            self.get_logger().warn(f"Unknown message type: {msg_type_str}")
+            return False
+        
+        # raw 구독은 무거운 처리(인코딩, 타일 해시 등)를 하므로 항상 전용 그룹
+        qos = self._latched_qos if latched else self._qos
+        sub = self.create_subscription(msg_type, topic, callback, qos, callback_group=self._new_callback_group(exclusive=True))
+        self._raw_subscribers[topic] = sub
+        self.get_logger().info(f"Subscribed to {topic} (raw)")
+        return True
     
-    def get_all_topics_data(self) -> Dict[str, Dict[str, Any]]:
-        """모든 토픽 데이터 가져오기"""
-        with self._lock:
-            return dict(self._topic_data)
+    def mark_read(self, topics):
+        """클라이언트가 읽은 토픽 기록 (idle 자동 해제 판단용)"""
+        now = time.monotonic()
+        with self._subs_lock:
+            for topic in topics:
+                info = self._sub_info.get(topic)
+                if info:
+                    info["_last_read"] = now
     
     def _msg_to_dict(self, msg) -> Dict[str, Any]:
         """ROS 메시지를 딕셔너리로 변환"""
@@ -111,7 +333,10 @@ class RosSubscriberNode(Node):
             for field in msg.get_fields_and_field_types().keys():
                 try:
                     value = getattr(msg, field)
-                    result[field] = self._value_to_dict(value)
+                    if (type(msg).__name__, field) in _BYTE_INT_FIELDS and isinstance(value, bytes) and len(value) == 1:
+                        result[field] = value[0]
+                    else:
+                        result[field] = self._value_to_dict(value)
                 except Exception as e:
                     result[field] = f"<error: {str(e)}>"
         except Exception as e:
@@ -163,6 +388,21 @@ class RosSubscriberNode(Node):
         return str(value)
 
 
+class RosSubscriberNode(TopicSubscriberMixin, Node):
+    """ROS2 토픽 구독 노드"""
+    
+    def _make_qos(self, reliability: str = "best_effort", durability: str = "volatile", depth: int = 1):
+        return QoSProfile(
+            reliability=ReliabilityPolicy.RELIABLE if reliability == "reliable" else ReliabilityPolicy.BEST_EFFORT,
+            durability=DurabilityPolicy.TRANSIENT_LOCAL if durability == "transient_local" else DurabilityPolicy.VOLATILE,
+            history=HistoryPolicy.KEEP_LAST,
+            depth=max(1, depth),
+        )
+    
+    def _new_callback_group(self, exclusive: bool = True):
+        return MutuallyExclusiveCallbackGroup() if exclusive else ReentrantCallbackGroup()
+
+
 class RosService:
     """ROS2 서비스 (싱글톤)"""
     _instance = None
@@ -178,13 +418,26 @@ class RosService:
             return
         
         self._node: Optional[RosSubscriberNode] = None
+        self._store = TopicStore()
         self._executor = None
         self._thread = None
         self._running = False
+        self._standin = False
         self._initialized = True
     
-    def start(self, topics: list = None):
-        """ROS2 노드 시작"""
+    def start(self, topics: list = None, num_threads: Optional[int] = None, high_rate_hz: float = 5.0,
+              standin_streams: list = None):
+        """
+        ROS2 노드 시작
+        
+        Args:
+            num_threads: executor 스레드 수 (None이면 rclpy 기본값 = CPU 수)
+            high_rate_hz: 이 주기 이상인 토픽은 전용 callback group 사용
+            standin_streams: 주어지면 ROS2 대신 가상 publisher로 실행 (부하 테스트용)
+        """
+        if standin_streams is not None:
+            return self._start_standin(topics, standin_streams, high_rate_hz)
+        
         if not HAS_RCLPY:
             print("Warning: rclpy not available. ROS features disabled.")
             return False
@@ -194,18 +447,18 @@ class RosService:
         
         try:
             rclpy.init()
-            self._node = RosSubscriberNode()
-            self._executor = MultiThreadedExecutor()
+            self._node = RosSubscriberNode(self._store, high_rate_hz=high_rate_hz)
+            self._executor = MultiThreadedExecutor(num_threads=num_threads)
             self._executor.add_node(self._node)
             
             # 토픽 구독
             if topics:
                 for topic_config in topics:
-                    self._node.subscribe_topic(topic_config.topic, topic_config.msg_type)
+                    self.add_subscription(topic_config)
             
             # 백그라운드 스레드에서 실행
             self._running = True
-            self._thread = threading.Thread(target=self._spin, daemon=True)
+            self._thread = threading.Thread(target=self._spin, name="ros-spin", daemon=True)
             self._thread.start()
             
             print("✅ ROS2 node started")
@@ -215,19 +468,41 @@ class RosService:
             print(f"❌ Failed to start ROS2 node: {e}")
             return False
     
+    def _start_standin(self, topics: list, streams: list, high_rate_hz: float) -> bool:
+        """Stand-in 모드 시작 (ROS2 없이 같은 변환/캐시 경로 사용)"""
+        from services.ros_standin import StandinNode
+        
+        if self._running:
+            return True
+        
+        self._node = StandinNode(self._store, streams, high_rate_hz=high_rate_hz)
+        for topic_config in topics or []:
+            self.add_subscription(topic_config)
+        
+        self._running = True
+        self._standin = True
+        self._node.start_publishers()
+        print("✅ ROS2 stand-in node started (synthetic publishers)")
+        return True
+    
     def _spin(self):
-        """ROS2 이벤트 루프"""
-        while self._running:
-            self._executor.spin_once(timeout_sec=0.1)
+        """ROS2 이벤트 루프 (executor.shutdown() 시 반환)"""
+        try:
+            self._executor.spin()
+        except Exception as e:
+            if self._running:
+                print(f"❌ ROS2 executor stopped: {e}")
     
     def stop(self):
         """ROS2 노드 종료"""
         self._running = False
+        if self._executor:
+            self._executor.shutdown(timeout_sec=1)
         if self._thread:
             self._thread.join(timeout=2)
         if self._node:
             self._node.destroy_node()
-        if HAS_RCLPY:
+        if HAS_RCLPY and not self._standin:
             try:
                 rclpy.shutdown()
             except:
@@ -235,20 +510,62 @@ class RosService:
         print("👋 ROS2 node stopped")
     
     def get_topic_data(self, topic: str) -> Optional[Dict[str, Any]]:
-        """토픽 데이터 가져오기"""
+        """토픽 데이터 가져오기 (락 없음, 읽기 전용)"""
         if self._node:
-            return self._node.get_topic_data(topic)
-        return None
+            self._node.mark_read((topic,))
+        return self._store.get(topic)
     
     def get_all_data(self) -> Dict[str, Dict[str, Any]]:
-        """모든 토픽 데이터 가져오기"""
+        """모든 토픽 데이터 스냅샷 (락/복사 없음, 읽기 전용) - 반환한 토픽은 모두 읽은 것으로 기록"""
+        snapshot = self._store.snapshot()
+        if self._node:
+            self._node.mark_read(snapshot.keys())
+        return snapshot
+    
+    @property
+    def store(self) -> TopicStore:
+        return self._store
+    
+    def add_subscription(self, topic_config) -> bool:
+        """토픽 구독 추가 (실행 중인 노드에 바로 반영, 재시작 불필요)"""
+        if not self._node:
+            return False
+        return self._node.subscribe_topic(
+            topic_config.topic,
+            topic_config.msg_type,
+            throttle_hz=topic_config.throttle_hz,
+            reliability=topic_config.reliability,
+            durability=topic_config.durability,
+            depth=topic_config.depth,
+            idle_timeout_sec=topic_config.idle_timeout_sec,
+            name=topic_config.name,
+        )
+    
+    def remove_subscription(self, topic: str) -> bool:
+        """토픽 구독 해제"""
+        if not self._node:
+            return False
+        return self._node.unsubscribe_topic(topic)
+    
+    def get_subscriptions(self) -> List[Dict[str, Any]]:
+        """현재 구독 목록"""
         if self._node:
-            return self._node.get_all_topics_data()
-        return {}
+            return self._node.get_subscriptions()
+        return []
+    
+    def subscribe_raw(self, topic: str, msg_type_str: str, callback: Callable[[Any], None], latched: bool = False) -> bool:
+        """원본 메시지 구독 (노드가 실행 중이 아니거나 메시지 타입을 찾을 수 없으면 False)"""
+        if not self._node:
+            return False
+        return self._node.subscribe_raw(topic, msg_type_str, callback, latched=latched)
     
     @property
     def is_running(self) -> bool:
         return self._running
+    
+    @property
+    def is_standin(self) -> bool:
+        return self._standin
 
 
 # 전역 인스턴스
@@ -0,0 +1,124 @@
+"""
+ROS Summary Service
+토픽 메시지가 들어올 때마다 요약 필드(배터리, 조인트, 진단 등)를 갱신
+/api/ros/summary는 미리 만들어진 요약 객체를 그대로 반환 (요청마다 재계산 없음)
+토픽별 요약 함수는 register()로 추가
+"""
+import threading
+from typing import Dict, Any, Callable, Optional
+
+from services.ros_subscriber import ros_service, TopicStore
+
+# 요약 함수: 토픽 data(dict) -> 요약 조각 (None이면 해당 키 제거)
+Summarizer = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# diagnostic_msgs/DiagnosticStatus level
+DIAG_LEVELS = {0: "ok", 1: "warn", 2: "error", 3: "stale"}
+
+
+def summarize_battery(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """sensor_msgs/BatteryState"""
+    return {
+        "percentage": data.get("percentage", 0) * 100,
+        "voltage": data.get("voltage", 0),
+    }
+
+
+def summarize_joints(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """sensor_msgs/JointState"""
+    names = data.get("name", [])
+    return {
+        "count": len(names) if isinstance(names, list) else 0,
+        "names": names[:5] if isinstance(names, list) else [],  # 처음 5개만
+    }
+
+
+def summarize_diagnostics(data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """diagnostic_msgs/DiagnosticArray (level별 개수)"""
+    statuses = data.get("status", [])
+    if not isinstance(statuses, list):
+        statuses = []
+
+    by_level = {name: 0 for name in DIAG_LEVELS.values()}
+    for status in statuses:
+        if isinstance(status, dict):
+            level = DIAG_LEVELS.get(status.get("level", 0))
+            if level:
+                by_level[level] += 1
+
+    return {
+        "count": len(statuses),
+        "errors": by_level["error"] + by_level["stale"],  # level >= 2
+        "by_level": by_level,
+    }
+
+
+class RosSummaryService:
+    """증분 갱신되는 ROS 요약"""
+
+    def __init__(self, store: TopicStore):
+        self._lock = threading.Lock()
+        self._summarizers: Dict[str, Dict[str, Summarizer]] = {}  # topic -> {key: fn}
+        self._topics: Dict[str, str] = {}  # topic -> 마지막 메시지 timestamp
+        self._summary: Dict[str, Any] = {"topics_active": 0, "topics": {}}
+        store.add_listener(self.on_publish)
+
+    def register(self, topic: str, key: str, summarizer: Summarizer):
+        """토픽 요약 함수 등록 (요약 결과는 summary[key]에 들어감)"""
+        with self._lock:
+            self._summarizers.setdefault(topic, {})[key] = summarizer
+
+    def unregister(self, topic: str, key: str):
+        """토픽 요약 함수 제거 (다른 서비스가 set_fragment로 직접 갱신할 때)"""
+        with self._lock:
+            self._summarizers.get(topic, {}).pop(key, None)
+
+    def set_fragment(self, key: str, fragment: Optional[Dict[str, Any]]):
+        """요약 조각 직접 갱신 (토픽 하나로 계산할 수 없는 요약용)"""
+        with self._lock:
+            summary = dict(self._summary)
+            if fragment is None:
+                summary.pop(key, None)
+            else:
+                summary[key] = fragment
+            self._summary = summary
+
+    def on_publish(self, topic: str, record: Optional[Dict[str, Any]]):
+        """TopicStore 발행/삭제 알림 - 해당 토픽의 요약 조각만 갱신"""
+        # 요약 함수는 락 밖에서 실행 (register/unregister와 겹쳐도 되도록 목록만 복사)
+        with self._lock:
+            summarizers = list(self._summarizers.get(topic, {}).items())
+        
+        fragments = {}
+        for key, summarizer in summarizers:
+            data = record.get("data") if record else None
+            fragments[key] = summarizer(data) if isinstance(data, dict) and data else None
+
+        with self._lock:
+            summary = dict(self._summary)
+            topics = dict(summary["topics"])
+            if record is None:
+                topics.pop(topic, None)
+            else:
+                topics[topic] = record.get("timestamp")
+            summary["topics"] = topics
+            summary["topics_active"] = len(topics)
+
+            for key, fragment in fragments.items():
+                if fragment is None:
+                    summary.pop(key, None)
+                else:
+                    summary[key] = fragment
+
+            self._summary = summary
+
+    def get_summary(self) -> Dict[str, Any]:
+        """현재 요약 (읽기 전용)"""
+        return self._summary
+
+
+# 전역 인스턴스 (기본 요약 함수 등록)
+ros_summary = RosSummaryService(ros_service.store)
+ros_summary.register("/battery_state", "battery", summarize_battery)
+ros_summary.register("/joint_states", "joints", summarize_joints)
+ros_summary.register("/diagnostics", "diagnostics", summarize_diagnostics)
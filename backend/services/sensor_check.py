@@ -3,10 +3,14 @@ Sensor Check Service
 센서 연결 상태 확인 (ping, RealSense, USB cameras)
 """
 import asyncio
+import json
 import subprocess
 import os
 import re
-from typing import Dict, List, Optional
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Iterable
 
 try:
     import paramiko
@@ -14,60 +18,290 @@ try:
 except ImportError:
     HAS_PARAMIKO = False
 
-from config import config
+from config import config, SensorInventoryConfig
+from services.metrics import span, timed
+from services import singleflight
+from services.singleflight import single_flight
+from services.mic_level import MicLevelStream
+from services.device_registry import device_registry, UdevMonitor, UDEV_MONITOR_CMD, UDEV_SNAPSHOT_CMD
+from services.sensor_history import sensor_history
+from services.ssh_pool import ssh_pool
+from services.amixer import AmixerSession, card_from_device_id, parse_scontrols, pick_controls, parse_percent
+
+
+# 하드웨어 목록 종류 -> 관련 udev subsystem
+INVENTORY_SUBSYSTEMS = {
+    "realsense": ("usb", "video4linux"),
+    "video": ("video4linux",),
+    "audio": ("sound",),
+    "mixer": ("sound",),
+}
+
+# 종류별로 함께 무효화할 single-flight 결과
+_INVENTORY_FLIGHTS = {
+    "realsense": ("get_realsense_inventory", "probe_realsense"),
+    "audio": ("list_audio_devices", "get_audio_devices"),
+}
+
+# rs-enumerate-devices -s: "Intel RealSense D435    123456789012    05.13.00.50"
+_RS_SHORT_RE = re.compile(r"^(?P<name>\S.*?)\s{2,}(?P<serial>\w+)\s+(?P<firmware>\d+(?:\.\d+)+)\s*$")
+
+# 시리얼 하나의 장치 정보 (+ frames=1이면 기본 스트림을 잠깐 열어 depth/color 프레임 수신 확인)
+_RS_PROBE_SCRIPT = '''
+python3 -c "
+import json, sys, time
+
+serial, check_frames = sys.argv[1], sys.argv[2] == '1'
+result = {'serial': serial}
+try:
+    import pyrealsense2 as rs
+except ImportError:
+    print(json.dumps({'serial': serial, 'error': 'pyrealsense2 not installed'}))
+    sys.exit(0)
+
+dev = None
+for d in rs.context().query_devices():
+    if d.get_info(rs.camera_info.serial_number) == serial:
+        dev = d
+        break
+
+result['connected'] = dev is not None
+if dev is not None:
+    for key, field in (('device_name', rs.camera_info.name), ('firmware', rs.camera_info.firmware_version),
+                       ('usb_type', rs.camera_info.usb_type_descriptor), ('port', rs.camera_info.physical_port)):
+        if dev.supports(field):
+            result[key] = dev.get_info(field)
+
+    if check_frames:
+        seen = set()
+        frames = 0
+        pipe = rs.pipeline()
+        cfg = rs.config()
+        cfg.enable_device(serial)
+        try:
+            pipe.start(cfg)
+            deadline = time.time() + 2.0
+            try:
+                while time.time() < deadline and not {'depth', 'color'} <= seen:
+                    for f in pipe.wait_for_frames(1000):
+                        seen.add(str(f.get_profile().stream_type()).split('.')[-1])
+                        frames += 1
+            finally:
+                pipe.stop()
+        except Exception as e:
+            # ROS 드라이버가 이미 스트리밍 중이면 busy
+            result['stream_error'] = str(e)
+        result['streams'] = {'depth': 'depth' in seen, 'color': 'color' in seen}
+        result['frames'] = frames
+
+print(json.dumps(result))
+" '''
+
+
+def _open_local_udev_stream():
+    proc = subprocess.Popen(
+        UDEV_MONITOR_CMD.split(), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        stdin=subprocess.DEVNULL, text=True,
+    )
+    
+    def _close():
+        proc.terminate()
+        proc.wait(timeout=2)
+    
+    return proc.stdout, _close
 
 
 class SensorCheckService:
     """센서 연결 확인 서비스"""
     
     def __init__(self):
-        self._ssh_client = None
-        self._pc2_config = config.pcs.get("pc2") if hasattr(config, 'pcs') else None
+        # 센서가 연결된 PC (기본 pc2, SENSOR_PC)
+        self._sensor_pc = config.sensor_pc
+        self._sensor_pc_config = config.pcs.get(self._sensor_pc)
+        
+        # 하드웨어 목록 캐시: 명령 -> (만료 시각, 종류, 조회 시각, (stdout, stderr))
+        self._inventory_config = config.sensor_inventory
+        self._inventory_lock = threading.Lock()
+        self._inventory: Dict[str, tuple] = {}
+        self._inventory_gen: Dict[str, int] = {kind: 0 for kind in INVENTORY_SUBSYSTEMS}
+        self._inventory_stats = {"hits": 0, "misses": 0, "invalidations": 0, "udev_events": 0}
+        
+        # 호스트별 udev 모니터 (device_registry 갱신 + PC2 목록 캐시 무효화)
+        self._udev_monitors: Dict[str, UdevMonitor] = {}
+        
+        # 볼륨: 카드별 amixer -s 세션, (카드, 종류)별 대기 중인 값
+        self._amixer_lock = threading.Lock()
+        self._amixer_sessions: Dict[str, AmixerSession] = {}
+        self._volume_pending: Dict[tuple, int] = {}
+        self._volume_flush: Dict[tuple, asyncio.Future] = {}
+        self._volume_applying: Dict[tuple, asyncio.Future] = {}  # 적용 중인 flush (같은 키는 순서대로)
+        self._volume_debounce_sec = config.audio_volume_debounce_sec
+        
+        # 장치별 마이크 레벨 스트림 (같은 장치에 새 스트림이 열리면 이전 것은 중지)
+        self._mic_streams: Dict[str, MicLevelStream] = {}
     
     def _get_ssh_client(self):
-        """PC2 SSH 클라이언트 생성 또는 재사용"""
+        """센서 PC SSH 클라이언트 (PC 모니터와 같은 연결 풀)"""
         if not HAS_PARAMIKO:
             raise ImportError("paramiko is required for SSH")
         
-        if not self._pc2_config:
-            raise ValueError("PC2 config not found")
+        if not self._sensor_pc_config:
+            raise ValueError(f"Sensor PC '{self._sensor_pc}' config not found")
         
-        if self._ssh_client:
-            try:
-                if self._ssh_client.get_transport() and self._ssh_client.get_transport().is_active():
-                    return self._ssh_client
-            except:
-                pass
+        return ssh_pool.get(self._sensor_pc_config)
+    
+    def _run_remote_command(self, command: str, timeout: int = 10) -> tuple:
+        """PC2에서 명령 실행"""
+        with span("ssh_command"):
+            client = self._get_ssh_client()
+            stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
+            return stdout.read().decode().strip(), stderr.read().decode().strip()
+    
+    # ============================================
+    # 하드웨어 목록 캐시
+    # ============================================
+    
+    def _run_inventory_command(self, kind: str, command: str, timeout: int = 10) -> tuple:
+        """
+        느리게 바뀌는 하드웨어 목록 명령 실행 (종류별 TTL 캐시)
+        
+        udev 모니터가 연결되어 있으면 이벤트가 올 때까지 (최대 udev_max_age_sec) 재사용
+        """
+        now = time.monotonic()
+        with self._inventory_lock:
+            entry = self._inventory.get(command)
+            if entry is not None and now < entry[0]:
+                self._inventory_stats["hits"] += 1
+                return entry[3]
+            self._inventory_stats["misses"] += 1
+            gen = self._inventory_gen[kind]
+        
+        result = self._run_remote_command(command, timeout=timeout)
+        
+        with self._inventory_lock:
+            # 실행 중에 무효화되었으면 오래된 결과이므로 저장하지 않음
+            if self._inventory_gen[kind] == gen:
+                done = time.monotonic()
+                self._inventory[command] = (done + self._inventory_ttl(kind), kind, done, result)
+        return result
+    
+    def _inventory_ttl(self, kind: str) -> float:
+        cfg = self._inventory_config
+        if self._udev_connected:
+            return cfg.udev_max_age_sec
+        return cfg.realsense_ttl_sec if kind == "realsense" else cfg.ttl_sec
+    
+    def invalidate_inventory(self, kinds: Optional[Iterable[str]] = None):
+        """하드웨어 목록 캐시 무효화 (kinds가 없으면 전체)"""
+        kinds = set(kinds) if kinds else set(INVENTORY_SUBSYSTEMS)
+        with self._inventory_lock:
+            for command in [c for c, entry in self._inventory.items() if entry[1] in kinds]:
+                del self._inventory[command]
+            for kind in kinds:
+                self._inventory_gen[kind] = self._inventory_gen.get(kind, 0) + 1
+            self._inventory_stats["invalidations"] += 1
         
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        
-        pc = self._pc2_config
-        if pc.ssh_key_path:
-            client.connect(
-                hostname=pc.ip,
-                port=pc.port,
-                username=pc.username,
-                key_filename=pc.ssh_key_path,
-                timeout=5,
+        for kind in kinds:
+            for name in _INVENTORY_FLIGHTS.get(kind, ()):
+                singleflight.invalidate(self, name)
+    
+    def get_inventory_status(self) -> Dict:
+        """캐시 항목, 적중률, udev 모니터 상태"""
+        now = time.monotonic()
+        with self._inventory_lock:
+            entries = [
+                {
+                    "command": command,
+                    "kind": kind,
+                    "age_sec": round(now - fetched, 1),
+                    "expires_in_sec": round(expires - now, 1),
+                }
+                for command, (expires, kind, fetched, _) in self._inventory.items()
+            ]
+            stats = dict(self._inventory_stats)
+        return {
+            "udev_monitor": self._inventory_config.udev_monitor,
+            "udev_connected": self._udev_connected,
+            "registry": device_registry.status(),
+            "stats": stats,
+            "entries": entries,
+        }
+    
+    def start_inventory_monitor(self, inventory_config: SensorInventoryConfig):
+        """
+        설정 적용 + (활성화된 경우) udev 이벤트 구독 시작
+        센서 PC(기본 PC2)는 SSH 채널, 이 PC는 로컬 udevadm (있는 경우)
+        """
+        self._inventory_config = inventory_config
+        if not inventory_config.udev_monitor or self._udev_monitors:
+            return
+        
+        if self._sensor_pc_config and not self._sensor_pc_config.local:
+            self._udev_monitors[self._sensor_pc] = UdevMonitor(
+                self._sensor_pc, device_registry, self._open_remote_udev_stream,
+                lambda: self._run_remote_command(UDEV_SNAPSHOT_CMD, timeout=15)[0],
+                on_connect=self._on_udev_connect,
+                on_event=self._on_udev_event,
             )
-        else:
-            client.connect(
-                hostname=pc.ip,
-                port=pc.port,
-                username=pc.username,
-                password=pc.password,
-                timeout=5,
+        local_pc = next((pc_id for pc_id, pc in config.pcs.items() if pc.local), "pc1")
+        if shutil.which("udevadm") and local_pc not in self._udev_monitors:
+            self._udev_monitors[local_pc] = UdevMonitor(
+                local_pc, device_registry, _open_local_udev_stream,
+                lambda: subprocess.run(
+                    ["sh", "-c", UDEV_SNAPSHOT_CMD], capture_output=True, text=True, timeout=15,
+                ).stdout,
             )
-        
-        self._ssh_client = client
-        return client
+        for monitor in self._udev_monitors.values():
+            monitor.start()
     
-    def _run_remote_command(self, command: str, timeout: int = 10) -> tuple:
-        """PC2에서 명령 실행"""
-        client = self._get_ssh_client()
-        stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
-        return stdout.read().decode().strip(), stderr.read().decode().strip()
+    def stop_inventory_monitor(self):
+        for monitor in self._udev_monitors.values():
+            monitor.stop()
+        self._udev_monitors = {}
+    
+    @property
+    def udev_monitor_enabled(self) -> bool:
+        """udev 이벤트 구독 설정 여부 (SENSOR_UDEV_MONITOR)"""
+        return self._inventory_config.udev_monitor
+    
+    @property
+    def _udev_connected(self) -> bool:
+        monitor = self._udev_monitors.get(self._sensor_pc)
+        return monitor is not None and monitor.connected
+    
+    def _open_remote_udev_stream(self):
+        channel = self._get_ssh_client().get_transport().open_session()
+        channel.exec_command(UDEV_MONITOR_CMD)
+        return channel.makefile("r"), channel.close
+    
+    def _on_udev_connect(self):
+        # 연결되기 전의 변경은 알 수 없으므로 전체 무효화 후 이벤트 기준으로 전환
+        self.invalidate_inventory()
+        self._record_udev_presence()
+    
+    def _on_udev_event(self, props: Dict[str, str]):
+        """PC2 udev 이벤트 -> 관련 하드웨어 목록 무효화 + 센서 이력 기록"""
+        subsystem = props.get("SUBSYSTEM")
+        kinds = [kind for kind, subsystems in INVENTORY_SUBSYSTEMS.items() if subsystem in subsystems]
+        if kinds:
+            self._inventory_stats["udev_events"] += 1
+            self.invalidate_inventory(kinds)
+            self._record_udev_presence()
+    
+    def _record_udev_presence(self):
+        """레지스트리 기준 RealSense/오디오 연결 상태를 이력에 기록 (폴링이 없어도 분리 시점이 남음)"""
+        serials = {d["serial"] for d in device_registry.devices(self._sensor_pc, "realsense") if d["serial"]}
+        present = {
+            "audio_output": bool(device_registry.devices(self._sensor_pc, "speaker")),
+            "audio_input": bool(device_registry.devices(self._sensor_pc, "microphone")),
+        }
+        observations = []
+        for sensor in config.sensors:
+            if sensor.type == "realsense" and sensor.serial:
+                observations.append((sensor.name, sensor.type, sensor.serial in serials))
+            elif sensor.type in present:
+                observations.append((sensor.name, sensor.type, present[sensor.type]))
+        sensor_history.record_many(observations, source="udev")
     
     async def ping_host(self, ip: str, timeout: float = 1.0) -> Dict:
         """
@@ -101,35 +335,28 @@ class SensorCheckService:
                 return {"online": False, "ping_ms": None, "ip": ip, "error": str(e)}
         
         loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _ping_sync)
+        return await loop.run_in_executor(None, timed("ping", _ping_sync))
     
-    async def get_realsense_devices(self) -> Dict[str, str]:
+    @single_flight(ttl=5.0)
+    async def get_realsense_inventory(self) -> Dict[str, Dict[str, str]]:
         """
         연결된 RealSense 기기 목록 (PC2에서 SSH로 실행)
-        rs-enumerate-devices 사용
+        스트림 프로파일까지 출력하는 전체 열거 대신 rs-enumerate-devices -s (요약 표) 사용
         
         Returns:
-            {serial_number: device_name, ...}
+            {serial_number: {"name": ..., "firmware": ...}, ...}
         """
         def _enumerate_sync():
             devices = {}
             try:
-                # PC2에서 rs-enumerate-devices 실행
-                stdout, stderr = self._run_remote_command("rs-enumerate-devices", timeout=10)
-                
-                lines = stdout.split('\n')
-                current_name = None
-                
-                for line in lines:
-                    # Device Name 찾기
-                    if "Name" in line and ":" in line:
-                        current_name = line.split(":")[-1].strip()
-                    # Serial Number 찾기
-                    elif "Serial Number" in line and ":" in line:
-                        serial = line.split(":")[-1].strip()
-                        if serial and current_name:
-                            devices[serial] = current_name
-                            current_name = None
+                stdout, stderr = self._run_inventory_command("realsense", "rs-enumerate-devices -s", timeout=10)
+                for line in stdout.split('\n'):
+                    match = _RS_SHORT_RE.match(line.strip())
+                    if match and match.group("name") != "Device Name":
+                        devices[match.group("serial")] = {
+                            "name": match.group("name"),
+                            "firmware": match.group("firmware"),
+                        }
             except Exception:
                 pass
             
@@ -138,6 +365,79 @@ class SensorCheckService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _enumerate_sync)
     
+    async def get_realsense_devices(self) -> Dict[str, str]:
+        """
+        연결된 RealSense 기기 목록
+        
+        Returns:
+            {serial_number: device_name, ...}
+        """
+        inventory = await self.get_realsense_inventory()
+        return {serial: info["name"] for serial, info in inventory.items()}
+    
+    @single_flight(ttl=30.0)
+    async def probe_realsense(self, serial: str, frames: bool = False) -> Dict:
+        """
+        RealSense 한 대 상태 확인 (PC2에서 pyrealsense2 스크립트 실행)
+        
+        Args:
+            serial: 시리얼 번호
+            frames: True면 기본 스트림을 잠깐 열어 depth/color 프레임 수신 확인 (~2초)
+        
+        Returns:
+            {"serial", "connected", "device_name", "firmware", "usb_type", "usb3", "streams", "frames", ...}
+        """
+        if not re.fullmatch(r"\w+", serial):
+            return {"serial": serial, "connected": False, "error": "Invalid serial"}
+        
+        def _probe_sync():
+            try:
+                stdout, stderr = self._run_remote_command(
+                    f"{_RS_PROBE_SCRIPT} {serial} {int(frames)}", timeout=15 if frames else 10,
+                )
+                if not stdout:
+                    return {"serial": serial, "connected": False, "error": stderr or "No output"}
+                result = json.loads(stdout.splitlines()[-1])
+            except Exception as e:
+                return {"serial": serial, "connected": False, "error": str(e)}
+            
+            if "usb_type" in result:
+                result["usb3"] = result["usb_type"].startswith("3")
+            result["checked_at"] = time.time()
+            return result
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, timed("realsense_probe", _probe_sync))
+    
+    async def check_realsense_health(self, serials: List[str], frames: bool = False) -> List[Dict]:
+        """여러 RealSense를 동시에 확인 (시리얼별 결과는 probe_realsense에서 캐시)"""
+        return list(await asyncio.gather(*(self.probe_realsense(serial, frames) for serial in serials)))
+    
+    def _list_video_devices_sync(self) -> List[str]:
+        """PC2 /dev/video* 중 RealSense가 아닌 장치 (SSH, 목록 캐시 사용)"""
+        # PC2에서 /dev/video* 목록 확인
+        stdout, stderr = self._run_inventory_command("video", "ls -1 /dev/video*")
+        
+        device_paths = []
+        for line in stdout.split('\n'):
+            if line.startswith('/dev/video'):
+                device_path = line.strip()
+
+                # V4L2 정보 확인 (USB ID 등)
+                try:
+                    # udevadm info
+                    udev_out, _ = self._run_inventory_command("video", f"udevadm info --query=all --name={device_path} | grep ID_VENDOR_ID")
+                    if "ID_VENDOR_ID" in udev_out:
+                        vendor_id = udev_out.split('=')[-1].strip()
+                        # RealSense 제외 (8086: Intel)
+                        if vendor_id == "8086":
+                            continue
+                except:
+                    pass
+
+                device_paths.append(device_path)
+        return device_paths
+    
     async def get_video_devices(self) -> List[Dict]:
         """
         사용 가능한 /dev/video* 디바이스 목록 (PC2에서 SSH로 실행)
@@ -149,35 +449,29 @@ class SensorCheckService:
             devices = []
             
             try:
-                # PC2에서 /dev/video* 목록 확인
-                stdout, stderr = self._run_remote_command("ls -1 /dev/video*")
-                
-                for line in stdout.split('\n'):
-                    if line.startswith('/dev/video'):
-                        device_path = line.strip()
-                        # 사용 가능 여부 확인 (fuser로 점유 확인)
-                        try:
-                            fuser_out, _ = self._run_remote_command(f"fuser {device_path}")
-                            available = len(fuser_out.strip()) == 0
-                        except:
-                            available = True
-                            
-                        # V4L2 정보 확인 (USB ID 등)
-                        try:
-                            # udevadm info
-                            udev_out, _ = self._run_remote_command(f"udevadm info --query=all --name={device_path} | grep ID_VENDOR_ID")
-                            if "ID_VENDOR_ID" in udev_out:
-                                vendor_id = udev_out.split('=')[-1].strip()
-                                # RealSense 제외 (8086: Intel)
-                                if vendor_id == "8086":
-                                    continue
-                        except:
-                            pass
+                if device_registry.is_live(self._sensor_pc):
+                    # udev 레지스트리에 RealSense가 아닌 video 장치가 이미 있음 (SSH 없음)
+                    device_paths = [d["devname"] for d in device_registry.devices(self._sensor_pc, "camera")]
+                else:
+                    device_paths = self._list_video_devices_sync()
 
-                        devices.append({
-                            "device": device_path,
-                            "available": available
-                        })
+                # 사용 가능 여부 확인 (fuser로 점유 확인) - 장치 목록과 달리 매번 조회, 명령 한 번으로 묶음
+                busy = set()
+                if device_paths:
+                    try:
+                        fuser_out, _ = self._run_remote_command(
+                            "for d in " + " ".join(device_paths) +
+                            '; do [ -n "$(fuser $d 2>/dev/null)" ] && echo $d; done'
+                        )
+                        busy = set(fuser_out.split())
+                    except:
+                        pass
+
+                for device_path in device_paths:
+                    devices.append({
+                        "device": device_path,
+                        "available": device_path not in busy
+                    })
 
             except Exception:
                 pass
@@ -216,6 +510,7 @@ class SensorCheckService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _check_sync)
     
+    @single_flight(ttl=1.0)
     async def get_audio_devices(self) -> Dict[str, bool]:
         """
         오디오 장치 연결 상태 확인 (PC2에서 SSH로 실행)
@@ -227,9 +522,15 @@ class SensorCheckService:
         def _check_audio_sync():
             result = {"speaker": False, "microphone": False}
             
+            if device_registry.is_live(self._sensor_pc):
+                # udev 레지스트리의 PCM 장치 (SSH 없음)
+                result["speaker"] = bool(device_registry.devices(self._sensor_pc, "speaker"))
+                result["microphone"] = bool(device_registry.devices(self._sensor_pc, "microphone"))
+                return result
+            
             try:
                 # PC2에서 aplay -l 실행
-                stdout, stderr = self._run_remote_command("aplay -l")
+                stdout, stderr = self._run_inventory_command("audio", "aplay -l")
                 if "card" in stdout.lower():
                     result["speaker"] = True
             except Exception as e:
@@ -237,7 +538,7 @@ class SensorCheckService:
             
             try:
                 # PC2에서 arecord -l 실행
-                stdout, stderr = self._run_remote_command("arecord -l")
+                stdout, stderr = self._run_inventory_command("audio", "arecord -l")
                 if "card" in stdout.lower():
                     result["microphone"] = True
             except Exception as e:
@@ -248,6 +549,7 @@ class SensorCheckService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _check_audio_sync)
     
+    @single_flight(ttl=10.0)
     async def list_audio_devices(self) -> Dict[str, list]:
         """
         사용 가능한 오디오 장치 목록 조회 (PC2에서 SSH로 실행)
@@ -292,14 +594,14 @@ class SensorCheckService:
             
             # PC2에서 aplay -l 실행
             try:
-                stdout, stderr = self._run_remote_command("aplay -l")
+                stdout, stderr = self._run_inventory_command("audio", "aplay -l")
                 parse_audio_output(stdout, result["speakers"])
             except Exception as e:
                 result["speaker_error"] = str(e)
             
             # PC2에서 arecord -l 실행
             try:
-                stdout, stderr = self._run_remote_command("arecord -l")
+                stdout, stderr = self._run_inventory_command("audio", "arecord -l")
                 parse_audio_output(stdout, result["microphones"])
             except Exception as e:
                 result["microphone_error"] = str(e)
@@ -369,57 +671,63 @@ class SensorCheckService:
         loop = asyncio.get_event_loop()
         return await loop.run_in_executor(None, _test_sync)
     
+    def _mixer_controls(self, card_num: str) -> List[str]:
+        """카드의 simple mixer 컨트롤 목록 (하드웨어 목록 캐시 사용)"""
+        stdout, _ = self._run_inventory_command("mixer", f"amixer -c {card_num} scontrols")
+        return parse_scontrols(stdout)
+    
+    def open_mic_level_stream(self, device_id: str = "default", rate: int = 16000, channels: int = 1,
+                              interval_sec: float = 0.1, max_sec: float = 60.0) -> MicLevelStream:
+        """
+        마이크 실시간 레벨 스트림 (PC2 arecord raw PCM -> SSH 채널 하나)
+        같은 장치는 동시에 하나만 녹음할 수 있으므로 이전 스트림은 중지
+        """
+        previous = self._mic_streams.get(device_id)
+        if previous is not None:
+            previous.stop()
+        stream = MicLevelStream(
+            lambda: self._get_ssh_client().get_transport(),
+            device_id, rate=rate, channels=channels, interval_sec=interval_sec, max_sec=max_sec,
+        )
+        self._mic_streams[device_id] = stream
+        return stream
+    
+    def close_mic_level_stream(self, stream: MicLevelStream):
+        stream.stop()
+        if self._mic_streams.get(stream.device_id) is stream:
+            del self._mic_streams[stream.device_id]
+    
     async def get_volume(self, device_id: str = "default") -> Dict[str, int]:
         """
         현재 볼륨 조회 - PC2에서 SSH로 실행
+        (컨트롤 목록은 캐시, 스피커/마이크 값은 명령 한 번으로 조회)
         
         Returns:
             {"speaker": 0-100, "microphone": 0-100}
         """
         def _get_sync():
-            result = {"speaker": 50, "microphone": 50}
-            
-            # 카드 번호 추출 (hw:X,Y -> X)
-            card_num = "0"
-            if device_id.startswith("hw:"):
-                try:
-                    card_num = device_id.split(":")[1].split(",")[0]
-                except:
-                    pass
-            
-            # 1. 믹서 컨트롤 목록 조회 (amixer -c X scontrols)
-            # 2. 적절한 컨트롤(Master, PCM, Speaker / Capture, Mic) 찾기
-            # 3. 볼륨 조회
+            result = {"speaker": 50, "microphone": 50}  # 기본값
+            card_num = card_from_device_id(device_id)
             
-            def get_vol_for_type(controls_pool):
-                try:
-                    # scontrols 조회
-                    stdout, stderr = self._run_remote_command(f"amixer -c {card_num} scontrols")
-                    available_controls = []
-                    for line in stdout.split('\n'):
-                        if "Simple mixer control" in line:
-                            # Simple mixer control 'Master',0 -> Master
-                            ctrl = line.split("'")[1]
-                            available_controls.append(ctrl)
-                    
-                    # 우선순위에 따라 매칭
-                    target_control = None
-                    for candidate in controls_pool:
-                        if candidate in available_controls:
-                            target_control = candidate
-                            break
-                    
-                    if target_control:
-                        stdout, stderr = self._run_remote_command(f"amixer -c {card_num} get '{target_control}'")
-                        match = re.search(r'\[(\d+)%\]', stdout)
-                        if match:
-                            return int(match.group(1))
-                except:
-                    pass
-                return 50 # 기본값
-            
-            result["speaker"] = get_vol_for_type(["Master", "PCM", "Speaker", "Headphone", "Playback"])
-            result["microphone"] = get_vol_for_type(["Capture", "Mic", "Microphone", "Input"])
+            try:
+                available = self._mixer_controls(card_num)
+                targets = {}
+                for device_type in ("speaker", "microphone"):
+                    controls = pick_controls(available, device_type)
+                    if controls:
+                        targets[device_type] = controls[0]
+                
+                if targets:
+                    command = " ; echo __NEXT__ ; ".join(
+                        f"amixer -c {card_num} sget '{control}'" for control in targets.values()
+                    )
+                    stdout, _ = self._run_remote_command(command)
+                    for device_type, chunk in zip(targets, stdout.split("__NEXT__")):
+                        value = parse_percent(chunk)
+                        if value is not None:
+                            result[device_type] = value
+            except Exception:
+                pass
             
             return result
         
@@ -428,56 +736,76 @@ class SensorCheckService:
     
     async def set_volume(self, device_type: str, volume: int, device_id: str = "default") -> Dict:
         """
-        볼륨 설정 - PC2에서 SSH로 실행
+        볼륨 설정 - 카드별로 유지되는 amixer -s 세션으로 적용
+        슬라이더를 끌 때처럼 연달아 들어오면 debounce 시간 동안 모아서 마지막 값만 적용
+        (그 사이의 호출자는 모두 같은 결과를 받음)
         
         Args:
             device_type: "speaker" 또는 "microphone"
             volume: 0-100
             device_id: 장치 ID (예: hw:1,0)
         """
-        def _set_sync():
-            volume_clamped = max(0, min(100, volume))
-            
-            # 카드 번호 추출
-            card_num = "0"
-            if device_id.startswith("hw:"):
-                try:
-                    card_num = device_id.split(":")[1].split(",")[0]
-                except:
-                    pass
-            
-            try:
-                # 사용 가능한 컨트롤 확인
-                stdout, stderr = self._run_remote_command(f"amixer -c {card_num} scontrols")
-                available_controls = []
-                for line in stdout.split('\n'):
-                     if "Simple mixer control" in line:
-                         ctrl = line.split("'")[1]
-                         available_controls.append(ctrl)
-                
-                # 타겟 컨트롤 찾기
-                target_controls = []
-                if device_type == "speaker":
-                    candidates = ["Master", "PCM", "Speaker", "Headphone", "Playback"]
-                else:
-                    candidates = ["Capture", "Mic", "Microphone", "Input"]
-                
-                for cand in candidates:
-                    if cand in available_controls:
-                        target_controls.append(cand)
-                        # 보통 하나만 조절하면 되지만, Master/PCM 둘 다 있는 경우 둘 다 조절하면 확실함
-                
-                if not target_controls:
-                     return {"success": False, "device": device_type, "error": f"No volume control found for card {card_num}"}
-                
-                # 설정 적용
-                for ctrl in target_controls:
-                    self._run_remote_command(f"amixer -c {card_num} set '{ctrl}' {volume_clamped}%")
-                
-                return {"success": True, "device": device_type, "volume": volume_clamped, "card": card_num}
-                
-            except Exception as e:
-                return {"success": False, "device": device_type, "error": str(e)}
+        card_num = card_from_device_id(device_id)
+        key = (card_num, device_type)
+        self._volume_pending[key] = max(0, min(100, volume))
         
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _set_sync)
+        future = self._volume_flush.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._volume_flush[key] = future
+            loop.call_later(self._volume_debounce_sec, lambda: asyncio.ensure_future(self._flush_volume(key)))
+        
+        return await asyncio.shield(future)
+    
+    async def _flush_volume(self, key: tuple):
+        """
+        debounce 시간이 지나면 마지막 값 적용
+        이전 flush가 아직 executor에서 적용 중이면 끝난 뒤에 적용 (오래된 값이 나중에 덮어쓰지 않게)
+        """
+        card_num, device_type = key
+        future = self._volume_flush.pop(key)
+        volume = self._volume_pending.pop(key)
+        
+        loop = asyncio.get_running_loop()
+        previous = self._volume_applying.get(key)
+        applying = self._volume_applying[key] = loop.create_future()
+        try:
+            if previous is not None:
+                await previous
+            result = await loop.run_in_executor(
+                None, timed("amixer_set", lambda: self._apply_volume(card_num, device_type, volume))
+            )
+        except Exception as e:
+            result = {"success": False, "device": device_type, "error": str(e)}
+        finally:
+            applying.set_result(None)
+            if self._volume_applying.get(key) is applying:
+                del self._volume_applying[key]
+        future.set_result(result)
+    
+    def _apply_volume(self, card_num: str, device_type: str, volume: int) -> Dict:
+        with self._amixer_lock:
+            session = self._amixer_sessions.get(card_num)
+            if session is None:
+                session = AmixerSession(card_num, lambda: self._get_ssh_client().get_transport())
+                self._amixer_sessions[card_num] = session
+        
+        # 컨트롤 조회(캐시 miss면 SSH)부터 sset까지 카드 단위로 묶음
+        with session.lock:
+            controls = pick_controls(self._mixer_controls(card_num), device_type)
+            if not controls:
+                return {"success": False, "device": device_type, "error": f"No volume control found for card {card_num}"}
+            session.sset({control: f"{volume}%" for control in controls})
+        return {"success": True, "device": device_type, "volume": volume, "card": card_num}
+    
+    def close_audio_sessions(self):
+        """amixer 세션, 마이크 레벨 스트림 종료"""
+        for stream in list(self._mic_streams.values()):
+            stream.stop()
+        self._mic_streams.clear()
+        with self._amixer_lock:
+            sessions = list(self._amixer_sessions.values())
+            self._amixer_sessions.clear()
+        for session in sessions:
+            session.close()
@@ -0,0 +1,186 @@
+"""
+Sensor History Service
+센서별 online/offline 이력 (상태 조회, udev 이벤트 등 이미 일어난 관측만 기록, 추가 probe 없음)
+- 같은 상태가 이어지면 구간 끝만 늘리는 run-length 링 버퍼 (센서당 고정 크기 배열)
+- 구간별 uptime %, flap 횟수, 마지막 상태 변경 시각
+"""
+import array
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config import SensorHistoryConfig
+
+
+class _Track:
+    """
+    센서 하나의 상태 구간 링 버퍼
+    구간 i = [starts[i], ends[i]] 동안 states[i] (관측 간격이 gap_sec보다 길면 새 구간)
+    """
+
+    __slots__ = ("name", "kind", "starts", "ends", "states", "head", "count",
+                 "observations", "last_change", "sources")
+
+    def __init__(self, name: str, kind: str, capacity: int):
+        self.name = name
+        self.kind = kind
+        self.starts = array.array("d", bytes(8 * capacity))
+        self.ends = array.array("d", bytes(8 * capacity))
+        self.states = bytearray(capacity)
+        self.head = 0  # 다음에 쓸 위치
+        self.count = 0
+        self.observations = 0
+        self.last_change: Optional[float] = None
+        self.sources: Dict[str, int] = {}
+
+    @property
+    def capacity(self) -> int:
+        return len(self.states)
+
+    def _index(self, i: int) -> int:
+        """오래된 순 i번째 구간의 배열 위치"""
+        return (self.head - self.count + i) % self.capacity
+
+    def observe(self, online: bool, t: float, gap_sec: float):
+        self.observations += 1
+        state = 1 if online else 0
+        if self.count:
+            last = (self.head - 1) % self.capacity
+            if t < self.ends[last]:
+                return  # 늦게 도착한 관측
+            if self.states[last] == state and t - self.ends[last] <= gap_sec:
+                self.ends[last] = t
+                return
+            if self.states[last] != state:
+                self.last_change = t
+
+        self.starts[self.head] = t
+        self.ends[self.head] = t
+        self.states[self.head] = state
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def segments(self) -> Iterable[Tuple[float, float, int]]:
+        for i in range(self.count):
+            j = self._index(i)
+            yield self.starts[j], self.ends[j], self.states[j]
+
+    def stats(self, since: float, now: float, gap_sec: float) -> Dict[str, Any]:
+        """since 이후 관측 시간 기준 uptime %, 상태 변경 횟수"""
+        online_sec = observed_sec = 0.0
+        flaps = 0
+        previous = None
+        for i, (start, end, state) in enumerate(self.segments()):
+            if previous is not None and previous != state and start >= since:
+                flaps += 1
+            previous = state
+            # 다음 관측까지 상태가 유지된다고 보되, gap_sec을 넘는 공백은 관측 안 된 시간
+            next_start = self.starts[self._index(i + 1)] if i + 1 < self.count else now
+            end = max(end, min(next_start, end + gap_sec))
+            duration = max(0.0, end - max(start, since))
+            observed_sec += duration
+            if state:
+                online_sec += duration
+
+        last = (self.head - 1) % self.capacity
+        return {
+            "online": bool(self.states[last]) if self.count else None,
+            "uptime_pct": round(100.0 * online_sec / observed_sec, 2) if observed_sec > 0 else None,
+            "observed_sec": round(observed_sec, 1),
+            "flaps": flaps,
+            "last_change": self.last_change,
+            "last_seen": self.ends[last] if self.count else None,
+            "observations": self.observations,
+            "sources": dict(self.sources),
+        }
+
+
+class SensorHistory:
+    """센서 이름별 상태 이력"""
+
+    def __init__(self, history_config: Optional[SensorHistoryConfig] = None):
+        self._lock = threading.Lock()
+        self._config = history_config or SensorHistoryConfig()
+        self._tracks: Dict[str, _Track] = {}
+
+    def configure(self, history_config: SensorHistoryConfig):
+        """설정 적용 (기존 이력은 유지, 링 크기 변경은 새로 생기는 센서부터)"""
+        self._config = history_config
+
+    def record(self, name: str, kind: str, online: bool, source: str = "poll", t: Optional[float] = None):
+        t = time.time() if t is None else t
+        with self._lock:
+            track = self._tracks.get(name)
+            if track is None:
+                track = self._tracks[name] = _Track(name, kind, self._config.segments_per_sensor)
+            track.observe(online, t, self._config.gap_sec)
+            track.sources[source] = track.sources.get(source, 0) + 1
+
+    def record_many(self, observations: Iterable[Tuple[str, str, bool]], source: str = "poll"):
+        """[(이름, 종류, online), ...] 한 번에 기록 (같은 시각)"""
+        t = time.time()
+        for name, kind, online in observations:
+            self.record(name, kind, online, source=source, t=t)
+
+    def _is_flapping(self, track: _Track, now: float) -> bool:
+        cfg = self._config
+        flaps = track.stats(now - cfg.flap_window_sec, now, cfg.gap_sec)["flaps"]
+        return flaps >= cfg.flap_threshold
+
+    def query(self, window_sec: Optional[float] = None, kind: Optional[str] = None,
+              flapping: Optional[bool] = None, min_flaps: int = 0) -> List[Dict[str, Any]]:
+        """
+        센서별 요약 (flap 많은 순)
+
+        Args:
+            window_sec: uptime/flap 집계 구간 (없으면 보관된 전체 이력)
+            kind: 센서 종류 필터 (lidar_2d, realsense, audio_output ...)
+            flapping: True면 flap_window_sec 안에 flap_threshold번 이상 바뀐 센서만
+            min_flaps: 집계 구간 flap 최소 횟수
+        """
+        now = time.time()
+        since = now - window_sec if window_sec else 0.0
+        cfg = self._config
+        result = []
+        with self._lock:
+            for track in self._tracks.values():
+                if kind is not None and track.kind != kind:
+                    continue
+                is_flapping = self._is_flapping(track, now)
+                if flapping is not None and is_flapping != flapping:
+                    continue
+                stats = track.stats(since, now, cfg.gap_sec)
+                if stats["flaps"] < min_flaps:
+                    continue
+                result.append({"name": track.name, "kind": track.kind, "flapping": is_flapping, **stats})
+        return sorted(result, key=lambda s: (-s["flaps"], s["uptime_pct"] if s["uptime_pct"] is not None else 100.0))
+
+    def get_sensor(self, name: str, limit: int = 100) -> Optional[Dict[str, Any]]:
+        """센서 하나의 요약 + 최근 구간 (최신 순)"""
+        now = time.time()
+        with self._lock:
+            track = self._tracks.get(name)
+            if track is None:
+                return None
+            segments = [
+                {"start": start, "end": end, "online": bool(state)}
+                for start, end, state in track.segments()
+            ]
+            return {
+                "name": track.name,
+                "kind": track.kind,
+                "flapping": self._is_flapping(track, now),
+                **track.stats(0.0, now, self._config.gap_sec),
+                "capacity": track.capacity,
+                "segments": segments[::-1][:limit],
+            }
+
+    def reset(self, name: Optional[str] = None):
+        with self._lock:
+            if name is None:
+                self._tracks.clear()
+            else:
+                self._tracks.pop(name, None)
+
+
+sensor_history = SensorHistory()
@@ -0,0 +1,281 @@
+"""
+Sensor Probe Scheduler
+config.sensors의 센서를 백엔드가 직접 주기적으로 확인 (클라이언트 폴링 수와 무관)
+- 계속 같은 상태면 간격을 늘리고 (online은 max_interval_sec, offline은 base_interval_sec까지)
+  상태가 바뀌면 min_interval_sec부터 다시 시작
+- 작업별 확인 시각을 간격 안에 고르게 나누고 jitter + 동시 실행 수 제한으로 burst 방지
+- udev 장치 이벤트가 오면 해당 종류 센서를 바로 다시 확인
+- /api/sensors/status는 여기 캐시된 결과를 반환
+"""
+import asyncio
+import heapq
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+from config import SensorConfig, SensorSchedulerConfig
+from services.device_registry import device_registry
+from services.sensor_history import sensor_history
+
+# 카메라는 설정된 센서가 아니라 PC2에서 발견된 장치 목록이므로 작업 하나로 확인
+CAMERAS_JOB = "__cameras__"
+
+# 레지스트리 장치 종류 -> 다시 확인할 센서 종류
+_REGISTRY_KINDS = {
+    "realsense": ("realsense",),
+    "speaker": ("audio_output",),
+    "microphone": ("audio_input",),
+    "camera": (CAMERAS_JOB,),
+}
+
+
+class _Job:
+    """센서 하나의 확인 주기 상태"""
+
+    __slots__ = ("name", "sensor", "interval", "due", "streak", "last_state", "probes", "failures",
+                 "last_duration_ms", "retrigger", "phase")
+
+    def __init__(self, name: str, sensor: Optional[SensorConfig], interval: float, due: float):
+        self.name = name
+        self.sensor = sensor
+        self.interval = interval
+        self.due = due
+        self.streak = 0  # 같은 상태 연속 횟수
+        self.last_state: Optional[bool] = None
+        self.probes = 0
+        self.failures = 0
+        self.last_duration_ms: Optional[float] = None
+        self.retrigger = False  # 확인 중에 trigger됨 -> 끝나면 바로 다시
+        self.phase = 0.0  # 첫 확인 후 다음 확인을 미루는 비율 (작업끼리 시각이 겹치지 않게)
+
+    @property
+    def kind(self) -> str:
+        return self.sensor.type if self.sensor else CAMERAS_JOB
+
+
+class SensorProbeScheduler:
+    """센서별 적응형 확인 주기 스케줄러 (이벤트 루프 태스크 하나)"""
+
+    def __init__(self, sensor_service):
+        self._service = sensor_service
+        self._config = SensorSchedulerConfig()
+        self._jobs: Dict[str, _Job] = {}
+        self._heap: List[tuple] = []
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._events_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._running: set = set()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, sensors: List[SensorConfig], scheduler_config: SensorSchedulerConfig):
+        """작업 생성 + 스케줄러 태스크 시작 (이벤트 루프에서 호출)"""
+        self._config = scheduler_config
+        if not scheduler_config.enabled or self.running:
+            return
+
+        jobs = [
+            _Job(s.name, s, scheduler_config.base_interval_sec, 0.0)
+            for s in sensors
+            if s.type in ("lidar_2d", "lidar_3d", "realsense", "audio_output", "audio_input")
+        ]
+        jobs.append(_Job(CAMERAS_JOB, None, scheduler_config.base_interval_sec, 0.0))
+
+        # 첫 확인은 바로 (동시 실행 수 제한), 이후 확인 시각은 base_interval_sec 안에 고르게 분산
+        now = time.monotonic()
+        self._jobs = {}
+        self._heap = []
+        for i, job in enumerate(jobs):
+            job.due = now
+            job.phase = i / len(jobs)
+            self._jobs[job.name] = job
+            heapq.heappush(self._heap, (job.due, job.name))
+
+        self._wakeup = asyncio.Event()
+        self._ready = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(scheduler_config.max_concurrent)
+        self._task = asyncio.ensure_future(self._loop())
+        self._events_task = asyncio.ensure_future(self._watch_devices())
+
+    async def stop(self):
+        for task in (self._task, self._events_task, *self._running):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(
+            *(t for t in (self._task, self._events_task, *self._running) if t is not None),
+            return_exceptions=True,
+        )
+        self._task = self._events_task = None
+        self._running = set()
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """첫 확인 라운드가 끝날 때까지 대기 (시작 직후 요청용)"""
+        if self._ready is None:
+            return False
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._ready.is_set()
+
+    def trigger(self, kinds: Optional[List[str]] = None):
+        """해당 종류 센서를 바로 다시 확인 (kinds가 없으면 전체)"""
+        if not self.running:
+            return
+        now = time.monotonic()
+        for job in self._jobs.values():
+            if kinds is None or job.kind in kinds:
+                if job.due == float("inf"):
+                    job.retrigger = True
+                    continue
+                job.due = now
+                heapq.heappush(self._heap, (now, job.name))
+        self._wakeup.set()
+
+    def results(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self._results)
+
+    def get_status(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        cfg = self._config
+        return {
+            "enabled": cfg.enabled,
+            "running": self.running,
+            "config": cfg.model_dump(),
+            "jobs": [
+                {
+                    "name": job.name,
+                    "kind": job.kind,
+                    "interval_sec": round(job.interval, 2),
+                    "next_in_sec": round(max(0.0, job.due - now), 2),
+                    "state": job.last_state,
+                    "streak": job.streak,
+                    "probes": job.probes,
+                    "failures": job.failures,
+                    "last_duration_ms": job.last_duration_ms,
+                }
+                for job in sorted(self._jobs.values(), key=lambda j: j.due)
+            ],
+        }
+
+    # ============================================
+    # 스케줄 루프
+    # ============================================
+
+    async def _loop(self):
+        while True:
+            now = time.monotonic()
+            while self._heap:
+                due, name = self._heap[0]
+                job = self._jobs.get(name)
+                if job is None or due != job.due:
+                    heapq.heappop(self._heap)  # trigger로 앞당겨진 예전 항목
+                    continue
+                if due > now:
+                    break
+                heapq.heappop(self._heap)
+                # 다음 확인 시각은 결과가 나온 뒤 정함 (그 전에는 다시 꺼내지 않음)
+                job.due = float("inf")
+                task = asyncio.ensure_future(self._run_job(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+            timeout = self._heap[0][0] - now if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_job(self, job: _Job):
+        async with self._semaphore:
+            start = time.monotonic()
+            try:
+                result = await self._probe(job)
+            except Exception as e:
+                result = {"online": False, "error": str(e)}
+            job.last_duration_ms = round((time.monotonic() - start) * 1000, 1)
+
+        job.probes += 1
+        if result is not None:
+            result["checked_at"] = time.time()
+            self._results[job.name] = result
+            self._reschedule(job, result.get("online", True))
+            if job.sensor is not None:
+                sensor_history.record(job.name, job.sensor.type, result["online"], source="scheduler")
+        else:
+            # 확인할 대상 없음 (IP/시리얼 미설정) - 설정이 바뀔 수 있으니 느리게 재확인
+            self._results.pop(job.name, None)
+            job.interval = self._config.max_interval_sec
+
+        job.due = time.monotonic() + job.interval * random.uniform(1 - self._config.jitter, 1 + self._config.jitter)
+        if job.probes == 1:
+            job.due += job.phase * self._config.base_interval_sec
+        if job.retrigger:
+            job.retrigger = False
+            job.due = time.monotonic()
+        heapq.heappush(self._heap, (job.due, job.name))
+        self._wakeup.set()
+
+        if not self._ready.is_set() and all(j.probes for j in self._jobs.values()):
+            self._ready.set()
+
+    def _reschedule(self, job: _Job, online: bool):
+        cfg = self._config
+        if not online:
+            job.failures += 1
+        if online != job.last_state:
+            job.streak = 1
+            job.interval = cfg.min_interval_sec
+        else:
+            job.streak += 1
+            if job.streak >= cfg.stable_after:
+                limit = cfg.max_interval_sec if online else cfg.base_interval_sec
+                job.interval = min(job.interval * cfg.backoff_factor, limit)
+        job.last_state = online
+
+    async def _probe(self, job: _Job) -> Optional[Dict[str, Any]]:
+        """센서 종류별 확인 (종류별 목록 조회는 sensor_service 캐시/single-flight로 공유)"""
+        sensor = job.sensor
+        if sensor is None:
+            return {"online": True, "cameras": await self._service.get_video_devices()}
+
+        if sensor.type in ("lidar_2d", "lidar_3d"):
+            if not sensor.ip:
+                return None
+            result = await self._service.ping_host(sensor.ip)
+            return {"online": result["online"], "ip": sensor.ip, "ping_ms": result.get("ping_ms")}
+
+        if sensor.type == "realsense":
+            if not sensor.serial:
+                return None
+            info = (await self._service.get_realsense_inventory()).get(sensor.serial)
+            return {
+                "online": info is not None,
+                "serial": sensor.serial,
+                "device_name": info["name"] if info else None,
+                "firmware": info["firmware"] if info else None,
+            }
+
+        audio = await self._service.get_audio_devices()
+        key = "speaker" if sensor.type == "audio_output" else "microphone"
+        return {"online": bool(audio.get(key)), "error": audio.get(f"{key}_error")}
+
+    async def _watch_devices(self):
+        """udev 레지스트리 변경 -> 관련 센서 즉시 재확인"""
+        queue = device_registry.subscribe()
+        try:
+            while True:
+                event = await queue.get()
+                device = event.get("device")
+                if device is not None:
+                    self.trigger(list(_REGISTRY_KINDS.get(device["kind"], ())))
+                elif event.get("type") == "snapshot":
+                    self.trigger()
+        finally:
+            device_registry.unsubscribe(queue)
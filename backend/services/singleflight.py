@@ -0,0 +1,121 @@
+"""
+Single-flight 호출 병합
+같은 키로 동시에 들어온 호출은 하나의 실행을 공유하고 (SSH 스크립트를 한 번만 실행)
+완료된 결과는 메서드별 TTL 동안 재사용
+"""
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SingleFlight:
+    """
+    키별 in-flight 실행 + TTL 결과 캐시
+    do()는 이벤트 루프 스레드에서만, invalidate()는 다른 스레드(udev 모니터 등)에서도 호출 가능
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        # 무효화 세대 (실행 중에 invalidate되면 끝난 결과를 캐시하지 않음)
+        self._generation = 0
+        self._name_generation: Dict[str, int] = {}
+        self.stats = {"calls": 0, "cache_hits": 0, "shared": 0, "executions": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]], ttl: float = 0.0) -> Any:
+        """
+        key로 fn 실행 (이미 실행 중이면 그 결과를 기다림)
+
+        결과 객체는 호출자끼리 공유되므로 수정하면 안 됨
+        예외는 캐시하지 않고 그 시점에 기다리던 호출자 모두에게 전달
+        """
+        with self._lock:
+            self.stats["calls"] += 1
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > time.monotonic():
+                self.stats["cache_hits"] += 1
+                return cached[1]
+
+            task = self._inflight.get(key)
+            if task is None:
+                self.stats["executions"] += 1
+                task = asyncio.ensure_future(self._run(key, fn, ttl, self._generation_of(key)))
+                task.add_done_callback(_consume_exception)
+                self._inflight[key] = task
+            else:
+                self.stats["shared"] += 1
+
+        # 기다리던 요청 하나가 취소되어도 공유 실행은 계속
+        return await asyncio.shield(task)
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]], ttl: float, generation: Tuple) -> Any:
+        task = asyncio.current_task()
+        try:
+            result = await fn()
+            with self._lock:
+                if ttl > 0 and self._generation_of(key) == generation:
+                    self._cache[key] = (time.monotonic() + ttl, result)
+            return result
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is task:
+                    del self._inflight[key]
+
+    def _generation_of(self, key: Hashable) -> Tuple[int, int]:
+        name = key[0] if isinstance(key, tuple) and key else None
+        return self._generation, self._name_generation.get(name, 0)
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        캐시 무효화 (name이 주어지면 그 메서드 결과만)
+        실행 중인 호출은 결과를 캐시하지 않고, 이후 호출은 그 실행을 기다리지 않고 새로 실행
+        """
+        with self._lock:
+            if name is None:
+                self._generation += 1
+                self._cache.clear()
+                self._inflight.clear()
+                return
+            self._name_generation[name] = self._name_generation.get(name, 0) + 1
+            for table in (self._cache, self._inflight):
+                for key in [k for k in table if isinstance(k, tuple) and k and k[0] == name]:
+                    del table[key]
+
+
+def _consume_exception(task: asyncio.Future):
+    # 기다리는 호출자가 모두 취소된 경우 "exception was never retrieved" 경고 방지
+    if not task.cancelled():
+        task.exception()
+
+
+def invalidate(obj, name: Optional[str] = None):
+    """@single_flight 메서드를 가진 인스턴스의 캐시 무효화 (name이 주어지면 그 메서드만)"""
+    flight = obj.__dict__.get("_single_flight")
+    if flight is not None:
+        flight.invalidate(name)
+
+
+def single_flight(ttl: float = 0.0, key: Optional[Callable[..., Hashable]] = None):
+    """
+    async 메서드용 single-flight 데코레이터 (인스턴스별 SingleFlight 사용)
+
+    Args:
+        ttl: 결과 재사용 시간 (초, 0이면 동시 호출 병합만)
+        key: 인자 -> 키 함수 (기본값은 인자 튜플, 해시 불가능한 인자가 있으면 지정)
+    """
+    def decorator(method):
+        name = method.__name__
+
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            flight = self.__dict__.get("_single_flight")
+            if flight is None:
+                flight = self.__dict__["_single_flight"] = SingleFlight()
+            call_key = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            return await flight.do((name, call_key), lambda: method(self, *args, **kwargs), ttl)
+
+        return wrapper
+    return decorator
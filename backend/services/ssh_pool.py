@@ -0,0 +1,118 @@
+"""
+SSH 연결 풀
+호스트(ip:port)별 SSHClient 하나를 PC 모니터/센서 서비스가 공유
+- 호스트별 lock: 같은 호스트에 동시에 요청이 몰려도 connect는 한 번
+- 다른 호스트끼리는 서로 기다리지 않음 (N대 동시 조회)
+"""
+import threading
+from typing import Dict
+
+try:
+    import paramiko
+    HAS_PARAMIKO = True
+except ImportError:
+    HAS_PARAMIKO = False
+
+from config import PCConfig
+
+
+class SSHPool:
+    """호스트별 재사용 SSH 연결"""
+
+    def __init__(self, connect_timeout: float = 5.0):
+        self.connect_timeout = connect_timeout
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+        self._clients: Dict[str, "paramiko.SSHClient"] = {}
+        self.stats = {"connects": 0, "reuses": 0, "failures": 0}
+
+    @staticmethod
+    def key(pc_config: PCConfig) -> str:
+        return f"{pc_config.username}@{pc_config.ip}:{pc_config.port}"
+
+    def _host_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            lock = self._host_locks.get(key)
+            if lock is None:
+                lock = self._host_locks[key] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _is_active(client) -> bool:
+        try:
+            transport = client.get_transport()
+            return transport is not None and transport.is_active()
+        except Exception:
+            return False
+
+    def get(self, pc_config: PCConfig):
+        """연결된 SSHClient (끊겼으면 다시 연결)"""
+        if not HAS_PARAMIKO:
+            raise ImportError("paramiko is required for SSH. Install with: pip install paramiko")
+
+        key = self.key(pc_config)
+        client = self._clients.get(key)
+        if client is not None and self._is_active(client):
+            self.stats["reuses"] += 1
+            return client
+
+        with self._host_lock(key):
+            # 기다리는 동안 다른 스레드가 연결했으면 그것을 사용
+            client = self._clients.get(key)
+            if client is not None and self._is_active(client):
+                self.stats["reuses"] += 1
+                return client
+            if client is not None:
+                try:
+                    client.close()
+                except Exception:
+                    pass
+
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            kwargs = {}
+            if pc_config.ssh_key_path:
+                kwargs["key_filename"] = pc_config.ssh_key_path
+            elif pc_config.password:
+                kwargs["password"] = pc_config.password
+            try:
+                client.connect(
+                    hostname=pc_config.ip,
+                    port=pc_config.port,
+                    username=pc_config.username,
+                    timeout=self.connect_timeout,
+                    **kwargs,
+                )
+            except Exception:
+                self.stats["failures"] += 1
+                raise
+
+            self.stats["connects"] += 1
+            self._clients[key] = client
+            return client
+
+    def close(self, pc_config: PCConfig):
+        client = self._clients.pop(self.key(pc_config), None)
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def close_all(self):
+        """모든 SSH 연결 종료"""
+        for key in list(self._clients):
+            client = self._clients.pop(key, None)
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def get_status(self) -> Dict:
+        return {
+            "hosts": {key: self._is_active(client) for key, client in list(self._clients.items())},
+            "stats": dict(self.stats),
+        }
+
+
+ssh_pool = SSHPool()
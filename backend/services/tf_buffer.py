@@ -0,0 +1,249 @@
+"""
+TF Buffer Service
+/tf, /tf_static을 합쳐 프레임 트리를 유지하고 (짧은 시간 이력 포함)
+target <- source 변환을 조회
+(프레임별 루트까지의 부모 체인을 미리 계산해 두어 hop당 상수 시간으로 합성)
+"""
+import bisect
+import math
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import TfConfig
+from services.ros_subscriber import ros_service
+
+Vec3 = Tuple[float, float, float]
+Quat = Tuple[float, float, float, float]  # (x, y, z, w)
+
+_IDENTITY: Tuple[Vec3, Quat] = ((0.0, 0.0, 0.0), (0.0, 0.0, 0.0, 1.0))
+
+
+def _quat_mul(a: Quat, b: Quat) -> Quat:
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return (
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz,
+    )
+
+
+def _quat_rotate(q: Quat, v: Vec3) -> Vec3:
+    qx, qy, qz, qw = q
+    # t = 2 * cross(q.xyz, v)
+    tx = 2.0 * (qy * v[2] - qz * v[1])
+    ty = 2.0 * (qz * v[0] - qx * v[2])
+    tz = 2.0 * (qx * v[1] - qy * v[0])
+    return (
+        v[0] + qw * tx + (qy * tz - qz * ty),
+        v[1] + qw * ty + (qz * tx - qx * tz),
+        v[2] + qw * tz + (qx * ty - qy * tx),
+    )
+
+
+def _compose(a: Tuple[Vec3, Quat], b: Tuple[Vec3, Quat]) -> Tuple[Vec3, Quat]:
+    """a * b (b를 a 좌표계로)"""
+    ta, qa = a
+    tb, qb = b
+    rt = _quat_rotate(qa, tb)
+    return (ta[0] + rt[0], ta[1] + rt[1], ta[2] + rt[2]), _quat_mul(qa, qb)
+
+
+def _inverse(a: Tuple[Vec3, Quat]) -> Tuple[Vec3, Quat]:
+    t, q = a
+    q_inv = (-q[0], -q[1], -q[2], q[3])
+    rt = _quat_rotate(q_inv, t)
+    return (-rt[0], -rt[1], -rt[2]), q_inv
+
+
+def _interpolate(a: Tuple[Vec3, Quat], b: Tuple[Vec3, Quat], ratio: float) -> Tuple[Vec3, Quat]:
+    """translation 선형 보간 + rotation slerp"""
+    (ta, qa), (tb, qb) = a, b
+    t = tuple(ta[i] + (tb[i] - ta[i]) * ratio for i in range(3))
+
+    dot = sum(qa[i] * qb[i] for i in range(4))
+    if dot < 0.0:
+        qb, dot = tuple(-c for c in qb), -dot
+    if dot > 0.9995:
+        q = tuple(qa[i] + (qb[i] - qa[i]) * ratio for i in range(4))
+    else:
+        theta = math.acos(dot)
+        sin_theta = math.sin(theta)
+        wa = math.sin((1.0 - ratio) * theta) / sin_theta
+        wb = math.sin(ratio * theta) / sin_theta
+        q = tuple(wa * qa[i] + wb * qb[i] for i in range(4))
+    norm = math.sqrt(sum(c * c for c in q)) or 1.0
+    return t, tuple(c / norm for c in q)
+
+
+class _FrameEntry:
+    """child 프레임 하나 (부모 + 시간 이력)"""
+
+    __slots__ = ("parent", "static", "stamps", "transforms")
+
+    def __init__(self, parent: str, static: bool):
+        self.parent = parent
+        self.static = static
+        self.stamps: List[float] = []
+        self.transforms: List[Tuple[Vec3, Quat]] = []
+
+    def insert(self, stamp: float, transform: Tuple[Vec3, Quat], cache_sec: float):
+        if self.static:
+            self.stamps, self.transforms = [stamp], [transform]
+            return
+
+        if not self.stamps or stamp >= self.stamps[-1]:
+            self.stamps.append(stamp)
+            self.transforms.append(transform)
+        else:
+            idx = bisect.bisect_left(self.stamps, stamp)
+            self.stamps.insert(idx, stamp)
+            self.transforms.insert(idx, transform)
+
+        # 오래된 이력 제거
+        cutoff = bisect.bisect_left(self.stamps, self.stamps[-1] - cache_sec)
+        if cutoff:
+            del self.stamps[:cutoff]
+            del self.transforms[:cutoff]
+
+    def at(self, stamp: Optional[float]) -> Tuple[Vec3, Quat]:
+        """stamp 시점 변환 (None이면 최신, 이력 범위 밖이면 가장 가까운 값)"""
+        if stamp is None or self.static or len(self.stamps) == 1:
+            return self.transforms[-1]
+
+        idx = bisect.bisect_left(self.stamps, stamp)
+        if idx <= 0:
+            return self.transforms[0]
+        if idx >= len(self.stamps):
+            return self.transforms[-1]
+
+        t0, t1 = self.stamps[idx - 1], self.stamps[idx]
+        ratio = (stamp - t0) / (t1 - t0) if t1 > t0 else 0.0
+        return _interpolate(self.transforms[idx - 1], self.transforms[idx], ratio)
+
+
+class TfBufferService:
+    """TF 프레임 트리 캐시"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache_sec = 10.0
+        self._frames: Dict[str, _FrameEntry] = {}
+        # 프레임 -> [자기 자신, 부모, ..., 루트] (트리 구조가 바뀌면 무효화)
+        self._chains: Dict[str, List[str]] = {}
+
+    def start(self, tf_config: TfConfig) -> bool:
+        """/tf, /tf_static 구독 (ROS 노드 시작 후 호출)"""
+        self._cache_sec = tf_config.cache_sec
+        ok = ros_service.subscribe_raw(
+            tf_config.topic, "tf2_msgs/msg/TFMessage", lambda msg: self.on_message(msg, static=False)
+        )
+        ok_static = ros_service.subscribe_raw(
+            tf_config.static_topic, "tf2_msgs/msg/TFMessage", lambda msg: self.on_message(msg, static=True),
+            latched=True,
+        )
+        return ok and ok_static
+
+    def on_message(self, msg, static: bool = False):
+        """ROS 콜백 - TFMessage의 모든 변환을 트리에 병합"""
+        with self._lock:
+            for tf in msg.transforms:
+                stamp = tf.header.stamp.sec + tf.header.stamp.nanosec * 1e-9
+                tr, rot = tf.transform.translation, tf.transform.rotation
+                self.set_transform(
+                    tf.header.frame_id, tf.child_frame_id, stamp,
+                    ((tr.x, tr.y, tr.z), (rot.x, rot.y, rot.z, rot.w)),
+                    static=static,
+                )
+
+    def set_transform(self, parent: str, child: str, stamp: float,
+                      transform: Tuple[Vec3, Quat], static: bool = False):
+        """변환 하나 추가 (호출자가 self._lock을 잡고 있어야 함)"""
+        parent, child = parent.lstrip("/"), child.lstrip("/")
+        entry = self._frames.get(child)
+        if entry is None or entry.parent != parent or entry.static != static:
+            entry = _FrameEntry(parent, static)
+            self._frames[child] = entry
+            self._chains.clear()
+        entry.insert(stamp, transform, self._cache_sec)
+
+    def _chain(self, frame: str) -> List[str]:
+        """루트까지의 부모 체인 (캐시)"""
+        chain = self._chains.get(frame)
+        if chain is not None:
+            return chain
+
+        chain = [frame]
+        seen = {frame}
+        current = frame
+        while current in self._frames:
+            current = self._frames[current].parent
+            if current in seen:  # 순환 방지
+                break
+            chain.append(current)
+            seen.add(current)
+        self._chains[frame] = chain
+        return chain
+
+    def _to_ancestor(self, chain: List[str], ancestor: str, stamp: Optional[float]) -> Tuple[Vec3, Quat]:
+        """chain[0] 프레임 -> ancestor 프레임 변환 (T_ancestor_frame)"""
+        result = _IDENTITY
+        for frame in chain:
+            if frame == ancestor:
+                break
+            result = _compose(self._frames[frame].at(stamp), result)
+        return result
+
+    def lookup(self, target: str, source: str, stamp: Optional[float] = None) -> Dict[str, Any]:
+        """
+        source 프레임을 target 프레임 기준으로 표현한 변환 (tf2 lookupTransform과 동일)
+
+        Raises:
+            LookupError: 두 프레임이 같은 트리에 연결되어 있지 않을 때
+        """
+        target, source = target.lstrip("/"), source.lstrip("/")
+
+        with self._lock:
+            target_chain = self._chain(target)
+            source_chain = self._chain(source)
+
+            target_set = set(target_chain)
+            common = next((frame for frame in source_chain if frame in target_set), None)
+            if common is None:
+                for frame in (target, source):
+                    if frame not in self._frames and not any(e.parent == frame for e in self._frames.values()):
+                        raise LookupError(f"Frame '{frame}' does not exist")
+                raise LookupError(f"'{source}' and '{target}' are not connected")
+
+            source_to_common = self._to_ancestor(source_chain, common, stamp)
+            target_to_common = self._to_ancestor(target_chain, common, stamp)
+
+        translation, rotation = _compose(_inverse(target_to_common), source_to_common)
+        return {
+            "target": target,
+            "source": source,
+            "translation": {"x": translation[0], "y": translation[1], "z": translation[2]},
+            "rotation": {"x": rotation[0], "y": rotation[1], "z": rotation[2], "w": rotation[3]},
+            "stamp": stamp,
+        }
+
+    def get_frames(self) -> Dict[str, Any]:
+        """모든 프레임 (부모, static 여부, 최신 stamp, 이력 개수)"""
+        now = time.time()
+        with self._lock:
+            return {
+                child: {
+                    "parent": entry.parent,
+                    "static": entry.static,
+                    "latest_stamp": entry.stamps[-1] if entry.stamps else None,
+                    "age_sec": round(now - entry.stamps[-1], 3) if entry.stamps and not entry.static else None,
+                    "history": len(entry.stamps),
+                }
+                for child, entry in self._frames.items()
+            }
+
+
+# 전역 인스턴스
+tf_buffer = TfBufferService()
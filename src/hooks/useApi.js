@@ -6,13 +6,18 @@ const API_BASE_URL = import.meta.env.DEV
     ? 'http://localhost:8000'
     : ''  // Production: 같은 서버
 
+// 백엔드 udev 모니터가 꺼져 있을 때 /api/sensors/devices/ws가 닫히는 코드 (routers/sensors.py와 같게)
+const DEVICE_EVENTS_DISABLED_CODE = 4001
+
 /**
  * API 데이터를 주기적으로 가져오는 훅
+ * 백엔드 대역폭 예산을 넘으면 X-Poll-Interval-Scale 헤더 배율만큼 폴링 주기를 늘림
  */
 export const useApiData = (endpoint, interval = 2000) => {
     const [data, setData] = useState(null)
     const [error, setError] = useState(null)
     const [loading, setLoading] = useState(true)
+    const [pollScale, setPollScale] = useState(1)
 
     const fetchData = useCallback(async () => {
         try {
@@ -20,6 +25,7 @@ export const useApiData = (endpoint, interval = 2000) => {
             if (!response.ok) {
                 throw new Error(`HTTP ${response.status}`)
             }
+            setPollScale(Number(response.headers.get('X-Poll-Interval-Scale')) || 1)
             const json = await response.json()
             setData(json)
             setError(null)
@@ -32,12 +38,14 @@ export const useApiData = (endpoint, interval = 2000) => {
 
     useEffect(() => {
         fetchData()
+    }, [fetchData])
 
+    useEffect(() => {
         if (interval > 0) {
-            const id = setInterval(fetchData, interval)
+            const id = setInterval(fetchData, interval * pollScale)
             return () => clearInterval(id)
         }
-    }, [fetchData, interval])
+    }, [fetchData, interval, pollScale])
 
     return { data, error, loading, refetch: fetchData }
 }
@@ -64,10 +72,55 @@ export const useAllPCStatus = (interval = 2000) => {
 }
 
 /**
- * 센서 상태 조회 훅
+ * 장치 add/remove 이벤트 구독 훅 (백엔드 udev 모니터, 끊기면 5초 후 재연결, 모니터가 꺼져 있으면 연결 안 함)
+ */
+export const useDeviceEvents = (onEvent) => {
+    useEffect(() => {
+        const base = API_BASE_URL || window.location.origin
+        const url = `${base.replace(/^http/, 'ws')}/api/sensors/devices/ws`
+        let ws = null
+        let timer = null
+        let closed = false
+
+        const connect = () => {
+            ws = new WebSocket(url)
+            ws.onmessage = (event) => onEvent(JSON.parse(event.data))
+            ws.onclose = (event) => {
+                // 서버에서 udev 모니터가 꺼져 있으면 이벤트가 오지 않으므로 재연결하지 않음
+                if (event.code === DEVICE_EVENTS_DISABLED_CODE) return
+                if (!closed) timer = setTimeout(connect, 5000)
+            }
+        }
+        connect()
+
+        return () => {
+            closed = true
+            clearTimeout(timer)
+            if (ws) ws.close()
+        }
+    }, [onEvent])
+}
+
+/**
+ * PC 목록 조회 훅 (백엔드 config.pcs 순서, 한 번만 조회)
+ */
+export const usePCList = () => {
+    const { data, ...rest } = useApiData('/api/pc/config', 0)
+    const pcs = data ? Object.entries(data).map(([id, pc]) => ({ id, ...pc })) : []
+    return { pcs, ...rest }
+}
+
+/**
+ * 센서 상태 조회 훅 (장치가 연결/분리되면 주기와 관계없이 바로 다시 조회)
  */
 export const useSensorsStatus = (interval = 3000) => {
-    return useApiData('/api/sensors/status', interval)
+    const result = useApiData('/api/sensors/status', interval)
+    const { refetch } = result
+    const onDeviceEvent = useCallback((event) => {
+        if (event.type === 'add' || event.type === 'remove') refetch()
+    }, [refetch])
+    useDeviceEvents(onDeviceEvent)
+    return result
 }
 
 /**
@@ -22,7 +22,7 @@ import {
   cilXCircle,
   cilChart,
 } from '@coreui/icons'
-import { useRosSummary, useRosStatus, usePCStatus, useSensorsStatus } from '../../hooks/useApi'
+import { useRosSummary, useRosStatus, useAllPCStatus, useSensorsStatus } from '../../hooks/useApi'
 
 // ROS 연결 상태 위젯
 const RosConnectionWidget = () => {
@@ -83,19 +83,12 @@ const BatteryWidget = () => {
   )
 }
 
-// PC 상태 위젯
+// PC 상태 위젯 (/api/pc/all 한 번으로 모든 PC)
 const PCStatusWidget = () => {
-  const { data: pc1 } = usePCStatus('pc1', 3000)
-  const { data: pc2 } = usePCStatus('pc2', 3000)
+  const { data } = useAllPCStatus(3000)
 
-  const getStatus = (pc) => {
-    if (!pc) return { online: false, cpu: 0 }
-    return { online: pc.online, cpu: pc.cpu_percent ?? 0 }
-  }
-
-  const s1 = getStatus(pc1)
-  const s2 = getStatus(pc2)
-  const allOnline = s1.online && s2.online
+  const pcs = data ? Object.entries(data) : []
+  const allOnline = pcs.length > 0 && pcs.every(([, pc]) => pc.online)
 
   return (
     <CWidgetStatsF
@@ -106,8 +99,9 @@ const PCStatusWidget = () => {
       value={allOnline ? 'All Online' : 'Check Required'}
       footer={
         <small>
-          PC1: {s1.online ? `${s1.cpu.toFixed(0)}%` : 'Offline'} |
-          PC2: {s2.online ? `${s2.cpu.toFixed(0)}%` : 'Offline'}
+          {pcs
+            .map(([id, pc]) => `${id.toUpperCase()}: ${pc.online ? `${(pc.cpu_percent ?? 0).toFixed(0)}%` : 'Offline'}`)
+            .join(' | ')}
         </small>
       }
     />
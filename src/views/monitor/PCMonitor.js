@@ -38,7 +38,7 @@ import {
     cilArrowBottom,
 } from '@coreui/icons'
 import { useRosTopic } from '../../hooks/useRosTopic'
-import { usePCStatus, usePCProcesses, usePCNetwork, useTimeSyncStatus, callApi } from '../../hooks/useApi'
+import { usePCStatus, usePCProcesses, usePCNetwork, usePCList, useTimeSyncStatus, callApi } from '../../hooks/useApi'
 
 // 바이트를 사람이 읽기 쉬운 형식으로 변환
 const formatBytes = (bytes, decimals = 1) => {
@@ -452,6 +452,7 @@ const TimeSyncButton = () => {
 
 const PCMonitor = () => {
     const [activeTab, setActiveTab] = useState('all')
+    const { pcs } = usePCList()
 
     return (
         <>
@@ -467,39 +468,39 @@ const PCMonitor = () => {
                                 All PCs
                             </CNavLink>
                         </CNavItem>
-                        <CNavItem>
-                            <CNavLink active={activeTab === 'pc1'} onClick={() => setActiveTab('pc1')}>
-                                PC 1 (Main)
-                            </CNavLink>
-                        </CNavItem>
-                        <CNavItem>
-                            <CNavLink active={activeTab === 'pc2'} onClick={() => setActiveTab('pc2')}>
-                                PC 2 (Slave)
-                            </CNavLink>
-                        </CNavItem>
+                        {pcs.map((pc) => (
+                            <CNavItem key={pc.id}>
+                                <CNavLink active={activeTab === pc.id} onClick={() => setActiveTab(pc.id)}>
+                                    {pc.name}
+                                </CNavLink>
+                            </CNavItem>
+                        ))}
                     </CNav>
 
                     <CTabContent>
+                        {/* 보이는 탭만 렌더링 (PC 수만큼 숨은 탭이 폴링하지 않게) */}
                         <CTabPane visible={activeTab === 'all'}>
-                            <CRow>
-                                <CCol md={6}>
-                                    <SinglePCMonitor pcId="pc1" name="PC 1 (Main)" />
-                                </CCol>
-                                <CCol md={6}>
-                                    <SinglePCMonitor pcId="pc2" name="PC 2 (Slave)" />
-                                </CCol>
-                            </CRow>
-                        </CTabPane>
-                        <CTabPane visible={activeTab === 'pc1'}>
-                            <SinglePCMonitor pcId="pc1" name="PC 1 (Main)" />
-                            <ProcessList pcId="pc1" name="PC 1 (Main)" />
-                            <NetworkMonitor pcId="pc1" name="PC 1 (Main)" />
-                        </CTabPane>
-                        <CTabPane visible={activeTab === 'pc2'}>
-                            <SinglePCMonitor pcId="pc2" name="PC 2 (Slave)" />
-                            <ProcessList pcId="pc2" name="PC 2 (Slave)" />
-                            <NetworkMonitor pcId="pc2" name="PC 2 (Slave)" />
+                            {activeTab === 'all' && (
+                                <CRow>
+                                    {pcs.map((pc) => (
+                                        <CCol md={6} key={pc.id}>
+                                            <SinglePCMonitor pcId={pc.id} name={pc.name} />
+                                        </CCol>
+                                    ))}
+                                </CRow>
+                            )}
                         </CTabPane>
+                        {pcs.map((pc) => (
+                            <CTabPane visible={activeTab === pc.id} key={pc.id}>
+                                {activeTab === pc.id && (
+                                    <>
+                                        <SinglePCMonitor pcId={pc.id} name={pc.name} />
+                                        <ProcessList pcId={pc.id} name={pc.name} />
+                                        <NetworkMonitor pcId={pc.id} name={pc.name} />
+                                    </>
+                                )}
+                            </CTabPane>
+                        ))}
                     </CTabContent>
                 </CCardBody>
             </CCard>
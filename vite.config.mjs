@@ -1,8 +1,47 @@
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
 import path from 'node:path'
+import fs from 'node:fs'
+import zlib from 'node:zlib'
 import autoprefixer from 'autoprefixer'
 
+// 빌드 결과를 .br/.gz로 미리 압축 (백엔드가 Accept-Encoding에 맞춰 그대로 전송)
+const PRECOMPRESS_EXTENSIONS = /\.(js|mjs|css|html|svg|json|txt|map)$/
+const PRECOMPRESS_MIN_SIZE = 1024
+
+const precompress = () => {
+  let outDir = 'build'
+  return {
+    name: 'precompress',
+    apply: 'build',
+    configResolved(config) {
+      outDir = path.resolve(config.root, config.build.outDir)
+    },
+    closeBundle() {
+      const walk = (dir) =>
+        fs.readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+          const file = path.join(dir, entry.name)
+          return entry.isDirectory() ? walk(file) : [file]
+        })
+      for (const file of walk(outDir)) {
+        if (!PRECOMPRESS_EXTENSIONS.test(file)) continue
+        const data = fs.readFileSync(file)
+        if (data.length < PRECOMPRESS_MIN_SIZE) continue
+        fs.writeFileSync(`${file}.gz`, zlib.gzipSync(data, { level: 9 }))
+        fs.writeFileSync(
+          `${file}.br`,
+          zlib.brotliCompressSync(data, {
+            params: {
+              [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+              [zlib.constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+            },
+          }),
+        )
+      }
+    },
+  }
+}
+
 export default defineConfig(() => {
   return {
     base: './',
@@ -29,7 +68,7 @@ export default defineConfig(() => {
         },
       },
     },
-    plugins: [react()],
+    plugins: [react(), precompress()],
     resolve: {
       alias: [
         {